@@ -5,6 +5,9 @@ import pandas as pd
 import sys
 import io
 
+sys.path.insert(0, 'backend/pipeline')
+from src.data.storage import load_dataset
+
 # Set encoding for output
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -14,8 +17,7 @@ predictions['target_date'] = pd.to_datetime(predictions['target_date'])
 predictions['prediction_date'] = pd.to_datetime(predictions['prediction_date'])
 
 # Load actual gold prices
-gold_prices = pd.read_csv('backend/pipeline/data/raw/gold_prices.csv')
-gold_prices['Date'] = pd.to_datetime(gold_prices['Date'])
+gold_prices = load_dataset('backend/pipeline/data/raw/gold_prices', columns=['Date', 'Close'])
 gold_prices = gold_prices.set_index('Date')
 
 print('=' * 80)
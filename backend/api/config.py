@@ -24,6 +24,46 @@ if DATABASE_URL.startswith('postgres://'):
 # SQLAlchemy Config
 SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'False').lower() == 'true'
 
+# Stack assíncrono: com DB_ASYNC=true os endpoints de previsões usam
+# AsyncSession (aiosqlite no SQLite, asyncpg no PostgreSQL). A URL do driver
+# assíncrono é derivada de DATABASE_URL, ou definida em ASYNC_DATABASE_URL.
+DB_ASYNC = os.getenv('DB_ASYNC', 'False').lower() == 'true'
+
+
+def async_database_url(url: str) -> str:
+    """Troca o driver da URL pelo equivalente assíncrono"""
+    scheme, rest = url.split('://', 1)
+    dialect = scheme.split('+', 1)[0]
+    driver = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg'}.get(dialect)
+    if driver is None:
+        raise ValueError(f"Sem driver assíncrono configurado para o banco: {dialect}")
+    return f'{dialect}+{driver}://{rest}'
+
+
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL') or (
+    async_database_url(DATABASE_URL) if DB_ASYNC else None
+)
+
+# Perfil de conexão do SQLite (PRAGMAs aplicados em cada conexão nova).
+# WAL: leituras da API não bloqueiam enquanto o pipeline grava; busy_timeout
+# espera o lock de escrita em vez de falhar com "database is locked".
+DB_SQLITE_JOURNAL_MODE = os.getenv('DB_SQLITE_JOURNAL_MODE', 'WAL')
+DB_SQLITE_SYNCHRONOUS = os.getenv('DB_SQLITE_SYNCHRONOUS', 'NORMAL')
+DB_SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('DB_SQLITE_BUSY_TIMEOUT_MS', '30000'))
+DB_SQLITE_MMAP_SIZE = int(os.getenv('DB_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+DB_SQLITE_CACHE_SIZE_KB = int(os.getenv('DB_SQLITE_CACHE_SIZE_KB', '65536'))
+
+# Pool de conexões do PostgreSQL (recycle em segundos, -1 desliga; pre_ping
+# descarta conexões derrubadas pelo servidor antes de usá-las)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+
+# Linhas por comando nas gravações em lote (PriceRepository.bulk_upsert)
+DB_BULK_CHUNK_SIZE = int(os.getenv('DB_BULK_CHUNK_SIZE', '5000'))
+
 # API Configuration
 API_TITLE = "Buongiorno API"
 API_VERSION = "2.0.0"
@@ -31,6 +71,26 @@ API_DESCRIPTION = "API de Previsão de Preços de Commodities - Arquitetura SaaS
 
 # Pipeline Configuration
 PIPELINE_SECRET = os.getenv("PIPELINE_SECRET", "")
+PIPELINE_DIR = PROJECT_ROOT / 'backend' / 'pipeline'
+
+# Jobs do pipeline disparados pela API (logs por job e quantos jobs manter em memória)
+PIPELINE_JOB_LOG_DIR = Path(os.getenv('PIPELINE_JOB_LOG_DIR', str(PROJECT_ROOT / 'logs' / 'pipeline_jobs')))
+PIPELINE_JOB_HISTORY = int(os.getenv('PIPELINE_JOB_HISTORY', '50'))
+
+# Cache de respostas dos endpoints de previsões (TTL em segundos, 0 desliga;
+# a geração dos dados no banco é consultada no máximo a cada CHECK segundos)
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+RESPONSE_CACHE_CHECK_INTERVAL = float(os.getenv('RESPONSE_CACHE_CHECK_INTERVAL', '5'))
+
+# Registro de ativos em memória (intervalo mínimo, em segundos, entre
+# consultas da geração 'assets' no banco)
+ASSET_REGISTRY_CHECK_INTERVAL = float(os.getenv('ASSET_REGISTRY_CHECK_INTERVAL', '30'))
+
+# Janelas (em dias) das métricas de acurácia materializadas (prediction_metrics)
+PREDICTION_METRIC_WINDOWS = [
+    int(days) for days in os.getenv('PREDICTION_METRIC_WINDOWS', '7,30,90,365').split(',')
+]
 
 # Asset Configuration
 DEFAULT_ASSETS = [
@@ -3,26 +3,95 @@ Buongiorno API - Database Configuration
 Configuração do SQLAlchemy e gerenciamento de sessões
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator
 
 try:
-    from .config import DATABASE_URL, SQLALCHEMY_ECHO
+    from .config import (
+        DATABASE_URL, SQLALCHEMY_ECHO, DB_ASYNC, ASYNC_DATABASE_URL,
+        DB_SQLITE_JOURNAL_MODE, DB_SQLITE_SYNCHRONOUS, DB_SQLITE_BUSY_TIMEOUT_MS,
+        DB_SQLITE_MMAP_SIZE, DB_SQLITE_CACHE_SIZE_KB,
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+    )
 except ImportError:
-    from config import DATABASE_URL, SQLALCHEMY_ECHO
+    from config import (
+        DATABASE_URL, SQLALCHEMY_ECHO, DB_ASYNC, ASYNC_DATABASE_URL,
+        DB_SQLITE_JOURNAL_MODE, DB_SQLITE_SYNCHRONOUS, DB_SQLITE_BUSY_TIMEOUT_MS,
+        DB_SQLITE_MMAP_SIZE, DB_SQLITE_CACHE_SIZE_KB,
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+    )
+
+
+def engine_options(url: str) -> Dict:
+    """
+    Opções de create_engine do perfil de conexão (variáveis DB_* de config)
+
+    SQLite: conexões compartilhadas entre threads (os PRAGMAs vêm de
+    set_sqlite_pragmas). PostgreSQL: tamanho, overflow, timeout, reciclagem
+    e pre-ping do pool.
+    """
+    if url.startswith('sqlite'):
+        return {'connect_args': {'check_same_thread': False}}
+
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    PRAGMAs aplicados a cada conexão SQLite nova (evento 'connect')
+
+    WAL deixa a API ler enquanto o pipeline grava, synchronous=NORMAL é
+    seguro com WAL e evita um fsync por commit, e busy_timeout faz a escrita
+    concorrente esperar o lock em vez de falhar com "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {DB_SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA journal_mode = {DB_SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {DB_SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {DB_SQLITE_MMAP_SIZE}")
+        # Negativo: tamanho em KiB em vez de número de páginas
+        cursor.execute(f"PRAGMA cache_size = {-DB_SQLITE_CACHE_SIZE_KB}")
+    finally:
+        cursor.close()
+
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=SQLALCHEMY_ECHO,
-    connect_args={'check_same_thread': False} if 'sqlite' in DATABASE_URL else {}
-)
+engine = create_engine(DATABASE_URL, echo=SQLALCHEMY_ECHO, **engine_options(DATABASE_URL))
+
+if engine.dialect.name == 'sqlite':
+    event.listen(engine, 'connect', set_sqlite_pragmas)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono (só com DB_ASYNC=true: exige aiosqlite ou asyncpg).
+# O engine síncrono continua sendo usado pelas escritas, pelo pipeline e
+# pelas consultas de geração dos caches.
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, echo=SQLALCHEMY_ECHO, **engine_options(ASYNC_DATABASE_URL)
+    )
+    if async_engine.dialect.name == 'sqlite':
+        event.listen(async_engine.sync_engine, 'connect', set_sqlite_pragmas)
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -47,19 +116,113 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def init_db():
+async def get_async_db() -> AsyncGenerator:
     """
-    Inicializa o banco de dados
-    Cria todas as tabelas definidas nos models
+    Dependency para obter sessão assíncrona do banco de dados (DB_ASYNC=true)
+
+    Yields:
+        AsyncSession: Sessão assíncrona do SQLAlchemy
+
+    Example:
+        @app.get("/items/")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Stack assíncrono desligado (defina DB_ASYNC=true)")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> Dict:
+    """
+    Estatísticas dos pools de conexões (sem consultar o banco)
+
+    Returns:
+        dict: Por engine ('sync' e, com DB_ASYNC, 'async'): dialeto, classe do
+              pool e, quando o pool informa, tamanho, conexões livres, em uso
+              e overflow
+    """
+    engines = {'sync': engine}
+    if async_engine is not None:
+        engines['async'] = async_engine.sync_engine
+
+    status = {}
+    for name, target in engines.items():
+        pool = target.pool
+        stats = {'dialect': target.dialect.name, 'pool': type(pool).__name__}
+        for metric, method in (('size', 'size'), ('checked_in', 'checkedin'),
+                               ('checked_out', 'checkedout'), ('overflow', 'overflow')):
+            if hasattr(pool, method):
+                stats[metric] = getattr(pool, method)()
+        status[name] = stats
+
+    return status
+
+
+# Índices substituídos por índices únicos (removidos dos bancos existentes)
+SUPERSEDED_INDEXES = ['idx_asset_date']
+
+
+def migrate_schema():
+    """
+    Cria as tabelas e os índices que faltam em um banco existente
+
+    create_all não cria índices de tabelas que já existem. Antes de criar um
+    índice único novo, remove as linhas duplicadas da chave (mantém a de
+    maior id, a gravada por último): sem o índice, os upserts com ON
+    CONFLICT falham. Chamado por init_db e pelo pipeline (api_db).
+
+    Raises:
+        RuntimeError: Se um índice não puder ser criado
     """
     # Import all models so they are registered with Base
     try:
-        from . import models
+        from . import models  # noqa: F401
     except ImportError:
-        import models
+        import models  # noqa: F401
+
+    from sqlalchemy import delete, func, inspect, select, text
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as connection:
+        for name in SUPERSEDED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+
+            try:
+                with engine.begin() as connection:
+                    if index.unique:
+                        keep = select(func.max(table.c.id)).group_by(*index.columns)
+                        removed = connection.execute(
+                            delete(table).where(table.c.id.not_in(keep))
+                        ).rowcount
+                        if removed:
+                            print(f"🧹 {removed} linha(s) duplicada(s) removida(s) de "
+                                  f"{table.name} para criar {index.name}")
+
+                    index.create(bind=connection, checkfirst=True)
+            except Exception as e:
+                raise RuntimeError(f"Não foi possível criar o índice {index.name}: {e}") from e
+
+
+def init_db():
+    """
+    Inicializa o banco de dados
+    Cria todas as tabelas e índices definidos nos models (ver migrate_schema)
+    """
+    migrate_schema()
+
     print("Banco de dados inicializado!")
 
 
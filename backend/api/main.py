@@ -8,8 +8,9 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from routers import predictions, pipeline
-from database import init_db
-from config import API_TITLE, API_VERSION, API_DESCRIPTION
+from database import init_db, pool_status
+from services.asset_registry import asset_registry
+from config import API_TITLE, API_VERSION, API_DESCRIPTION, DB_ASYNC
 
 
 from fastapi import FastAPI, HTTPException
@@ -19,6 +20,7 @@ import uvicorn
 # Inicializa banco de dados
 print("Inicializando banco de dados...")
 init_db()
+asset_registry.load()
 print("Banco de dados pronto!")
 
 # Inicializa aplicação
@@ -43,8 +45,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Incluir routers
-app.include_router(predictions.router, prefix="/api", tags=["predictions"])
+# Incluir routers (DB_ASYNC=true: endpoints de previsões com AsyncSession)
+if DB_ASYNC:
+    from routers import predictions_async
+    app.include_router(predictions_async.router, prefix="/api", tags=["predictions"])
+else:
+    app.include_router(predictions.router, prefix="/api", tags=["predictions"])
 app.include_router(pipeline.router, prefix="/api", tags=["pipeline"])
 
 # Endpoint raiz
@@ -60,8 +66,8 @@ def root():
 # Endpoint de health check
 @app.get("/health")
 def health_check():
-    """Health check para monitoramento"""
-    return {"status": "healthy"}
+    """Health check para monitoramento (inclui o estado dos pools de conexões)"""
+    return {"status": "healthy", "database": pool_status()}
 
 # Executar servidor (apenas para desenvolvimento local)
 if __name__ == "__main__":
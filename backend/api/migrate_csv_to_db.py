@@ -12,11 +12,17 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Pipeline (leitura dos datasets em Parquet/Feather/CSV)
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), '..', 'pipeline'))
+
 from database import SessionLocal, init_db, reset_db
 from repositories.asset_repository import AssetRepository
 from repositories.price_repository import PriceRepository
 from repositories.prediction_repository import PredictionRepository
+from repositories.prediction_metric_repository import PredictionMetricRepository
 from config import DEFAULT_ASSETS
+from src.data.storage import dataset_exists, load_dataset
+from src.data.model_runs import price_rows
 
 
 def migrate_assets(db, assets_config):
@@ -56,15 +62,15 @@ def migrate_prices(db, pipeline_data_path):
     price_repo = PriceRepository(db)
 
     # Por enquanto apenas gold
-    csv_path = pipeline_data_path / 'raw' / 'gold_prices.csv'
+    dataset = str(pipeline_data_path / 'raw' / 'gold_prices')
 
-    if not csv_path.exists():
-        print(f"   ⚠️  Arquivo não encontrado: {csv_path}")
+    if not dataset_exists(dataset):
+        print(f"   ⚠️  Arquivo não encontrado: {dataset}")
         return
 
-    # Carrega CSV
-    df = pd.read_csv(csv_path)
-    print(f"   📊 {len(df)} registros encontrados no CSV")
+    # Carrega dataset
+    df = load_dataset(dataset)
+    print(f"   📊 {len(df)} registros encontrados no dataset")
 
     # Busca o asset gold
     asset = asset_repo.get_by_code('gold')
@@ -72,38 +78,10 @@ def migrate_prices(db, pipeline_data_path):
         print("   ❌ Asset 'gold' não encontrado! Execute migrate_assets primeiro")
         return
 
-    # Migra em lotes para melhor performance
-    batch_size = 500
-    total_migrated = 0
-
-    for i in range(0, len(df), batch_size):
-        batch = df.iloc[i:i+batch_size]
-        prices_to_insert = []
-
-        for _, row in batch.iterrows():
-            # Converte data
-            price_date = pd.to_datetime(row['Date']).date()
-
-            # Verifica se já existe
-            existing = price_repo.get_by_asset_and_date(asset.id, price_date)
-            if existing:
-                continue
-
-            prices_to_insert.append({
-                'asset_id': asset.id,
-                'date': price_date,
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'adj_close': float(row.get('Adj Close', row['Close'])),
-                'volume': float(row.get('Volume', 0))
-            })
-
-        if prices_to_insert:
-            price_repo.bulk_create(prices_to_insert)
-            total_migrated += len(prices_to_insert)
-            print(f"   💾 Lote {i//batch_size + 1}: {len(prices_to_insert)} preços inseridos")
+    # Upsert em lote (INSERT ... ON CONFLICT): preços já existentes são
+    # atualizados, sem um SELECT por linha
+    df['Date'] = pd.to_datetime(df['Date'])
+    total_migrated = price_repo.bulk_upsert(price_rows(df, asset.id))
 
     print(f"✅ Total de preços migrados: {total_migrated}")
 
@@ -133,58 +111,13 @@ def migrate_predictions(db, pipeline_data_path):
         print("   ❌ Asset 'gold' não encontrado! Execute migrate_assets primeiro")
         return
 
-    # Migra cada previsão
-    total_migrated = 0
-
-    for _, row in df.iterrows():
-        try:
-            # Parse dates
-            prediction_date = pd.to_datetime(row['prediction_date'])
-            target_date = pd.to_datetime(row['target_date']).date()
-
-            # Parse trend
-            trend_text = str(row['trend']).lower()
-            if 'alta' in trend_text or '↗' in trend_text:
-                trend = 'up'
-            elif 'baixa' in trend_text or '↘' in trend_text:
-                trend = 'down'
-            else:
-                trend = 'stable'
-
-            # Calcula confidence
-            model_mape = float(row['model_mape'])
-            if model_mape < 1:
-                confidence = 'high'
-            elif model_mape < 2:
-                confidence = 'medium'
-            else:
-                confidence = 'low'
-
-            # Cria previsão
-            prediction_repo.create(
-                asset_id=asset.id,
-                prediction_date=prediction_date,
-                target_date=target_date,
-                current_price=float(row['current_price']),
-                predicted_price=float(row['predicted_price']),
-                change_abs=float(row['change_abs']),
-                change_pct=float(row['change_pct']),
-                trend=trend,
-                model_used=row['model_used'],
-                model_mape=model_mape,
-                confidence=confidence
-            )
-
-            total_migrated += 1
-
-            if total_migrated % 50 == 0:
-                print(f"   💾 {total_migrated} previsões migradas...")
-
-        except Exception as e:
-            print(f"   ⚠️  Erro ao migrar linha: {e}")
-            continue
+    # Um único lote: tendência e confiança calculadas de forma vetorizada e
+    # previsões já existentes ignoradas (pode ser executado de novo)
+    df['asset_id'] = asset.id
+    total_migrated = prediction_repo.bulk_create(df)
 
-    print(f"✅ Total de previsões migradas: {total_migrated}")
+    print(f"✅ Total de previsões migradas: {total_migrated} "
+          f"({len(df) - total_migrated} já existentes ignoradas)")
 
 
 def main():
@@ -225,6 +158,14 @@ def main():
         # Migra predictions
         migrate_predictions(db, pipeline_data_path)
 
+        # Preenche os preços reais das previsões migradas
+        reconciled = PredictionRepository(db).reconcile_real_prices()
+        print(f"\n🔗 Preços reais conciliados: {reconciled} previsões")
+
+        # Materializa as métricas de acurácia (prediction_metrics)
+        metrics = PredictionMetricRepository(db).refresh()
+        print(f"📐 Métricas de acurácia calculadas: {metrics} linhas")
+
         print("\n" + "=" * 60)
         print("✅ MIGRAÇÃO CONCLUÍDA COM SUCESSO! 🎉")
         print("=" * 60)
@@ -7,5 +7,7 @@ from .asset import Asset
 from .price import Price
 from .prediction import Prediction
 from .model_run import ModelRun
+from .data_version import DataVersion
+from .prediction_metric import PredictionMetric
 
-__all__ = ['Asset', 'Price', 'Prediction', 'ModelRun']
+__all__ = ['Asset', 'Price', 'Prediction', 'ModelRun', 'DataVersion', 'PredictionMetric']
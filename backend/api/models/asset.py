@@ -38,6 +38,7 @@ class Asset(Base):
     # Relationships
     prices = relationship("Price", back_populates="asset", cascade="all, delete-orphan")
     predictions = relationship("Prediction", back_populates="asset", cascade="all, delete-orphan")
+    prediction_metrics = relationship("PredictionMetric", back_populates="asset", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Asset(code='{self.code}', name='{self.name}', symbol='{self.symbol}')>"
@@ -0,0 +1,43 @@
+"""
+Buongiorno API - DataVersion Model
+Contadores de geração dos dados (invalidação de caches entre processos)
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+try:
+    from ..database import Base
+except ImportError:
+    from database import Base
+
+
+class DataVersion(Base):
+    """
+    Geração de um conjunto de dados
+
+    Incrementada por quem grava os dados (pipeline, endpoints de admin) e
+    consultada pelos caches da API para saber se o que têm ainda vale.
+    """
+
+    __tablename__ = 'data_versions'
+
+    # Primary Key
+    name = Column(String(50), primary_key=True)  # 'predictions', 'assets'
+
+    # Generation
+    version = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion(name='{self.name}', version={self.version})>"
+
+    def to_dict(self):
+        """Converte para dicionário"""
+        return {
+            'name': self.name,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
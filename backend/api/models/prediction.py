@@ -63,6 +63,10 @@ class Prediction(Base):
     __table_args__ = (
         Index('idx_asset_target_date', 'asset_id', 'target_date'),
         Index('idx_asset_prediction_date', 'asset_id', 'prediction_date'),
+        # Uma previsão por ativo, alvo, modelo e momento da previsão
+        # (alvo do ON CONFLICT em PredictionRepository.bulk_upsert)
+        Index('uq_predictions_asset_target_model_date',
+              'asset_id', 'target_date', 'model_used', 'prediction_date', unique=True),
     )
 
     def __repr__(self):
@@ -0,0 +1,79 @@
+"""
+Buongiorno API - PredictionMetric Model
+Métricas de acurácia materializadas por ativo, modelo e janela
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+try:
+    from ..database import Base
+except ImportError:
+    from database import Base
+
+
+class PredictionMetric(Base):
+    """
+    Acurácia das previsões conciliadas de um modelo nos últimos window_days dias
+
+    A janela termina na última data alvo com preço real do ativo (end_date).
+    Recalculada a cada conciliação de preços reais (ver
+    PredictionMetricRepository.refresh).
+    """
+
+    __tablename__ = 'prediction_metrics'
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Foreign Keys
+    asset_id = Column(Integer, ForeignKey('assets.id'), nullable=False)
+
+    # Grouping
+    model_used = Column(String(50), nullable=False)  # 'arima', 'moving_average', etc
+    window_days = Column(Integer, nullable=False)  # 7, 30, 90, 365
+
+    # Window
+    start_date = Column(Date, nullable=False)  # Primeira data alvo incluída
+    end_date = Column(Date, nullable=False)  # Última data alvo com preço real
+    samples = Column(Integer, nullable=False)  # Previsões conciliadas na janela
+
+    # Metrics
+    mae = Column(Float, nullable=False)  # Erro absoluto médio
+    mape = Column(Float, nullable=False)  # Erro percentual absoluto médio (%)
+    rmse = Column(Float, nullable=False)  # Raiz do erro quadrático médio
+    hit_rate = Column(Float, nullable=False)  # Acerto da direção (%)
+    bias = Column(Float, nullable=False)  # Erro médio (previsto - real; > 0 = superestima)
+
+    # Timestamps
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Relationships
+    asset = relationship("Asset", back_populates="prediction_metrics")
+
+    __table_args__ = (
+        Index('uq_prediction_metrics_asset_model_window',
+              'asset_id', 'model_used', 'window_days', unique=True),
+    )
+
+    def __repr__(self):
+        return (f"<PredictionMetric(asset_id={self.asset_id}, model_used='{self.model_used}', "
+                f"window_days={self.window_days}, mape={self.mape})>")
+
+    def to_dict(self):
+        """Converte para dicionário"""
+        return {
+            'asset_id': self.asset_id,
+            'model_used': self.model_used,
+            'window_days': self.window_days,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'samples': self.samples,
+            'mae': self.mae,
+            'mape': self.mape,
+            'rmse': self.rmse,
+            'hit_rate': self.hit_rate,
+            'bias': self.bias,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -41,9 +41,9 @@ class Price(Base):
     # Relationships
     asset = relationship("Asset", back_populates="prices")
 
-    # Composite Index for faster queries
+    # Um preço por ativo e dia (alvo do ON CONFLICT em PriceRepository.bulk_upsert)
     __table_args__ = (
-        Index('idx_asset_date', 'asset_id', 'date'),
+        Index('uq_prices_asset_date', 'asset_id', 'date', unique=True),
     )
 
     def __repr__(self):
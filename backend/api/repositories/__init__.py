@@ -6,5 +6,10 @@ Data Access Layer - Padrão Repository
 from .asset_repository import AssetRepository
 from .price_repository import PriceRepository
 from .prediction_repository import PredictionRepository
+from .model_run_repository import ModelRunRepository
+from .data_version_repository import DataVersionRepository
+from .prediction_metric_repository import PredictionMetricRepository
+from .async_prediction_repository import AsyncPredictionRepository
 
-__all__ = ['AssetRepository', 'PriceRepository', 'PredictionRepository']
+__all__ = ['AssetRepository', 'PriceRepository', 'PredictionRepository', 'ModelRunRepository',
+           'DataVersionRepository', 'PredictionMetricRepository', 'AsyncPredictionRepository']
@@ -9,8 +9,10 @@ from sqlalchemy import desc
 
 try:
     from ..models.asset import Asset
+    from .data_version_repository import DataVersionRepository
 except ImportError:
     from models.asset import Asset
+    from repositories.data_version_repository import DataVersionRepository
 
 
 class AssetRepository:
@@ -19,8 +21,14 @@ class AssetRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, code: str, name: str, symbol: str, description: str = None, active: bool = True) -> Asset:
-        """Cria um novo asset"""
+    def create(self, code: str, name: str, symbol: str, description: str = None, active: bool = True,
+               commit: bool = True) -> Asset:
+        """
+        Cria um novo asset (commit=False: só flush, a transação fica a cargo do chamador)
+
+        Toda escrita em assets incrementa a geração 'assets' na mesma
+        transação (ver services/asset_registry.py).
+        """
         asset = Asset(
             code=code,
             name=name,
@@ -29,8 +37,12 @@ class AssetRepository:
             active=active
         )
         self.db.add(asset)
-        self.db.commit()
-        self.db.refresh(asset)
+        self._bump_version()
+        if commit:
+            self.db.commit()
+            self.db.refresh(asset)
+        else:
+            self.db.flush()
         return asset
 
     def get_by_id(self, asset_id: int) -> Optional[Asset]:
@@ -50,6 +62,7 @@ class AssetRepository:
 
     def update(self, asset: Asset) -> Asset:
         """Atualiza um asset"""
+        self._bump_version()
         self.db.commit()
         self.db.refresh(asset)
         return asset
@@ -57,6 +70,7 @@ class AssetRepository:
     def delete(self, asset: Asset) -> None:
         """Remove um asset"""
         self.db.delete(asset)
+        self._bump_version()
         self.db.commit()
 
     def activate(self, asset: Asset) -> Asset:
@@ -68,3 +82,7 @@ class AssetRepository:
         """Desativa um asset"""
         asset.active = False
         return self.update(asset)
+
+    def _bump_version(self) -> None:
+        """Invalida o registro de assets dos processos da API"""
+        DataVersionRepository(self.db).bump('assets', commit=False)
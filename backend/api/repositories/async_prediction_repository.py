@@ -0,0 +1,53 @@
+"""
+Buongiorno API - Async Prediction Repository
+Data Access Layer assíncrona (somente leitura) para Predictions
+"""
+
+from typing import List, Optional, Sequence, Tuple
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    from ..models.prediction import Prediction
+    from ..models.prediction_metric import PredictionMetric
+    from .prediction_repository import select_latest, select_page
+    from .prediction_metric_repository import select_metrics
+except ImportError:
+    from models.prediction import Prediction
+    from models.prediction_metric import PredictionMetric
+    from repositories.prediction_repository import select_latest, select_page
+    from repositories.prediction_metric_repository import select_metrics
+
+
+class AsyncPredictionRepository:
+    """
+    Consultas de previsões usadas pelos endpoints assíncronos (DB_ASYNC=true)
+
+    Mesmos SELECTs do PredictionRepository (select_latest, select_page) e
+    do PredictionMetricRepository (select_metrics), executados em uma
+    AsyncSession. As escritas continuam no repository
+    síncrono (pipeline, migração e endpoints de administração).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_latest_by_asset(self, asset_id: int, future_only: bool = True) -> Optional[Prediction]:
+        """Busca a previsão mais recente de um asset (ver PredictionRepository)"""
+        result = await self.db.execute(select_latest(asset_id, future_only))
+        return result.scalars().first()
+
+    async def get_page(self, asset_id: int, limit: int, columns: Sequence[str],
+                       after: Tuple[date, int] = None, start_date: date = None,
+                       end_date: date = None) -> List:
+        """Página de previsões de um asset (ver PredictionRepository.get_page)"""
+        result = await self.db.execute(
+            select_page(asset_id, limit, columns, after, start_date, end_date)
+        )
+        return result.all()
+
+    async def get_metrics(self, asset_id: int, model_used: str = None,
+                          window_days: int = None) -> List[PredictionMetric]:
+        """Métricas de acurácia de um asset (ver PredictionMetricRepository.get_by_asset)"""
+        result = await self.db.execute(select_metrics(asset_id, model_used, window_days))
+        return result.scalars().all()
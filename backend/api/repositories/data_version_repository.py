@@ -0,0 +1,72 @@
+"""
+Buongiorno API - DataVersion Repository
+Data Access Layer para DataVersions
+"""
+
+from typing import Dict
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+try:
+    from ..models.data_version import DataVersion
+except ImportError:
+    from models.data_version import DataVersion
+
+
+class DataVersionRepository:
+    """Repository para os contadores de geração dos dados"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> int:
+        """Geração atual de um conjunto de dados (0 se nunca foi incrementada)"""
+        version = self.db.query(DataVersion.version).filter(DataVersion.name == name).scalar()
+        return version or 0
+
+    def get_all(self) -> Dict[str, int]:
+        """Gerações de todos os conjuntos de dados"""
+        return dict(self.db.query(DataVersion.name, DataVersion.version).all())
+
+    def bump(self, name: str, commit: bool = True) -> int:
+        """
+        Incrementa a geração de um conjunto de dados
+
+        Com commit=False o incremento entra na transação do chamador (ex.: a
+        gravação das previsões do pipeline) e só vale se ela for confirmada.
+
+        No SQLite/PostgreSQL é um único INSERT ... ON CONFLICT DO UPDATE:
+        atômico mesmo quando a linha ainda não existe (um SELECT FOR UPDATE
+        não bloqueia nada nesse caso e dois INSERTs concorrentes colidiriam).
+
+        Returns:
+            int: Nova geração
+        """
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+            stmt = insert(DataVersion).values(name=name, version=1, updated_at=func.now())
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DataVersion.name],
+                set_={'version': DataVersion.version + 1, 'updated_at': func.now()}
+            ).returning(DataVersion.version)
+            version = self.db.execute(stmt).scalar_one()
+        else:
+            data_version = self.db.query(DataVersion).filter(
+                DataVersion.name == name
+            ).with_for_update().first()
+
+            if data_version is None:
+                data_version = DataVersion(name=name, version=0)
+                self.db.add(data_version)
+
+            data_version.version += 1
+            self.db.flush()
+            version = data_version.version
+
+        if commit:
+            self.db.commit()
+        return version
@@ -0,0 +1,92 @@
+"""
+Buongiorno API - ModelRun Repository
+Data Access Layer para ModelRuns
+"""
+
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import desc
+
+try:
+    from ..models.model_run import ModelRun
+except ImportError:
+    from models.model_run import ModelRun
+
+
+class ModelRunRepository:
+    """Repository para gerenciar operações de ModelRuns"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, model_name: str, status: str = 'completed', run_date: datetime = None,
+               model_version: str = None, mae: float = None, rmse: float = None,
+               mape: float = None, r2_score: float = None, train_size: int = None,
+               test_size: int = None, train_start_date: datetime = None,
+               train_end_date: datetime = None, duration_seconds: float = None,
+               error_message: str = None, config: dict = None,
+               completed_at: datetime = None, commit: bool = True) -> ModelRun:
+        """
+        Registra uma execução do pipeline/modelo
+
+        Com commit=False só envia ao banco (flush, o ID fica disponível) e a
+        transação fica a cargo do chamador.
+        """
+        model_run = ModelRun(
+            run_date=run_date or datetime.now(),
+            status=status,
+            model_name=model_name,
+            model_version=model_version,
+            mae=mae,
+            rmse=rmse,
+            mape=mape,
+            r2_score=r2_score,
+            train_size=train_size,
+            test_size=test_size,
+            train_start_date=train_start_date,
+            train_end_date=train_end_date,
+            duration_seconds=duration_seconds,
+            error_message=error_message,
+            config=config,
+            completed_at=completed_at
+        )
+        self.db.add(model_run)
+        if commit:
+            self.db.commit()
+            self.db.refresh(model_run)
+        else:
+            self.db.flush()
+        return model_run
+
+    def get_by_id(self, run_id: int) -> Optional[ModelRun]:
+        """Busca execução por ID"""
+        return self.db.query(ModelRun).filter(ModelRun.id == run_id).first()
+
+    def get_recent(self, limit: int = 20, asset_code: str = None, status: str = None) -> List[ModelRun]:
+        """
+        Lista as execuções mais recentes
+
+        Args:
+            limit: Número máximo de execuções
+            asset_code: Filtra pelo ativo (config['asset'])
+            status: Filtra pelo status ('running', 'completed', 'failed')
+        """
+        query = self.db.query(ModelRun)
+
+        if status:
+            query = query.filter(ModelRun.status == status)
+
+        query = query.order_by(desc(ModelRun.run_date), desc(ModelRun.id))
+
+        if not asset_code:
+            return query.limit(limit).all()
+
+        # O ativo fica no JSON de config: filtra em Python, em lotes
+        runs = []
+        for model_run in query.yield_per(100):
+            if (model_run.config or {}).get('asset') == asset_code:
+                runs.append(model_run)
+                if len(runs) >= limit:
+                    break
+        return runs
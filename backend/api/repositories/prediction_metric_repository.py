@@ -0,0 +1,207 @@
+"""
+Buongiorno API - PredictionMetric Repository
+Data Access Layer para as métricas de acurácia materializadas
+"""
+
+import math
+from typing import List, Sequence
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, select, delete, Select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+try:
+    from ..models.prediction import Prediction
+    from ..models.prediction_metric import PredictionMetric
+    from ..config import PREDICTION_METRIC_WINDOWS
+except ImportError:
+    from models.prediction import Prediction
+    from models.prediction_metric import PredictionMetric
+    from config import PREDICTION_METRIC_WINDOWS
+
+# Métricas calculadas por janela (colunas de PredictionMetric)
+METRIC_FIELDS = ('start_date', 'end_date', 'samples', 'mae', 'mape', 'rmse', 'hit_rate', 'bias')
+
+
+def select_metrics(asset_id: int, model_used: str = None, window_days: int = None) -> Select:
+    """SELECT das métricas de um asset (usado também pelo repository assíncrono)"""
+    stmt = select(PredictionMetric).where(PredictionMetric.asset_id == asset_id)
+
+    if model_used:
+        stmt = stmt.where(PredictionMetric.model_used == model_used)
+    if window_days:
+        stmt = stmt.where(PredictionMetric.window_days == window_days)
+
+    return stmt.order_by(PredictionMetric.model_used, PredictionMetric.window_days)
+
+
+class PredictionMetricRepository:
+    """Repository para gerenciar operações de PredictionMetrics"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_asset(self, asset_id: int, model_used: str = None,
+                     window_days: int = None) -> List[PredictionMetric]:
+        """Lista as métricas de um asset (opcionalmente de um modelo e/ou janela)"""
+        return self.db.execute(select_metrics(asset_id, model_used, window_days)).scalars().all()
+
+    def refresh(self, asset_id: int = None, windows: Sequence[int] = None,
+                commit: bool = True) -> int:
+        """
+        Recalcula as métricas a partir das previsões conciliadas
+
+        Chamado depois de cada conciliação de preços reais, só para os assets
+        conciliados. Cada asset custa uma consulta agregada (todas as janelas e
+        modelos de uma vez) sobre, no máximo, a maior janela de previsões,
+        pelo índice idx_asset_target_date.
+
+        Args:
+            asset_id: Recalcula apenas este asset (None = todos com previsões conciliadas)
+            windows: Janelas em dias (padrão: PREDICTION_METRIC_WINDOWS)
+            commit: False = a transação fica a cargo do chamador
+
+        Returns:
+            int: Número de linhas de métricas gravadas
+        """
+        windows = sorted(set(windows or PREDICTION_METRIC_WINDOWS))
+
+        if asset_id is None:
+            asset_ids = self.db.execute(
+                select(Prediction.asset_id).where(Prediction.real_price.isnot(None)).distinct()
+            ).scalars().all()
+        else:
+            asset_ids = [asset_id]
+
+        written = 0
+        for current_id in asset_ids:
+            rows = self._compute(current_id, windows)
+            self._write(current_id, rows)
+            written += len(rows)
+
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+        return written
+
+    def _compute(self, asset_id: int, windows: Sequence[int]) -> List[dict]:
+        """Métricas de um asset por modelo e janela (janelas sem amostras ficam de fora)"""
+        end_date = self.db.execute(
+            select(func.max(Prediction.target_date)).where(
+                Prediction.asset_id == asset_id,
+                Prediction.real_price.isnot(None)
+            )
+        ).scalar()
+        if end_date is None:
+            return []
+
+        error = Prediction.predicted_price - Prediction.real_price
+        absolute = func.abs(error)
+        # Direção certa: previsão e preço real do mesmo lado do preço atual
+        hit = case(
+            ((Prediction.predicted_price - Prediction.current_price)
+             * (Prediction.real_price - Prediction.current_price) > 0, 100.0),
+            (and_(Prediction.predicted_price == Prediction.current_price,
+                  Prediction.real_price == Prediction.current_price), 100.0),
+            else_=0.0
+        )
+        measures = {
+            'mae': absolute,
+            'mape': absolute / Prediction.real_price * 100,
+            'mse': error * error,
+            'hit_rate': hit,
+            'bias': error
+        }
+
+        # Janela de N dias: datas alvo de end_date - (N - 1) até end_date
+        starts = {days: end_date - timedelta(days=days - 1) for days in windows}
+        columns = [Prediction.model_used]
+        for days in windows:
+            inside = Prediction.target_date >= starts[days]
+            columns.append(func.count(case((inside, 1))).label(f'samples_{days}'))
+            columns.extend(
+                func.avg(case((inside, expression))).label(f'{name}_{days}')
+                for name, expression in measures.items()
+            )
+
+        result = self.db.execute(
+            select(*columns).where(
+                Prediction.asset_id == asset_id,
+                Prediction.real_price.isnot(None),
+                Prediction.target_date >= starts[windows[-1]],
+                Prediction.target_date <= end_date
+            ).group_by(Prediction.model_used)
+        )
+
+        rows = []
+        for row in result:
+            values = row._mapping
+            for days in windows:
+                if not values[f'samples_{days}']:
+                    continue
+                rows.append({
+                    'asset_id': asset_id,
+                    'model_used': row.model_used,
+                    'window_days': days,
+                    'start_date': starts[days],
+                    'end_date': end_date,
+                    'samples': values[f'samples_{days}'],
+                    'mae': float(values[f'mae_{days}']),
+                    'mape': float(values[f'mape_{days}']),
+                    'rmse': math.sqrt(values[f'mse_{days}']),
+                    'hit_rate': float(values[f'hit_rate_{days}']),
+                    'bias': float(values[f'bias_{days}'])
+                })
+
+        return rows
+
+    def _write(self, asset_id: int, rows: List[dict]) -> None:
+        """Grava as métricas de um asset e remove as de modelos/janelas que saíram"""
+        dialect = self.db.get_bind().dialect.name
+        keep = {(row['model_used'], row['window_days']) for row in rows}
+
+        stale = [
+            metric_id
+            for metric_id, model_used, window_days in self.db.execute(
+                select(PredictionMetric.id, PredictionMetric.model_used, PredictionMetric.window_days)
+                .where(PredictionMetric.asset_id == asset_id)
+            )
+            if (model_used, window_days) not in keep
+        ]
+        if stale:
+            self.db.execute(
+                delete(PredictionMetric).where(PredictionMetric.id.in_(stale))
+                .execution_options(synchronize_session=False)
+            )
+
+        if not rows:
+            return
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+            stmt = insert(PredictionMetric)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PredictionMetric.asset_id, PredictionMetric.model_used,
+                                PredictionMetric.window_days],
+                set_={
+                    **{column: stmt.excluded[column] for column in METRIC_FIELDS},
+                    'updated_at': func.now()
+                }
+            )
+            self.db.connection().execute(stmt, rows)
+        else:
+            existing = {
+                (metric.model_used, metric.window_days): metric
+                for metric in self.get_by_asset(asset_id)
+            }
+            for row in rows:
+                metric = existing.get((row['model_used'], row['window_days']))
+                if metric is None:
+                    self.db.add(PredictionMetric(**row))
+                else:
+                    for column in METRIC_FIELDS:
+                        setattr(metric, column, row[column])
+
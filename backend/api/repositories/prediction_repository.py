@@ -3,15 +3,76 @@ Buongiorno API - Prediction Repository
 Data Access Layer para Predictions
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+import sqlite3
+from sqlalchemy import desc, and_, or_, func, update, select, exists, Select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+import numpy as np
+import pandas as pd
 
 try:
     from ..models.prediction import Prediction
+    from ..models.price import Price
+    from ..config import DB_BULK_CHUNK_SIZE
 except ImportError:
     from models.prediction import Prediction
+    from models.price import Price
+    from config import DB_BULK_CHUNK_SIZE
+
+# Chave única de uma previsão (uq_predictions_asset_target_model_date)
+PREDICTION_KEY = ('asset_id', 'target_date', 'model_used', 'prediction_date')
+
+# Colunas atualizadas quando a previsão já existe (o preço real e os erros
+# são preenchidos pela conciliação e não são sobrescritos)
+PREDICTION_FIELDS = ('model_run_id', 'current_price', 'predicted_price', 'change_abs',
+                     'change_pct', 'trend', 'model_mape', 'confidence')
+
+
+def select_latest(asset_id: int, future_only: bool = True) -> Select:
+    """
+    SELECT da previsão mais recente de um asset (usado também pelo repository assíncrono)
+
+    Args:
+        asset_id: ID do asset
+        future_only: Se True, apenas previsões futuras (target_date >= hoje)
+    """
+    stmt = select(Prediction).where(Prediction.asset_id == asset_id)
+
+    if future_only:
+        stmt = stmt.where(Prediction.target_date >= date.today())
+
+    return stmt.order_by(desc(Prediction.prediction_date)).limit(1)
+
+
+def select_page(asset_id: int, limit: int, columns: Sequence[str],
+                after: Tuple[date, int] = None, start_date: date = None,
+                end_date: date = None) -> Select:
+    """
+    SELECT de uma página de previsões (ver PredictionRepository.get_page)
+
+    Returns:
+        Select: target_date, id e as colunas pedidas, em ordem decrescente
+    """
+    selected = ['target_date', 'id'] + [c for c in columns if c not in ('target_date', 'id')]
+    stmt = select(*[getattr(Prediction, column) for column in selected]).where(
+        Prediction.asset_id == asset_id
+    )
+
+    if start_date:
+        stmt = stmt.where(Prediction.target_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Prediction.target_date <= end_date)
+    if after:
+        after_date, after_id = after
+        stmt = stmt.where(or_(
+            Prediction.target_date < after_date,
+            and_(Prediction.target_date == after_date, Prediction.id < after_id)
+        ))
+
+    return stmt.order_by(desc(Prediction.target_date), desc(Prediction.id)).limit(limit)
 
 
 class PredictionRepository:
@@ -23,8 +84,14 @@ class PredictionRepository:
     def create(self, asset_id: int, prediction_date: datetime, target_date: date,
                current_price: float, predicted_price: float, change_abs: float,
                change_pct: float, trend: str, model_used: str, model_mape: float,
-               confidence: str, model_run_id: int = None, real_price: float = None) -> Prediction:
-        """Cria uma nova previsão"""
+               confidence: str, model_run_id: int = None, real_price: float = None,
+               commit: bool = True) -> Prediction:
+        """
+        Cria uma nova previsão
+
+        Com commit=False só envia ao banco (flush) e a transação fica a cargo
+        do chamador.
+        """
         prediction = Prediction(
             asset_id=asset_id,
             model_run_id=model_run_id,
@@ -46,10 +113,194 @@ class PredictionRepository:
             prediction.calculate_error()
 
         self.db.add(prediction)
-        self.db.commit()
-        self.db.refresh(prediction)
+        if commit:
+            self.db.commit()
+            self.db.refresh(prediction)
+        else:
+            self.db.flush()
         return prediction
 
+    def bulk_create(self, predictions, chunk_size: int = None, commit: bool = True) -> int:
+        """
+        Cria várias previsões em lote, ignorando as que já existem
+
+        Idempotente: previsões com a mesma chave (asset_id, target_date,
+        model_used, prediction_date) não são duplicadas nem alteradas.
+        Ver prepare_batch() para o formato de entrada.
+
+        Returns:
+            int: Número de previsões inseridas (as já existentes não contam)
+        """
+        return self._write_batch(predictions, False, chunk_size, commit)
+
+    def bulk_upsert(self, predictions, chunk_size: int = None, commit: bool = True) -> int:
+        """
+        Cria ou atualiza várias previsões em lote
+
+        Usa INSERT ... ON CONFLICT DO UPDATE no SQLite e no PostgreSQL; o preço
+        real e os erros já conciliados são mantidos.
+        Ver prepare_batch() para o formato de entrada.
+
+        Returns:
+            int: Número de previsões inseridas ou atualizadas
+        """
+        return self._write_batch(predictions, True, chunk_size, commit)
+
+    @staticmethod
+    def prepare_batch(predictions) -> List[dict]:
+        """
+        Completa um lote de previsões com operações vetorizadas
+
+        Args:
+            predictions: DataFrame ou lista de dicionários com asset_id,
+                prediction_date, target_date, current_price, predicted_price,
+                model_used e model_mape. change_abs, change_pct, trend,
+                confidence, model_run_id e real_price são opcionais.
+                A tendência pode vir como texto do pipeline ('ALTA ↗️').
+
+        Returns:
+            list: Linhas prontas para a tabela predictions
+        """
+        df = pd.DataFrame(predictions)
+        if df.empty:
+            return []
+
+        df['prediction_date'] = pd.to_datetime(df['prediction_date'])
+        df['target_date'] = pd.to_datetime(df['target_date']).dt.date
+
+        current = df['current_price'].astype(float)
+        predicted = df['predicted_price'].astype(float)
+        mape = df['model_mape'].astype(float)
+
+        change_abs = predicted - current
+        if 'change_abs' in df:
+            change_abs = df['change_abs'].astype(float).fillna(change_abs)
+        change_pct = change_abs / current * 100
+        if 'change_pct' in df:
+            change_pct = df['change_pct'].astype(float).fillna(change_pct)
+
+        # Tendência informada (API ou texto do pipeline) ou, na falta, pela
+        # variação (mesmo critério de PredictionService.create_prediction)
+        trend = np.select([change_pct > 0.1, change_pct < -0.1], ['up', 'down'], 'stable')
+        if 'trend' in df:
+            text = df['trend'].astype(str).str.lower()
+            given = np.select(
+                [text.str.contains('alta|↗') | (text == 'up'),
+                 text.str.contains('baixa|↘') | (text == 'down')],
+                ['up', 'down'], 'stable'
+            )
+            trend = np.where(df['trend'].isna(), trend, given)
+
+        confidence = np.select([mape < 1, mape < 2], ['high', 'medium'], 'low')
+        if 'confidence' in df:
+            confidence = df['confidence'].where(df['confidence'].notna(), confidence)
+
+        real_price = df['real_price'].astype(float) if 'real_price' in df else pd.Series(np.nan, index=df.index)
+        error_abs = predicted - real_price
+
+        batch = pd.DataFrame({
+            'asset_id': df['asset_id'].astype(int),
+            'model_run_id': df['model_run_id'] if 'model_run_id' in df else None,
+            'prediction_date': df['prediction_date'],
+            'target_date': df['target_date'],
+            'current_price': current,
+            'predicted_price': predicted,
+            'real_price': real_price,
+            'change_abs': change_abs,
+            'change_pct': change_pct,
+            'trend': trend,
+            'model_used': df['model_used'].astype(str),
+            'model_mape': mape,
+            'confidence': confidence,
+            'error_abs': error_abs,
+            'error_pct': error_abs / real_price * 100
+        })
+
+        # Colunas como arrays de objetos Python (NaN -> None), montadas em
+        # dicionários uma única vez (DataFrame.to_dict converte célula a célula)
+        columns = {}
+        for name, series in batch.items():
+            if name == 'prediction_date':
+                values = np.asarray(series.dt.to_pydatetime(), dtype=object)
+            elif name == 'model_run_id':
+                values = series.astype('Int64').to_numpy(dtype=object, na_value=None)
+            else:
+                values = np.where(series.isna().to_numpy(), None, series.to_numpy(dtype=object))
+            columns[name] = values
+
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def _write_batch(self, predictions, update: bool, chunk_size: int, commit: bool) -> int:
+        """Grava um lote (ver bulk_create/bulk_upsert)"""
+        rows = self.prepare_batch(predictions)
+        if not rows:
+            return 0
+
+        chunk_size = chunk_size or DB_BULK_CHUNK_SIZE
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+            stmt = insert(Prediction)
+            if update:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(PREDICTION_KEY),
+                    set_={
+                        **{column: stmt.excluded[column] for column in PREDICTION_FIELDS},
+                        'updated_at': func.now()
+                    }
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(PREDICTION_KEY))
+
+        written = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if dialect in ('sqlite', 'postgresql'):
+                # Core (executemany) na conexão da sessão: mesma transação;
+                # rowcount não conta as linhas ignoradas pelo ON CONFLICT
+                written += self.db.connection().execute(stmt, chunk).rowcount
+            else:
+                written += self._write_chunk(chunk, update)
+
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+        return written
+
+    def _write_chunk(self, rows: List[dict], update: bool) -> int:
+        """
+        Lote sem ON CONFLICT: um SELECT das chaves existentes por lote
+
+        Returns:
+            int: Linhas inseridas (e atualizadas, com update)
+        """
+        dates = [row['target_date'] for row in rows]
+        existing = {
+            tuple(getattr(prediction, column) for column in PREDICTION_KEY): prediction
+            for prediction in self.db.query(Prediction).filter(
+                Prediction.asset_id.in_({row['asset_id'] for row in rows}),
+                Prediction.target_date >= min(dates),
+                Prediction.target_date <= max(dates)
+            )
+        }
+
+        written = 0
+        for row in rows:
+            prediction = existing.get(tuple(row[column] for column in PREDICTION_KEY))
+            if prediction is None:
+                self.db.add(Prediction(**row))
+                written += 1
+            elif update:
+                for column in PREDICTION_FIELDS:
+                    setattr(prediction, column, row[column])
+                written += 1
+
+        return written
+
     def get_by_id(self, prediction_id: int) -> Optional[Prediction]:
         """Busca previsão por ID"""
         return self.db.query(Prediction).filter(Prediction.id == prediction_id).first()
@@ -62,13 +313,7 @@ class PredictionRepository:
             asset_id: ID do asset
             future_only: Se True, retorna apenas previsões futuras (target_date >= hoje)
         """
-        query = self.db.query(Prediction).filter(Prediction.asset_id == asset_id)
-
-        if future_only:
-            today = date.today()
-            query = query.filter(Prediction.target_date >= today)
-
-        return query.order_by(desc(Prediction.prediction_date)).first()
+        return self.db.execute(select_latest(asset_id, future_only)).scalars().first()
 
     def get_by_asset(self, asset_id: int, limit: int = None) -> List[Prediction]:
         """Lista previsões de um asset"""
@@ -81,6 +326,31 @@ class PredictionRepository:
 
         return query.all()
 
+    def get_page(self, asset_id: int, limit: int, columns: Sequence[str],
+                 after: Tuple[date, int] = None, start_date: date = None,
+                 end_date: date = None) -> List:
+        """
+        Página de previsões de um asset, da data alvo mais recente para a mais antiga
+
+        Paginação por chave (keyset) em (target_date, id): cada página continua
+        a partir da última linha da anterior, sem OFFSET, usando o índice
+        idx_asset_target_date (o custo não cresce com o número de páginas).
+
+        Args:
+            asset_id: ID do asset
+            limit: Máximo de linhas
+            columns: Colunas de Prediction a selecionar (projeção)
+            after: (target_date, id) da última linha da página anterior
+            start_date: Data alvo mínima (inclusive)
+            end_date: Data alvo máxima (inclusive)
+
+        Returns:
+            list: Linhas (Row) com target_date, id e as colunas pedidas
+        """
+        return self.db.execute(
+            select_page(asset_id, limit, columns, after, start_date, end_date)
+        ).all()
+
     def get_by_target_date(self, asset_id: int, target_date: date) -> List[Prediction]:
         """Busca todas as previsões para uma data alvo específica"""
         return self.db.query(Prediction).filter(
@@ -126,6 +396,67 @@ class PredictionRepository:
         self.db.refresh(prediction)
         return prediction
 
+    def reconcile_real_prices(self, asset_id: int = None, since: date = None,
+                              commit: bool = True) -> int:
+        """
+        Preenche real_price, error_abs e error_pct das previsões pendentes
+
+        Um único UPDATE ... FROM prices (PostgreSQL e SQLite >= 3.33) junta
+        cada previsão sem preço real ao fechamento do ativo na data alvo. Nos
+        demais bancos usa subconsultas correlacionadas no mesmo comando.
+
+        Com since, previsões já conciliadas com data alvo a partir dessa data
+        também são recalculadas quando o fechamento gravado mudou (pregão
+        revisado depois da conciliação).
+
+        Args:
+            asset_id: Concilia apenas este asset (None = todos)
+            since: Data alvo a partir da qual preços reais já gravados são revistos
+            commit: False = a transação fica a cargo do chamador
+
+        Returns:
+            int: Número de previsões atualizadas
+        """
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect == 'postgresql' or (dialect == 'sqlite' and sqlite3.sqlite_version_info >= (3, 33)):
+            close = Price.close
+            joined = [Price.asset_id == Prediction.asset_id, Price.date == Prediction.target_date]
+        else:
+            close = select(Price.close).where(
+                Price.asset_id == Prediction.asset_id,
+                Price.date == Prediction.target_date
+            ).scalar_subquery()
+            joined = [exists().where(
+                Price.asset_id == Prediction.asset_id,
+                Price.date == Prediction.target_date
+            )]
+
+        pending = Prediction.real_price.is_(None)
+        if since is not None:
+            pending = or_(pending, and_(Prediction.target_date >= since, Prediction.real_price != close))
+
+        stmt = update(Prediction).where(*joined, pending)
+        if asset_id is not None:
+            stmt = stmt.where(Prediction.asset_id == asset_id)
+
+        result = self.db.execute(
+            stmt.values(
+                real_price=close,
+                error_abs=Prediction.predicted_price - close,
+                error_pct=(Prediction.predicted_price - close) / close * 100,
+                updated_at=func.now()
+            ).execution_options(synchronize_session=False)
+        )
+
+        if commit:
+            self.db.commit()
+        else:
+            # Objetos já carregados na sessão não refletem o UPDATE
+            self.db.expire_all()
+
+        return result.rowcount
+
     def update(self, prediction: Prediction) -> Prediction:
         """Atualiza uma previsão"""
         self.db.commit()
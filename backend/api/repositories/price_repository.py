@@ -6,12 +6,19 @@ Data Access Layer para Prices
 from typing import List, Optional
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 
 try:
     from ..models.price import Price
+    from ..config import DB_BULK_CHUNK_SIZE
 except ImportError:
     from models.price import Price
+    from config import DB_BULK_CHUNK_SIZE
+
+# Colunas atualizadas quando o preço do dia já existe
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'adj_close', 'volume')
 
 
 class PriceRepository:
@@ -96,17 +103,80 @@ class PriceRepository:
         return price
 
     def upsert(self, asset_id: int, date: date, **price_data) -> Price:
-        """Insere ou atualiza um preço"""
-        existing = self.get_by_asset_and_date(asset_id, date)
-
-        if existing:
-            # Update
-            for key, value in price_data.items():
-                setattr(existing, key, value)
-            return self.update(existing)
+        """Insere ou atualiza um preço (ver bulk_upsert)"""
+        self.bulk_upsert([{'asset_id': asset_id, 'date': date, **price_data}])
+        return self.get_by_asset_and_date(asset_id, date)
+
+    def bulk_upsert(self, rows: List[dict], chunk_size: int = None, commit: bool = True) -> int:
+        """
+        Insere ou atualiza vários preços em lote
+
+        Usa INSERT ... ON CONFLICT (asset_id, date) DO UPDATE no SQLite e no
+        PostgreSQL, em comandos de até chunk_size linhas; nenhum SELECT prévio.
+        Outros bancos buscam os existentes por lote e inserem o restante.
+
+        Args:
+            rows: Dicionários com asset_id, date, open, high, low, close
+                  (adj_close e volume opcionais)
+            chunk_size: Linhas por comando (padrão: DB_BULK_CHUNK_SIZE)
+            commit: False = só flush (a transação fica a cargo do chamador)
+
+        Returns:
+            int: Número de linhas gravadas (inseridas ou atualizadas)
+        """
+        if not rows:
+            return 0
+
+        chunk_size = chunk_size or DB_BULK_CHUNK_SIZE
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+            stmt = insert(Price)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Price.asset_id, Price.date],
+                set_={
+                    **{column: stmt.excluded[column] for column in PRICE_FIELDS},
+                    'updated_at': func.now()
+                }
+            )
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = [
+                {'adj_close': None, 'volume': None, **row}
+                for row in rows[start:start + chunk_size]
+            ]
+            if dialect in ('sqlite', 'postgresql'):
+                # Core (executemany) na conexão da sessão: mesma transação,
+                # sem o custo do ORM por linha
+                self.db.connection().execute(stmt, chunk)
+            else:
+                self._upsert_chunk(chunk)
+
+        if commit:
+            self.db.commit()
         else:
-            # Insert
-            return self.create(asset_id=asset_id, date=date, **price_data)
+            self.db.flush()
+
+        return len(rows)
+
+    def _upsert_chunk(self, rows: List[dict]) -> None:
+        """Upsert de um lote sem ON CONFLICT: um SELECT por ativo do lote"""
+        for asset_id in {row['asset_id'] for row in rows}:
+            asset_rows = [row for row in rows if row['asset_id'] == asset_id]
+            dates = [row['date'] for row in asset_rows]
+            existing = {
+                price.date: price
+                for price in self.get_by_date_range(asset_id, min(dates), max(dates))
+            }
+
+            for row in asset_rows:
+                price = existing.get(row['date'])
+                if price is None:
+                    self.db.add(Price(**row))
+                else:
+                    for column in PRICE_FIELDS:
+                        setattr(price, column, row[column])
 
     def delete(self, price: Price) -> None:
         """Remove um preço"""
@@ -3,57 +3,134 @@ Buongiorno API - Pipeline Router
 Endpoint to trigger pipeline execution manually or via webhook
 """
 
-from fastapi import APIRouter, HTTPException, Header
-import subprocess
-import sys
+from fastapi import APIRouter, HTTPException, Header, Query, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+from collections import deque
 import os
 from pathlib import Path
 
+try:
+    from ..database import get_db
+    from ..repositories.model_run_repository import ModelRunRepository
+    from ..services.pipeline_jobs import job_runner
+    from ..services.prediction_service import PredictionService
+    from ..services.response_cache import response_cache
+except ImportError:
+    from database import get_db
+    from repositories.model_run_repository import ModelRunRepository
+    from services.pipeline_jobs import job_runner
+    from services.prediction_service import PredictionService
+    from services.response_cache import response_cache
+
 router = APIRouter()
 
 # Optional: Set a secret token for security
 PIPELINE_SECRET = os.getenv("PIPELINE_SECRET", "")
 
 
+def check_pipeline_secret(authorization: Optional[str]):
+    """Validate the Authorization header when PIPELINE_SECRET is configured"""
+    if PIPELINE_SECRET:
+        if not authorization or authorization != f"Bearer {PIPELINE_SECRET}":
+            raise HTTPException(status_code=401, detail="Invalid or missing authorization")
+
+
 @router.post("/pipeline/run")
-async def trigger_pipeline(authorization: str = Header(None)):
+async def trigger_pipeline(
+    authorization: str = Header(None),
+    asset: Optional[str] = Query(None, description="Run a single asset (default: all active assets)"),
+    force: bool = Query(False, description="Ignore the stage cache and run every step")
+):
     """
     Trigger the prediction pipeline manually
 
+    The run is queued on the API's pipeline worker process and a job ID is
+    returned (see /pipeline/jobs/{job_id}). If a job for the same asset (or
+    for all assets) is already queued or running, that job is returned
+    instead of starting a duplicate run.
+
     Optional: Add Authorization header with secret token for security
     Example: Authorization: Bearer your-secret-token
     """
 
     # If secret is configured, validate it
-    if PIPELINE_SECRET:
-        if not authorization or authorization != f"Bearer {PIPELINE_SECRET}":
-            raise HTTPException(status_code=401, detail="Invalid or missing authorization")
+    check_pipeline_secret(authorization)
 
     try:
-        # Get project root
-        api_dir = Path(__file__).parent.parent
-        project_root = api_dir.parent.parent
-        pipeline_script = project_root / 'run_pipeline_prod.py'
-
-        # Run pipeline in background (non-blocking)
-        process = subprocess.Popen(
-            [sys.executable, str(pipeline_script)],
-            cwd=str(project_root),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        job, created = job_runner.submit(asset=asset, force=force)
 
         return {
-            "status": "started",
-            "message": "Pipeline execution started in background",
-            "pid": process.pid
+            "status": "started" if created else "already_running",
+            "message": "Pipeline execution started in background" if created
+                       else "Pipeline is already running for this asset",
+            "job_id": job['id'],
+            "job": job
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start pipeline: {str(e)}")
 
 
+@router.post("/pipeline/reconcile")
+def reconcile_real_prices(
+    authorization: str = Header(None),
+    asset: Optional[str] = Query(None, description="Reconcile a single asset (default: all assets)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Fill the real price and errors of predictions whose target date already has a price
+
+    The pipeline does this after every price ingestion; this endpoint runs
+    it on demand (e.g. after loading prices by hand) and also recomputes the
+    accuracy metrics served by /predictions/accuracy. Same authorization as
+    /pipeline/run.
+    """
+    check_pipeline_secret(authorization)
+
+    try:
+        result = PredictionService(db).reconcile_real_prices(asset_code=asset)
+        if result['updated'] or result['metrics']:
+            response_cache.invalidate()
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile predictions: {str(e)}")
+
+
+@router.get("/pipeline/jobs")
+def list_pipeline_jobs(limit: int = Query(20, description="Number of jobs", ge=1, le=100)):
+    """
+    List recent pipeline jobs started through the API (most recent first)
+    """
+    jobs = job_runner.list(limit=limit)
+    return {"count": len(jobs), "jobs": jobs}
+
+
+@router.get("/pipeline/jobs/{job_id}")
+def get_pipeline_job(
+    job_id: str,
+    log_lines: int = Query(0, description="Include the last N lines of the job log", ge=0, le=1000)
+):
+    """
+    Status, progress, per-stage timings and results of a pipeline job
+    """
+    job = job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    if log_lines:
+        try:
+            with open(job['log_file'], encoding='utf-8', errors='replace') as f:
+                job['log'] = [line.rstrip('\n') for line in deque(f, maxlen=log_lines)]
+        except OSError:
+            job['log'] = []
+
+    return job
+
+
 @router.get("/pipeline/status")
 async def pipeline_status():
     """
@@ -82,3 +159,28 @@ async def pipeline_status():
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking pipeline status: {str(e)}")
+
+
+@router.get("/pipeline/runs")
+def get_pipeline_runs(
+    limit: int = Query(20, description="Número de execuções", ge=1, le=200),
+    asset: Optional[str] = Query(None, description="Filtra pelo ativo (gold, silver, oil)"),
+    status: Optional[str] = Query(None, description="Filtra pelo status (completed, failed)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Lista as execuções recentes do pipeline
+
+    Cada execução traz as métricas do modelo vencedor e, em config['stages'],
+    tempo, CPU, pico de memória, linhas e ajustes de modelo de cada etapa.
+    """
+    try:
+        runs = ModelRunRepository(db).get_recent(limit=limit, asset_code=asset, status=status)
+
+        return {
+            "count": len(runs),
+            "runs": [run.to_dict() for run in runs]
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing pipeline runs: {str(e)}")
@@ -4,17 +4,21 @@ Endpoints relacionados a previsões de preços
 """
 
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date
 
 try:
     from ..database import get_db
     from ..services.prediction_service import PredictionService
-    from ..repositories.asset_repository import AssetRepository
+    from ..services.response_cache import response_cache
+    from ..services.asset_registry import asset_registry
 except ImportError:
     from database import get_db
     from services.prediction_service import PredictionService
-    from repositories.asset_repository import AssetRepository
+    from services.response_cache import response_cache
+    from services.asset_registry import asset_registry
 
 
 router = APIRouter()
@@ -32,9 +36,9 @@ def get_latest_prediction(
         asset: Código do ativo (gold, silver, oil)
 
     Returns:
-        Dados da última previsão
+        Dados da última previsão (em cache até o pipeline gravar novas previsões)
     """
-    try:
+    def build():
         service = PredictionService(db)
         prediction = service.get_latest_prediction(asset_code=asset)
 
@@ -46,38 +50,66 @@ def get_latest_prediction(
 
         return prediction
 
+    try:
+        return response_cache.response(('latest', asset), build)
+
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Lista de campos de ?fields=a,b,c (None = todos)"""
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(',') if name.strip()] or None
+
+
 @router.get("/predictions/history")
 def get_prediction_history(
     asset: str = Query("gold", description="Ativo"),
     limit: int = Query(30, description="Número de registros", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    start: Optional[date] = Query(None, description="Data alvo mínima (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Data alvo máxima (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (padrão: todos)"),
     db: Session = Depends(get_db)
 ):
     """
-    Retorna o histórico de previsões
+    Retorna o histórico de previsões, da data alvo mais recente para a mais antiga
 
     Args:
         asset: Código do ativo
         limit: Número máximo de registros
+        cursor: Continua a partir da página anterior (next_cursor)
+        start: Data alvo mínima
+        end: Data alvo máxima
+        fields: Projeção (ex.: target_date,predicted_price)
 
     Returns:
-        Lista de previsões históricas
+        Página de previsões e next_cursor (null na última página), em cache
+        até o pipeline gravar novas previsões
     """
-    try:
+    def build():
         service = PredictionService(db)
-        history = service.get_history(asset_code=asset, limit=limit)
+        page = service.get_history(
+            asset_code=asset, limit=limit, cursor=cursor, start=start, end=end,
+            fields=parse_fields(fields)
+        )
 
         return {
             "asset": asset,
-            "count": len(history),
-            "predictions": history
+            "count": len(page["predictions"]),
+            "predictions": page["predictions"],
+            "next_cursor": page["next_cursor"]
         }
 
+    try:
+        return response_cache.response(('history', asset, limit, cursor, start, end, fields), build)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -85,6 +117,11 @@ def get_prediction_history(
 @router.get("/predictions/history-errors")
 def get_prediction_history_errors(
     asset: str = Query("gold", description="Ativo"),
+    limit: int = Query(365, description="Número de registros", ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    start: Optional[date] = Query(None, description="Data alvo mínima (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Data alvo máxima (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (padrão: todos)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -93,39 +130,88 @@ def get_prediction_history_errors(
 
     Args:
         asset: Código do ativo
+        limit: Número máximo de registros
+        cursor: Continua a partir da página anterior (next_cursor)
+        start: Data alvo mínima
+        end: Data alvo máxima
+        fields: Projeção (ex.: target_date,error_pct)
 
     Returns:
-        Lista de previsões com erros de previsão calculados
+        Página de previsões com erros de previsão calculados e next_cursor
+        (null na última página), em cache até o pipeline gravar novas previsões
     """
-    try:
+    def build():
         service = PredictionService(db)
-        history = service.get_history_with_errors(asset_code=asset)
+        page = service.get_history_with_errors(
+            asset_code=asset, limit=limit, cursor=cursor, start=start, end=end,
+            fields=parse_fields(fields)
+        )
 
         return {
             "asset": asset,
-            "count": len(history),
-            "predictions": history
+            "count": len(page["predictions"]),
+            "predictions": page["predictions"],
+            "next_cursor": page["next_cursor"]
         }
 
+    try:
+        return response_cache.response(('history-errors', asset, limit, cursor, start, end, fields), build)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/predictions/accuracy")
+def get_prediction_accuracy(
+    asset: str = Query("gold", description="Ativo"),
+    model: Optional[str] = Query(None, description="Modelo (padrão: todos)"),
+    window: Optional[int] = Query(None, description="Janela em dias (7, 30, 90, 365; padrão: todas)", ge=1),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna as métricas de acurácia (MAE, MAPE, RMSE, acerto de direção e viés)
+    por modelo e janela
+
+    Lidas da tabela prediction_metrics, recalculada a cada conciliação de
+    preços reais: a janela termina na última data alvo com preço real.
+
+    Args:
+        asset: Código do ativo
+        model: Filtra por modelo
+        window: Filtra pela janela (dias)
+
+    Returns:
+        Métricas por modelo e janela (em cache até o pipeline gravar novas previsões)
+    """
+    def build():
+        accuracy = PredictionService(db).get_accuracy(asset_code=asset, model=model, window=window)
+
+        if accuracy is None:
+            raise HTTPException(status_code=404, detail=f"Asset não encontrado: {asset}")
+
+        return accuracy
+
+    try:
+        return response_cache.response(('accuracy', asset, model, window), build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/assets")
-def list_assets(db: Session = Depends(get_db)):
+def list_assets():
     """
     Lista todos os ativos disponíveis
 
     Returns:
-        Lista de ativos configurados
+        Lista de ativos configurados (do registro em memória, já serializada)
     """
     try:
-        asset_repo = AssetRepository(db)
-        assets = asset_repo.get_all()
-
-        return {
-            "assets": [asset.to_dict() for asset in assets]
-        }
+        return Response(asset_registry.list_response_body(), media_type='application/json')
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,172 @@
+"""
+Buongiorno API - Router de Previsões (Async Version)
+Endpoints de previsões com acesso assíncrono ao banco (DB_ASYNC=true)
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date
+
+try:
+    from ..database import get_async_db
+    from ..services.async_prediction_service import AsyncPredictionService
+    from ..services.response_cache import response_cache
+    from . import predictions
+except ImportError:
+    from database import get_async_db
+    from services.async_prediction_service import AsyncPredictionService
+    from services.response_cache import response_cache
+    from routers import predictions
+
+
+router = APIRouter()
+
+
+@router.get("/predictions/latest")
+async def get_latest_prediction(
+    asset: str = Query("gold", description="Ativo (gold, silver, oil)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna a última previsão disponível
+
+    Args:
+        asset: Código do ativo (gold, silver, oil)
+
+    Returns:
+        Dados da última previsão (em cache até o pipeline gravar novas previsões)
+    """
+    async def build():
+        prediction = await AsyncPredictionService(db).get_latest_prediction(asset_code=asset)
+
+        if not prediction:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Nenhuma previsão encontrada para o ativo '{asset}'"
+            )
+
+        return prediction
+
+    try:
+        return await response_cache.aresponse(('latest', asset), build)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/predictions/history")
+async def get_prediction_history(
+    asset: str = Query("gold", description="Ativo"),
+    limit: int = Query(30, description="Número de registros", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    start: Optional[date] = Query(None, description="Data alvo mínima (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Data alvo máxima (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (padrão: todos)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna o histórico de previsões, da data alvo mais recente para a mais antiga
+
+    Mesmos parâmetros e resposta do endpoint síncrono (routers/predictions.py)
+    """
+    async def build():
+        page = await AsyncPredictionService(db).get_history(
+            asset_code=asset, limit=limit, cursor=cursor, start=start, end=end,
+            fields=predictions.parse_fields(fields)
+        )
+
+        return {
+            "asset": asset,
+            "count": len(page["predictions"]),
+            "predictions": page["predictions"],
+            "next_cursor": page["next_cursor"]
+        }
+
+    try:
+        return await response_cache.aresponse(
+            ('history', asset, limit, cursor, start, end, fields), build
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/predictions/history-errors")
+async def get_prediction_history_errors(
+    asset: str = Query("gold", description="Ativo"),
+    limit: int = Query(365, description="Número de registros", ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor da página anterior"),
+    start: Optional[date] = Query(None, description="Data alvo mínima (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Data alvo máxima (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula (padrão: todos)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna o histórico de previsões com erros calculados
+    comparando com os valores reais
+
+    Mesmos parâmetros e resposta do endpoint síncrono (routers/predictions.py)
+    """
+    async def build():
+        page = await AsyncPredictionService(db).get_history_with_errors(
+            asset_code=asset, limit=limit, cursor=cursor, start=start, end=end,
+            fields=predictions.parse_fields(fields)
+        )
+
+        return {
+            "asset": asset,
+            "count": len(page["predictions"]),
+            "predictions": page["predictions"],
+            "next_cursor": page["next_cursor"]
+        }
+
+    try:
+        return await response_cache.aresponse(
+            ('history-errors', asset, limit, cursor, start, end, fields), build
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/predictions/accuracy")
+async def get_prediction_accuracy(
+    asset: str = Query("gold", description="Ativo"),
+    model: Optional[str] = Query(None, description="Modelo (padrão: todos)"),
+    window: Optional[int] = Query(None, description="Janela em dias (7, 30, 90, 365; padrão: todas)", ge=1),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna as métricas de acurácia por modelo e janela
+
+    Mesmos parâmetros e resposta do endpoint síncrono (routers/predictions.py)
+    """
+    async def build():
+        accuracy = await AsyncPredictionService(db).get_accuracy(
+            asset_code=asset, model=model, window=window
+        )
+
+        if accuracy is None:
+            raise HTTPException(status_code=404, detail=f"Asset não encontrado: {asset}")
+
+        return accuracy
+
+    try:
+        return await response_cache.aresponse(('accuracy', asset, model, window), build)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Endpoints que não acessam o banco: os mesmos do router síncrono
+router.add_api_route("/assets", predictions.list_assets, methods=["GET"])
+router.add_api_route("/models", predictions.list_models, methods=["GET"])
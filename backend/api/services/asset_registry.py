@@ -0,0 +1,146 @@
+"""
+Buongiorno API - Asset Registry
+Registro em memória dos ativos, compartilhado entre requisições
+"""
+
+import time
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+try:
+    from ..config import ASSET_REGISTRY_CHECK_INTERVAL
+    from ..database import SessionLocal
+    from ..repositories.asset_repository import AssetRepository
+    from ..repositories.data_version_repository import DataVersionRepository
+except ImportError:
+    from config import ASSET_REGISTRY_CHECK_INTERVAL
+    from database import SessionLocal
+    from repositories.asset_repository import AssetRepository
+    from repositories.data_version_repository import DataVersionRepository
+
+
+@dataclass(frozen=True)
+class AssetInfo:
+    """Cópia somente leitura de um Asset (não depende de sessão)"""
+
+    id: int
+    code: str
+    name: str
+    symbol: str
+    description: Optional[str]
+    active: bool
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionário (mesmo formato de Asset.to_dict)"""
+        return asdict(self)
+
+
+class AssetRegistry:
+    """
+    Ativos em memória, com busca O(1) por código e por ID
+
+    Carregado na inicialização da API. Toda escrita em assets incrementa a
+    geração 'assets' (data_versions); o registro a consulta no máximo a cada
+    check_interval segundos e recarrega a tabela quando ela muda.
+    """
+
+    def __init__(self, check_interval: float = ASSET_REGISTRY_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.generation = None
+        self.checked_at = None
+        self.by_code: Dict[str, AssetInfo] = {}
+        self.by_id: Dict[int, AssetInfo] = {}
+        self.assets: List[AssetInfo] = []
+        self.list_body = b''
+
+    def load(self) -> None:
+        """(Re)carrega todos os ativos do banco"""
+        db = SessionLocal()
+        try:
+            generation = DataVersionRepository(db).get('assets')
+            assets = [AssetInfo(**asset.to_dict()) for asset in AssetRepository(db).get_all()]
+        finally:
+            db.close()
+
+        # Troca as referências de uma vez: leitores nunca veem um estado parcial
+        with self.lock:
+            self.assets = assets
+            self.by_code = {asset.code: asset for asset in assets}
+            self.by_id = {asset.id: asset for asset in assets}
+            self.list_body = JSONResponse({"assets": [asset.to_dict() for asset in assets]}).body
+            self.generation = generation
+            self.checked_at = time.monotonic()
+
+    def _check_due(self) -> bool:
+        """True se já passou check_interval desde a última consulta da geração"""
+        checked_at = self.checked_at
+        return checked_at is None or time.monotonic() - checked_at >= self.check_interval
+
+    def refresh(self) -> None:
+        """Recarrega se a geração 'assets' mudou (consulta no máximo a cada check_interval)"""
+        now = time.monotonic()
+        with self.lock:
+            if self.checked_at is not None and now - self.checked_at < self.check_interval:
+                return
+            self.checked_at = now
+            loaded = self.generation is not None
+
+        try:
+            if loaded:
+                db = SessionLocal()
+                try:
+                    if DataVersionRepository(db).get('assets') == self.generation:
+                        return
+                finally:
+                    db.close()
+            self.load()
+        except Exception:
+            # Banco indisponível: mantém os ativos já carregados
+            if not loaded:
+                raise
+
+    async def arefresh(self) -> None:
+        """refresh() para os endpoints assíncronos: a consulta roda no threadpool"""
+        if self._check_due():
+            await run_in_threadpool(self.refresh)
+
+    def invalidate(self) -> None:
+        """Força a releitura da geração na próxima consulta"""
+        with self.lock:
+            self.checked_at = None
+
+    def get_by_code(self, code: str) -> Optional[AssetInfo]:
+        """Ativo pelo código (ex.: 'gold') ou None"""
+        self.refresh()
+        return self.by_code.get(code)
+
+    async def aget_by_code(self, code: str) -> Optional[AssetInfo]:
+        """get_by_code() sem bloquear o event loop"""
+        await self.arefresh()
+        return self.by_code.get(code)
+
+    def get_by_id(self, asset_id: int) -> Optional[AssetInfo]:
+        """Ativo pelo ID ou None"""
+        self.refresh()
+        return self.by_id.get(asset_id)
+
+    def get_all(self, active_only: bool = False) -> List[AssetInfo]:
+        """Todos os ativos (ou só os ativos ativos)"""
+        self.refresh()
+        return [asset for asset in self.assets if asset.active] if active_only else list(self.assets)
+
+    def list_response_body(self) -> bytes:
+        """Corpo JSON já serializado de GET /api/assets"""
+        self.refresh()
+        return self.list_body
+
+
+# Instância única do processo da API
+asset_registry = AssetRegistry()
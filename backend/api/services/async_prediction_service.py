@@ -0,0 +1,113 @@
+"""
+Buongiorno API - Serviço de Previsões (Async Version)
+Consultas de previsões para os endpoints assíncronos (DB_ASYNC=true)
+"""
+
+from typing import Dict, List, Optional
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    from ..repositories.async_prediction_repository import AsyncPredictionRepository
+    from .asset_registry import asset_registry
+    from .prediction_service import (
+        HISTORY_FIELDS, HISTORY_ERRORS_FIELDS, decode_cursor, latest_response,
+        resolve_fields, history_response, accuracy_response
+    )
+except ImportError:
+    from repositories.async_prediction_repository import AsyncPredictionRepository
+    from services.asset_registry import asset_registry
+    from services.prediction_service import (
+        HISTORY_FIELDS, HISTORY_ERRORS_FIELDS, decode_cursor, latest_response,
+        resolve_fields, history_response, accuracy_response
+    )
+
+
+class AsyncPredictionService:
+    """
+    Versão assíncrona das leituras do PredictionService
+
+    Mesmas respostas (latest_response, history_response); as escritas e a
+    conciliação continuam no PredictionService.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.prediction_repo = AsyncPredictionRepository(db)
+
+    async def get_latest_prediction(self, asset_code: str = "gold") -> Optional[Dict]:
+        """
+        Retorna a última previsão disponível (ver PredictionService)
+
+        Args:
+            asset_code: Código do ativo (gold, silver, oil)
+
+        Returns:
+            Dicionário com dados da previsão ou None
+        """
+        asset = await asset_registry.aget_by_code(asset_code)
+        if not asset:
+            return None
+
+        # Primeiro tenta previsões futuras, depois qualquer uma
+        prediction = await self.prediction_repo.get_latest_by_asset(asset.id, future_only=True)
+        if not prediction:
+            prediction = await self.prediction_repo.get_latest_by_asset(asset.id, future_only=False)
+
+        if not prediction:
+            return None
+
+        return latest_response(asset_code, prediction)
+
+    async def get_history(self, asset_code: str = "gold", limit: int = 30,
+                          cursor: Optional[str] = None, start: Optional[date] = None,
+                          end: Optional[date] = None,
+                          fields: Optional[List[str]] = None) -> Dict:
+        """Histórico de previsões, uma página (ver PredictionService.get_history)"""
+        return await self._history_page(HISTORY_FIELDS, asset_code, limit, cursor, start, end, fields)
+
+    async def get_history_with_errors(self, asset_code: str = "gold", limit: int = 365,
+                                      cursor: Optional[str] = None, start: Optional[date] = None,
+                                      end: Optional[date] = None,
+                                      fields: Optional[List[str]] = None) -> Dict:
+        """Histórico com erros, uma página (ver PredictionService.get_history_with_errors)"""
+        return await self._history_page(
+            HISTORY_ERRORS_FIELDS, asset_code, limit, cursor, start, end, fields
+        )
+
+    async def _history_page(self, spec: Dict, asset_code: str, limit: int, cursor: Optional[str],
+                            start: Optional[date], end: Optional[date],
+                            fields: Optional[List[str]]) -> Dict:
+        """
+        Monta uma página de histórico (ver PredictionService._history_page)
+
+        Raises:
+            ValueError: Campo desconhecido ou cursor inválido
+        """
+        fields = resolve_fields(spec, fields)
+        after = decode_cursor(cursor) if cursor else None
+
+        asset = await asset_registry.aget_by_code(asset_code)
+        if not asset:
+            return {"predictions": [], "next_cursor": None}
+
+        rows = await self.prediction_repo.get_page(
+            asset.id,
+            limit=limit + 1,
+            columns=[spec[name][0] for name in fields],
+            after=after,
+            start_date=start,
+            end_date=end
+        )
+
+        return history_response(spec, fields, rows, limit)
+
+    async def get_accuracy(self, asset_code: str = "gold", model: Optional[str] = None,
+                           window: Optional[int] = None) -> Optional[Dict]:
+        """Métricas de acurácia materializadas (ver PredictionService.get_accuracy)"""
+        asset = await asset_registry.aget_by_code(asset_code)
+        if not asset:
+            return None
+
+        metrics = await self.prediction_repo.get_metrics(asset.id, model, window)
+        return accuracy_response(asset_code, metrics)
@@ -0,0 +1,299 @@
+"""
+Buongiorno API - Pipeline Job Runner
+Executa o pipeline em um processo worker persistente, com IDs de job
+"""
+
+import os
+import sys
+import copy
+import uuid
+import threading
+import multiprocessing
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+try:
+    from ..config import PIPELINE_DIR, PIPELINE_JOB_LOG_DIR, PIPELINE_JOB_HISTORY
+    from .response_cache import response_cache
+except ImportError:
+    from config import PIPELINE_DIR, PIPELINE_JOB_LOG_DIR, PIPELINE_JOB_HISTORY
+    from services.response_cache import response_cache
+
+# Etapas de cada ativo em um job (passos 2-6; o passo 1 é o download em lote)
+ASSET_STAGES = 5
+
+# Job que processa todos os ativos ativos
+ALL_ASSETS = '*'
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+# ==========================================
+# Processo worker
+# ==========================================
+
+# Fila de eventos do worker para a API (ver _init_worker)
+_EVENTS = None
+
+
+def _init_worker(events, pipeline_dir):
+    """
+    Inicializa o worker: importa o pipeline (pandas, statsmodels) uma única vez
+
+    Args:
+        events: Fila para enviar progresso à API
+        pipeline_dir (str): Diretório do pipeline (os caminhos de dados são relativos a ele)
+    """
+    global _EVENTS
+    _EVENTS = events
+
+    os.chdir(pipeline_dir)
+    if pipeline_dir not in sys.path:
+        sys.path.insert(0, pipeline_dir)
+
+    import run_pipeline  # noqa: F401
+    try:
+        import statsmodels.tsa.arima.model  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _run_job(job_id, asset_code, force, log_path):
+    """
+    Executa o pipeline de um job no worker (stdout/stderr vão para o log do job)
+
+    Returns:
+        dict: 'started_at' e 'results' ({código do ativo: resultado da previsão
+              serializável ou None})
+    """
+    import run_pipeline
+
+    started_at = datetime.now().isoformat()
+    _EVENTS.put((job_id, 'started', started_at))
+
+    stdout, stderr = sys.stdout, sys.stderr
+    with open(log_path, 'a', encoding='utf-8', buffering=1) as log:
+        sys.stdout = sys.stderr = log
+        try:
+            assets = run_pipeline.load_active_assets()
+            if asset_code != ALL_ASSETS:
+                assets = [a for a in assets if a['code'] == asset_code]
+            if not assets:
+                raise ValueError(f"Ativo não encontrado ou inativo: {asset_code}")
+
+            _EVENTS.put((job_id, 'assets', [a['code'] for a in assets]))
+
+            def on_stage(code, stage, status, stats):
+                _EVENTS.put((job_id, 'stage', {
+                    'asset': code, 'stage': stage, 'status': status, 'stats': stats
+                }))
+
+            results = run_pipeline.run_all_assets(assets, workers=1, force=force, on_stage=on_stage)
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+    return {
+        'started_at': started_at,
+        'results': {
+            code: None if result is None else {
+                'date': result['date'].isoformat(),
+                'prediction': float(result['prediction']),
+                'change': float(result['change']),
+                'change_pct': float(result['change_pct']),
+                'trend': result['trend']
+            }
+            for code, result in results.items()
+        }
+    }
+
+
+# ==========================================
+# API
+# ==========================================
+
+class PipelineJobRunner:
+    """
+    Fila de jobs do pipeline dentro do processo da API
+
+    Os jobs rodam um por vez em um único processo worker que mantém o pipeline
+    importado entre execuções. Disparos para um ativo que já tem job na fila
+    ou rodando (ou enquanto roda um job de todos os ativos) retornam o job
+    existente em vez de criar outro.
+    """
+
+    def __init__(self, log_dir=PIPELINE_JOB_LOG_DIR, history=PIPELINE_JOB_HISTORY):
+        self.log_dir = str(log_dir)
+        self.history = history
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = None
+        self.events = None
+
+    def _ensure_executor(self):
+        """Cria o worker (e a thread que lê os eventos) na primeira execução"""
+        if self.executor is not None:
+            return
+
+        context = multiprocessing.get_context('spawn')
+        self.events = context.Queue()
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.events, str(PIPELINE_DIR))
+        )
+        threading.Thread(target=self._listen, args=(self.events,), daemon=True).start()
+
+    def _listen(self, events):
+        """Aplica aos jobs os eventos de progresso enviados pelo worker"""
+        while True:
+            job_id, kind, payload = events.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+
+                if kind == 'started':
+                    if job['status'] == 'queued':
+                        job['status'] = 'running'
+                    job['started_at'] = job['started_at'] or payload
+                elif kind == 'assets':
+                    job['assets'] = payload
+                elif kind == 'stage':
+                    self._apply_stage(job, payload)
+
+    def _apply_stage(self, job, event):
+        """Atualiza etapa atual, medições e progresso de um job"""
+        if event['status'] == 'finished':
+            job['stages'].setdefault(event['asset'], {})[event['stage']] = event['stats']
+
+        # Eventos podem chegar depois do resultado: não reabre o job
+        if job['status'] not in ACTIVE_STATUSES:
+            return
+
+        job['current_stage'] = f"{event['asset']}:{event['stage']}"
+
+        # O passo 1 só aparece quando o ativo é baixado individualmente
+        finished = sum(
+            len([s for s in stages if s != 'fetch']) for stages in job['stages'].values()
+        )
+        total = max(len(job['assets']), 1) * ASSET_STAGES
+        job['progress'] = round(min(finished / total, 0.99), 3)
+
+    def submit(self, asset: Optional[str] = None, force: bool = False) -> Tuple[Dict, bool]:
+        """
+        Dispara o pipeline (ou reaproveita um job ativo equivalente)
+
+        Args:
+            asset: Código do ativo (None = todos os ativos ativos)
+            force: Ignora o cache das etapas
+
+        Returns:
+            tuple: (job, True se um job novo foi criado)
+        """
+        key = asset or ALL_ASSETS
+
+        with self.lock:
+            for job in self.jobs.values():
+                if job['status'] in ACTIVE_STATUSES and job['asset'] in (key, ALL_ASSETS):
+                    return copy.deepcopy(job), False
+
+            self._ensure_executor()
+
+            job_id = uuid.uuid4().hex[:12]
+            os.makedirs(self.log_dir, exist_ok=True)
+            log_path = os.path.join(self.log_dir, f'{job_id}.log')
+
+            job = {
+                'id': job_id,
+                'asset': key,
+                'assets': [] if key == ALL_ASSETS else [key],
+                'force': force,
+                'status': 'queued',
+                'progress': 0.0,
+                'current_stage': None,
+                'stages': {},
+                'results': None,
+                'error': None,
+                'log_file': log_path,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'duration_seconds': None
+            }
+            self.jobs[job_id] = job
+            self._trim()
+
+            try:
+                future = self.executor.submit(_run_job, job_id, key, force, log_path)
+            except BrokenProcessPool:
+                # Worker morreu: recria e tenta de novo
+                self.executor = None
+                self._ensure_executor()
+                future = self.executor.submit(_run_job, job_id, key, force, log_path)
+
+            snapshot = copy.deepcopy(job)
+
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return snapshot, True
+
+    def _finish(self, job_id, future):
+        """Registra o resultado (ou erro) de um job concluído"""
+        # O pipeline gravou no banco: não espera a próxima consulta da geração
+        response_cache.invalidate()
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+
+            finished_at = datetime.now()
+            job['finished_at'] = finished_at.isoformat()
+            job['current_stage'] = None
+
+            try:
+                outcome = future.result()
+            except BrokenProcessPool as e:
+                job['status'] = 'failed'
+                job['error'] = f"Worker do pipeline encerrado: {e}"
+                self.executor = None
+                return
+            except Exception as e:
+                job['status'] = 'failed'
+                job['error'] = str(e)
+                return
+
+            job['started_at'] = outcome['started_at']
+            job['duration_seconds'] = round(
+                (finished_at - datetime.fromisoformat(outcome['started_at'])).total_seconds(), 3
+            )
+            job['results'] = outcome['results']
+
+            failed = [code for code, result in job['results'].items() if result is None]
+            job['status'] = 'failed' if failed else 'completed'
+            job['error'] = f"Falha nos ativos: {', '.join(failed)}" if failed else None
+            job['progress'] = 1.0
+
+    def _trim(self):
+        """Mantém apenas os últimos `history` jobs concluídos em memória"""
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] not in ACTIVE_STATUSES]
+        for job_id in finished[:max(len(self.jobs) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Estado atual de um job (cópia) ou None"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    def list(self, limit: int = 20):
+        """Jobs mais recentes primeiro"""
+        with self.lock:
+            return [copy.deepcopy(job) for job in reversed(self.jobs.values())][:limit]
+
+
+# Instância única usada pelo router
+job_runner = PipelineJobRunner()
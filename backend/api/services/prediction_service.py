@@ -3,18 +3,167 @@ Buongiorno API - Serviço de Previsões (Database Version)
 Lógica de negócio para gerenciar previsões usando banco de dados
 """
 
-from typing import Dict, List, Optional
+import base64
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 from sqlalchemy.orm import Session
 
 try:
-    from ..repositories.asset_repository import AssetRepository
-    from ..repositories.price_repository import PriceRepository
     from ..repositories.prediction_repository import PredictionRepository
+    from ..repositories.data_version_repository import DataVersionRepository
+    from ..repositories.prediction_metric_repository import PredictionMetricRepository
+    from .asset_registry import asset_registry
 except ImportError:
-    from repositories.asset_repository import AssetRepository
-    from repositories.price_repository import PriceRepository
     from repositories.prediction_repository import PredictionRepository
+    from repositories.data_version_repository import DataVersionRepository
+    from repositories.prediction_metric_repository import PredictionMetricRepository
+    from services.asset_registry import asset_registry
+
+
+def format_trend(trend: str) -> str:
+    """Formata o trend para exibição"""
+    trend_map = {
+        'up': 'ALTA ↗️',
+        'down': 'BAIXA ↘️',
+        'stable': 'ESTÁVEL →'
+    }
+    return trend_map.get(trend, trend)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _round2(value):
+    return round(value, 2) if value is not None else None
+
+
+# Campos de cada histórico: nome na resposta -> (coluna de Prediction, formatação)
+HISTORY_FIELDS = {
+    "prediction_date": ("prediction_date", _isoformat),
+    "target_date": ("target_date", _isoformat),
+    "current_price": ("current_price", None),
+    "predicted_price": ("predicted_price", None),
+    "change": ("change_abs", None),
+    "change_pct": ("change_pct", None),
+    "trend": ("trend", format_trend),
+    "model_used": ("model_used", None)
+}
+
+HISTORY_ERRORS_FIELDS = {
+    "prediction_date": ("prediction_date", _isoformat),
+    "target_date": ("target_date", _isoformat),
+    "predicted_price": ("predicted_price", None),
+    "real_price": ("real_price", None),
+    "error_abs": ("error_abs", _round2),
+    "error_pct": ("error_pct", _round2),
+    "model_used": ("model_used", None),
+    "model_mape": ("model_mape", None)
+}
+
+
+def encode_cursor(target_date: date, prediction_id: int) -> str:
+    """Cursor opaco da paginação: (target_date, id) da última linha da página"""
+    raw = f"{target_date.isoformat()}|{prediction_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverso de encode_cursor (ValueError se o cursor for inválido)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        target_date, prediction_id = raw.split('|')
+        return date.fromisoformat(target_date), int(prediction_id)
+    except Exception:
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+
+WEEKDAYS = ['Domingo', 'Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
+
+
+def latest_response(asset_code: str, prediction) -> Dict:
+    """Resposta de /predictions/latest a partir de uma Prediction"""
+    target_date = prediction.target_date
+
+    return {
+        "asset": asset_code,
+        "prediction_date": prediction.prediction_date.isoformat(),
+        "target_date": target_date.isoformat(),
+        "target_day": WEEKDAYS[target_date.weekday()],
+        "current_price": prediction.current_price,
+        "predicted_price": prediction.predicted_price,
+        "change": prediction.change_abs,
+        "change_pct": prediction.change_pct,
+        "trend": prediction.trend,
+        "model_used": prediction.model_used,
+        "model_mape": prediction.model_mape,
+        "model_accuracy": round(100 - prediction.model_mape, 2),
+        "confidence": prediction.confidence
+    }
+
+
+def resolve_fields(spec: Dict, fields: Optional[List[str]]) -> List[str]:
+    """
+    Campos pedidos de um histórico (None = todos)
+
+    Raises:
+        ValueError: Campo desconhecido
+    """
+    fields = fields or list(spec)
+    unknown = [name for name in fields if name not in spec]
+    if unknown:
+        raise ValueError(
+            f"Campos inválidos: {', '.join(unknown)} (disponíveis: {', '.join(spec)})"
+        )
+    return fields
+
+
+def history_response(spec: Dict, fields: List[str], rows: List, limit: int) -> Dict:
+    """
+    Página de histórico a partir das linhas de get_page (buscadas com limit + 1)
+
+    Returns:
+        Dicionário com 'predictions' e 'next_cursor' (None na última página)
+    """
+    # Uma linha a mais indica se existe próxima página
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    history = []
+    for row in rows:
+        values = row._mapping
+        history.append({
+            name: spec[name][1](values[spec[name][0]]) if spec[name][1] else values[spec[name][0]]
+            for name in fields
+        })
+
+    return {
+        "predictions": history,
+        "next_cursor": encode_cursor(rows[-1].target_date, rows[-1].id) if has_more else None
+    }
+
+
+def accuracy_response(asset_code: str, metrics: List) -> Dict:
+    """Resposta de /predictions/accuracy a partir das PredictionMetrics"""
+    return {
+        "asset": asset_code,
+        "metrics": [
+            {
+                "model_used": metric.model_used,
+                "window_days": metric.window_days,
+                "start_date": metric.start_date.isoformat(),
+                "end_date": metric.end_date.isoformat(),
+                "samples": metric.samples,
+                "mae": _round2(metric.mae),
+                "mape": _round2(metric.mape),
+                "rmse": _round2(metric.rmse),
+                "hit_rate": _round2(metric.hit_rate),
+                "bias": _round2(metric.bias),
+                "updated_at": _isoformat(metric.updated_at)
+            }
+            for metric in metrics
+        ]
+    }
 
 
 class PredictionService:
@@ -22,8 +171,6 @@ class PredictionService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.asset_repo = AssetRepository(db)
-        self.price_repo = PriceRepository(db)
         self.prediction_repo = PredictionRepository(db)
 
     def get_latest_prediction(self, asset_code: str = "gold") -> Optional[Dict]:
@@ -36,8 +183,8 @@ class PredictionService:
         Returns:
             Dicionário com dados da previsão ou None
         """
-        # Busca o asset
-        asset = self.asset_repo.get_by_code(asset_code)
+        # Busca o asset (registro em memória, sem consulta ao banco)
+        asset = asset_registry.get_by_code(asset_code)
         if not asset:
             return None
 
@@ -51,118 +198,139 @@ class PredictionService:
         if not prediction:
             return None
 
-        # Formata datas
-        target_date = prediction.target_date
-        days = ['Domingo', 'Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
+        return latest_response(asset_code, prediction)
 
-        # Monta resposta
-        return {
-            "asset": asset_code,
-            "prediction_date": prediction.prediction_date.isoformat(),
-            "target_date": target_date.isoformat(),
-            "target_day": days[target_date.weekday()],
-            "current_price": prediction.current_price,
-            "predicted_price": prediction.predicted_price,
-            "change": prediction.change_abs,
-            "change_pct": prediction.change_pct,
-            "trend": prediction.trend,
-            "model_used": prediction.model_used,
-            "model_mape": prediction.model_mape,
-            "model_accuracy": round(100 - prediction.model_mape, 2),
-            "confidence": prediction.confidence
-        }
+    def get_history(self, asset_code: str = "gold", limit: int = 30, cursor: Optional[str] = None,
+                    start: Optional[date] = None, end: Optional[date] = None,
+                    fields: Optional[List[str]] = None) -> Dict:
+        """
+        Retorna histórico de previsões (uma página)
 
-    def get_history(self, asset_code: str = "gold", limit: int = 30) -> List[Dict]:
+        Args:
+            asset_code: Código do ativo
+            limit: Número máximo de registros
+            cursor: next_cursor da página anterior
+            start: Data alvo mínima
+            end: Data alvo máxima
+            fields: Campos da resposta (None = todos, ver HISTORY_FIELDS)
+
+        Returns:
+            Dicionário com 'predictions' e 'next_cursor' (None na última página)
         """
-        Retorna histórico de previsões
+        return self._history_page(HISTORY_FIELDS, asset_code, limit, cursor, start, end, fields)
+
+    def get_history_with_errors(self, asset_code: str = "gold", limit: int = 365,
+                                cursor: Optional[str] = None, start: Optional[date] = None,
+                                end: Optional[date] = None,
+                                fields: Optional[List[str]] = None) -> Dict:
+        """
+        Retorna histórico de previsões com erros calculados (uma página)
+
+        Apenas leitura: os preços reais são preenchidos pela conciliação
+        (pipeline, após gravar os preços, ou POST /api/pipeline/reconcile).
 
         Args:
             asset_code: Código do ativo
             limit: Número máximo de registros
+            cursor: next_cursor da página anterior
+            start: Data alvo mínima
+            end: Data alvo máxima
+            fields: Campos da resposta (None = todos, ver HISTORY_ERRORS_FIELDS)
 
         Returns:
-            Lista de previsões
+            Dicionário com 'predictions' e 'next_cursor' (None na última página)
+        """
+        return self._history_page(HISTORY_ERRORS_FIELDS, asset_code, limit, cursor, start, end, fields)
+
+    def _history_page(self, spec: Dict, asset_code: str, limit: int, cursor: Optional[str],
+                      start: Optional[date], end: Optional[date],
+                      fields: Optional[List[str]]) -> Dict:
         """
-        # Busca o asset
-        asset = self.asset_repo.get_by_code(asset_code)
+        Monta uma página de histórico selecionando só as colunas dos campos pedidos
+
+        Raises:
+            ValueError: Campo desconhecido ou cursor inválido
+        """
+        fields = resolve_fields(spec, fields)
+        after = decode_cursor(cursor) if cursor else None
+
+        # Busca o asset (registro em memória, sem consulta ao banco)
+        asset = asset_registry.get_by_code(asset_code)
         if not asset:
-            return []
-
-        # Busca previsões
-        predictions = self.prediction_repo.get_by_asset(asset.id, limit=limit)
-
-        # Converte para lista de dicionários
-        history = []
-        for pred in predictions:
-            history.append({
-                "prediction_date": pred.prediction_date.isoformat(),
-                "target_date": pred.target_date.isoformat(),
-                "current_price": pred.current_price,
-                "predicted_price": pred.predicted_price,
-                "change": pred.change_abs,
-                "change_pct": pred.change_pct,
-                "trend": self._format_trend(pred.trend),
-                "model_used": pred.model_used
-            })
-
-        return history
-
-    def get_history_with_errors(self, asset_code: str = "gold") -> List[Dict]:
+            return {"predictions": [], "next_cursor": None}
+
+        # Uma linha a mais indica se existe próxima página
+        rows = self.prediction_repo.get_page(
+            asset.id,
+            limit=limit + 1,
+            columns=[spec[name][0] for name in fields],
+            after=after,
+            start_date=start,
+            end_date=end
+        )
+
+        return history_response(spec, fields, rows, limit)
+
+    def get_accuracy(self, asset_code: str = "gold", model: Optional[str] = None,
+                     window: Optional[int] = None) -> Optional[Dict]:
         """
-        Retorna histórico de previsões com erros calculados
+        Retorna as métricas de acurácia materializadas (prediction_metrics)
 
         Args:
             asset_code: Código do ativo
+            model: Só este modelo (None = todos)
+            window: Só esta janela em dias (None = todas)
 
         Returns:
-            Lista de previsões com erros calculados
+            Dicionário com o ativo e as métricas por modelo e janela, ou None
+            se o ativo não existir
         """
-        # Busca o asset
-        asset = self.asset_repo.get_by_code(asset_code)
+        asset = asset_registry.get_by_code(asset_code)
         if not asset:
-            return []
-
-        # Busca todas as previsões
-        predictions = self.prediction_repo.get_by_asset(asset.id)
-
-        # Atualiza preços reais das previsões que ainda não têm
-        self._update_real_prices(asset.id, predictions)
-
-        # Converte para lista de dicionários
-        history = []
-        for pred in predictions:
-            history.append({
-                "prediction_date": pred.prediction_date.isoformat() if pred.prediction_date else None,
-                "target_date": pred.target_date.isoformat(),
-                "predicted_price": pred.predicted_price,
-                "real_price": pred.real_price,
-                "error_abs": round(pred.error_abs, 2) if pred.error_abs is not None else None,
-                "error_pct": round(pred.error_pct, 2) if pred.error_pct is not None else None,
-                "model_used": pred.model_used,
-                "model_mape": pred.model_mape
-            })
-
-        return history
-
-    def _update_real_prices(self, asset_id: int, predictions: List) -> None:
-        """Atualiza preços reais das previsões que ainda não têm"""
-        for pred in predictions:
-            if pred.real_price is None:
-                # Busca o preço real na data alvo
-                real_price_record = self.price_repo.get_by_asset_and_date(asset_id, pred.target_date)
-
-                if real_price_record:
-                    # Atualiza a previsão com o preço real
-                    self.prediction_repo.update_real_price(pred, real_price_record.close)
+            return None
+
+        metrics = PredictionMetricRepository(self.db).get_by_asset(asset.id, model, window)
+        return accuracy_response(asset_code, metrics)
+
+    def reconcile_real_prices(self, asset_code: Optional[str] = None) -> Dict:
+        """
+        Preenche o preço real (e os erros) das previsões que ainda não têm
+
+        As métricas de acurácia do ativo (ou de todos) são recalculadas mesmo
+        sem previsões novas conciliadas: serve também para preenchê-las pela
+        primeira vez.
+
+        Args:
+            asset_code: Código do ativo (None = todos os ativos)
+
+        Returns:
+            Dicionário com o ativo, o número de previsões atualizadas e de
+            linhas de métricas gravadas
+        """
+        asset_id = None
+        if asset_code:
+            asset = asset_registry.get_by_code(asset_code)
+            if not asset:
+                raise ValueError(f"Asset não encontrado: {asset_code}")
+            asset_id = asset.id
+
+        updated = self.prediction_repo.reconcile_real_prices(asset_id, commit=False)
+        metrics = PredictionMetricRepository(self.db).refresh(asset_id, commit=False)
+
+        # Invalida os caches de respostas de previsões (ver response_cache)
+        if updated or metrics:
+            DataVersionRepository(self.db).bump('predictions', commit=False)
+        self.db.commit()
+
+        return {
+            "asset": asset_code,
+            "updated": updated,
+            "metrics": metrics
+        }
 
     def _format_trend(self, trend: str) -> str:
         """Formata o trend para exibição"""
-        trend_map = {
-            'up': 'ALTA ↗️',
-            'down': 'BAIXA ↘️',
-            'stable': 'ESTÁVEL →'
-        }
-        return trend_map.get(trend, trend)
+        return format_trend(trend)
 
     def create_prediction(self, asset_code: str, prediction_date: datetime,
                          target_date: date, current_price: float, predicted_price: float,
@@ -183,8 +351,8 @@ class PredictionService:
         Returns:
             Dicionário com a previsão criada
         """
-        # Busca o asset
-        asset = self.asset_repo.get_by_code(asset_code)
+        # Busca o asset (registro em memória, sem consulta ao banco)
+        asset = asset_registry.get_by_code(asset_code)
         if not asset:
             raise ValueError(f"Asset não encontrado: {asset_code}")
 
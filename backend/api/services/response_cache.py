@@ -0,0 +1,157 @@
+"""
+Buongiorno API - Response Cache
+Cache em memória das respostas dos endpoints de previsões
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+
+try:
+    from ..config import RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_CHECK_INTERVAL
+    from ..database import SessionLocal
+    from ..repositories.data_version_repository import DataVersionRepository
+except ImportError:
+    from config import RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_CHECK_INTERVAL
+    from database import SessionLocal
+    from repositories.data_version_repository import DataVersionRepository
+
+
+class ResponseCache:
+    """
+    Cache LRU com TTL de respostas JSON já serializadas
+
+    Todas as entradas são descartadas quando a geração dos dados (tabela
+    data_versions, incrementada pelo pipeline ao gravar previsões) muda. A
+    geração é consultada no banco no máximo a cada check_interval segundos,
+    então a maior parte das requisições é respondida sem tocar o banco.
+    """
+
+    def __init__(self, name: str = 'predictions', ttl: float = RESPONSE_CACHE_TTL,
+                 max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 check_interval: float = RESPONSE_CACHE_CHECK_INTERVAL):
+        """
+        Args:
+            name: Conjunto de dados em data_versions
+            ttl: Validade de cada entrada em segundos (0 = cache desligado)
+            max_entries: Máximo de entradas (as menos usadas saem primeiro)
+            check_interval: Intervalo mínimo entre consultas da geração
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = None
+        self.checked_at = None
+
+    def _load_generation(self) -> int:
+        db = SessionLocal()
+        try:
+            return DataVersionRepository(db).get(self.name)
+        finally:
+            db.close()
+
+    def _check_due(self) -> bool:
+        """True se já passou check_interval desde a última consulta da geração"""
+        checked_at = self.checked_at
+        return checked_at is None or time.monotonic() - checked_at >= self.check_interval
+
+    def _check_generation(self) -> None:
+        """Descarta o cache se a geração dos dados mudou"""
+        now = time.monotonic()
+        with self.lock:
+            if self.checked_at is not None and now - self.checked_at < self.check_interval:
+                return
+            self.checked_at = now
+
+        try:
+            generation = self._load_generation()
+        except Exception:
+            # Banco indisponível: as entradas continuam valendo até o TTL
+            return
+
+        with self.lock:
+            if generation != self.generation:
+                self.entries.clear()
+                self.generation = generation
+
+    def response(self, key: Hashable, build: Callable[[], Dict]) -> Response:
+        """
+        Resposta em cache ou construída agora (e guardada)
+
+        Args:
+            key: Endpoint e parâmetros da requisição
+            build: Monta o conteúdo da resposta (exceções não são guardadas)
+
+        Returns:
+            Response: Corpo JSON, com X-Cache: HIT ou MISS
+        """
+        if self.ttl <= 0:
+            return JSONResponse(build())
+
+        self._check_generation()
+
+        generation, hit = self._lookup(key)
+        if hit is not None:
+            return hit
+
+        return self._store(key, generation, JSONResponse(build()).body)
+
+    async def aresponse(self, key: Hashable, build: Callable[[], Awaitable[Dict]]) -> Response:
+        """
+        response() para os endpoints assíncronos
+
+        A consulta da geração (sessão síncrona) roda no threadpool, só quando
+        vence o check_interval; build é uma corrotina.
+        """
+        if self.ttl <= 0:
+            return JSONResponse(await build())
+
+        if self._check_due():
+            await run_in_threadpool(self._check_generation)
+
+        generation, hit = self._lookup(key)
+        if hit is not None:
+            return hit
+
+        return self._store(key, generation, JSONResponse(await build()).body)
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[int], Optional[Response]]:
+        """(geração atual, resposta em cache ou None)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                return self.generation, Response(
+                    entry[1], media_type='application/json', headers={'X-Cache': 'HIT'}
+                )
+            return self.generation, None
+
+    def _store(self, key: Hashable, generation: Optional[int], body: bytes) -> Response:
+        """Guarda um corpo montado na geração informada e o devolve"""
+        with self.lock:
+            # Não guarda o que foi montado antes de uma troca de geração
+            if generation == self.generation:
+                self.entries[key] = (time.monotonic() + self.ttl, body)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        return Response(body, media_type='application/json', headers={'X-Cache': 'MISS'})
+
+    def invalidate(self) -> None:
+        """Descarta o cache (a geração é relida na próxima requisição)"""
+        with self.lock:
+            self.entries.clear()
+            self.generation = None
+            self.checked_at = None
+
+
+# Instância única usada pelos routers de previsões
+response_cache = ResponseCache()
@@ -16,15 +16,26 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from statsmodels.tsa.arima.model import ARIMA
 import warnings
 
 # Adiciona o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from data.storage import load_dataset
+
 # Ignora warnings
 warnings.filterwarnings('ignore')
 
+# Dias entre reajustes do ARIMA usado no MAPE do modelo (ver backtest_mapes)
+MAPE_REFIT_EVERY = 5
+
+# Preços de fechamento compartilhados com os workers (ver _init_worker)
+_SHARED_MEMORY = None
+_SHARED_PRICES = None
+
 
 def load_data():
     """Carrega os dados históricos de preços do ouro"""
@@ -32,11 +43,10 @@ def load_data():
         os.path.dirname(__file__),
         'data',
         'raw',
-        'gold_prices.csv'
+        'gold_prices'
     )
 
-    df = pd.read_csv(data_path)
-    df['Date'] = pd.to_datetime(df['Date'])
+    df = load_dataset(data_path, columns=['Date', 'Close'])
     df = df.sort_values('Date')
     df = df.reset_index(drop=True)
 
@@ -115,13 +125,214 @@ def calculate_mape(y_true, y_pred):
     return mape
 
 
-def generate_backtest_predictions(num_days=60, min_train_days=252):
+class RollingMAPE:
+    """
+    Acumula erros percentuais de previsões um passo à frente e calcula o
+    MAPE de qualquer janela final em O(1), via somas acumuladas
+
+    Cada dia do backtest só acrescenta os erros dos dias novos, em vez de
+    refazer o walk-forward inteiro sobre a janela de teste.
+    """
+
+    def __init__(self):
+        self._error_cumsum = [0.0]
+        self._count_cumsum = [0]
+
+    def __len__(self):
+        return len(self._error_cumsum) - 1
+
+    def add(self, y_true, y_pred):
+        """Adiciona o erro de uma previsão (valores reais zero são ignorados, como em calculate_mape)"""
+        if y_true != 0:
+            error = abs((y_true - y_pred) / y_true) * 100
+            count = 1
+        else:
+            error = 0.0
+            count = 0
+
+        self._error_cumsum.append(self._error_cumsum[-1] + error)
+        self._count_cumsum.append(self._count_cumsum[-1] + count)
+
+    def mape(self, window):
+        """MAPE dos últimos `window` erros adicionados"""
+        window = min(window, len(self))
+        count = self._count_cumsum[-1] - self._count_cumsum[-1 - window]
+
+        if count == 0:
+            return 0.0
+
+        return (self._error_cumsum[-1] - self._error_cumsum[-1 - window]) / count
+
+
+def one_step_predictions(prices, start, end):
+    """
+    Previsões um passo à frente para as posições [start, end) do array de preços
+
+    Ajusta o ARIMA uma única vez em prices[:start] e passa o filtro de Kalman
+    (parâmetros fixos) sobre as observações seguintes - equivalente ao loop
+    forecast/append sobre a janela de teste, mas em uma única passada.
+
+    Returns:
+        Array com as previsões ou None se o modelo não puder ser treinado
+    """
+    model = train_arima_model(prices[:start])
+
+    if model is None:
+        return None
+
+    try:
+        extended = model.extend(prices[start:end])
+        return np.asarray(extended.fittedvalues, dtype=np.float64)
+    except Exception as e:
+        print(f"Erro ao calcular previsoes um passo a frente: {str(e)}")
+        return None
+
+
+def backtest_mapes(prices, day_indices, refit_every=MAPE_REFIT_EVERY):
+    """
+    MAPE do modelo de cada dia do backtest (últimos 20% dos dados de treino)
+
+    O cálculo por dia ajusta o ARIMA nos primeiros 80% dos preços até o dia
+    e faz o walk-forward forecast/append (parâmetros fixos) sobre os 20%
+    restantes. Aqui o ajuste é feito só no primeiro dia de cada bloco de
+    `refit_every` dias: um único filtro de Kalman cobre as janelas de teste
+    do bloco e RollingMAPE lê a janela de cada dia em O(1). O primeiro dia
+    do bloco é idêntico ao cálculo por dia; os demais usam parâmetros
+    ajustados com até refit_every - 1 observações a menos.
+
+    Args:
+        prices: Array de preços de fechamento (ordenado por data)
+        day_indices: Posições (crescentes) dos dias do backtest
+        refit_every: Dias entre reajustes (1 = reajuste diário, como o cálculo por dia)
+
+    Returns:
+        Lista com o MAPE de cada dia (None se o modelo não puder ser treinado)
+    """
+    mapes = []
+
+    for first in range(0, len(day_indices), refit_every):
+        block = day_indices[first:first + refit_every]
+        start = block[0] + 1 - int((block[0] + 1) * 0.2)
+        step_predictions = one_step_predictions(prices, start, block[-1] + 1)
+
+        if step_predictions is None:
+            mapes.extend([None] * len(block))
+            continue
+
+        # Acrescenta ao rastreador apenas os erros dos dias novos (até idx)
+        tracker = RollingMAPE()
+        for idx in block:
+            for pos in range(start + len(tracker), idx + 1):
+                tracker.add(prices[pos], step_predictions[pos - start])
+            mapes.append(tracker.mape(int((idx + 1) * 0.2)))
+
+    return mapes
+
+
+def _init_worker(shm_name, length):
+    """
+    Inicializa um worker do pool: anexa ao bloco de memória compartilhada
+    com os preços de fechamento (sem copiar nem serializar o array)
+    """
+    global _SHARED_MEMORY, _SHARED_PRICES
+
+    warnings.filterwarnings('ignore')
+    _SHARED_MEMORY = shared_memory.SharedMemory(name=shm_name)
+    _SHARED_PRICES = np.ndarray((length,), dtype=np.float64, buffer=_SHARED_MEMORY.buf)
+
+
+def backtest_day(idx, prices=None):
+    """
+    Executa o backtest de um único dia
+
+    Treina o ARIMA com os preços até a posição `idx` (inclusive) e prevê o
+    próximo dia.
+
+    Args:
+        idx: Posição do dia atual no array de preços
+        prices: Array de preços de fechamento (padrão: array compartilhado do worker)
+
+    Returns:
+        Tupla (predicted_price, erro) - erro é None em caso de sucesso
+    """
+    if prices is None:
+        prices = _SHARED_PRICES
+
+    # Pega todos os dados até a data atual para treino
+    train_data = prices[:idx + 1]
+
+    # Treina o modelo com dados até a data atual
+    model = train_arima_model(train_data)
+
+    if model is None:
+        return None, 'treinar modelo'
+
+    # Faz previsão para o próximo dia
+    predicted_price = predict_next_day(model, train_data[-1])
+
+    if predicted_price is None:
+        return None, 'fazer previsao'
+
+    return predicted_price, None
+
+
+def _run_backtest_days(prices, day_indices, workers=1):
+    """
+    Executa o backtest para uma lista de dias, em série ou em um pool de processos
+
+    Os dias são independentes entre si (cada um só usa dados até a própria
+    data), então podem ser processados em paralelo. O array de preços é
+    copiado uma única vez para memória compartilhada e os workers recebem
+    apenas o índice do dia. Os resultados são devolvidos na ordem de entrada.
+
+    Args:
+        prices: Array de preços de fechamento (ordenado por data)
+        day_indices: Posições dos dias a processar
+        workers: Número de processos (1 = execução em série no processo atual)
+
+    Yields:
+        Tuplas (predicted_price, erro), na ordem de day_indices
+    """
+    if workers <= 1 or len(day_indices) <= 1:
+        for idx in day_indices:
+            yield backtest_day(idx, prices)
+        return
+
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+
+    try:
+        shared = np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = prices
+
+        # Lotes pequenos mantêm os workers ocupados até o fim (dias mais
+        # recentes têm mais histórico e demoram mais)
+        chunksize = max(1, len(day_indices) // (workers * 8))
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(shm.name, len(prices))) as executor:
+            for result in executor.map(backtest_day, day_indices, chunksize=chunksize):
+                yield result
+
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def generate_backtest_predictions(num_days=60, min_train_days=252, workers=1, engine='statsmodels', df=None,
+                                  mape_refit_every=MAPE_REFIT_EVERY):
     """
     Gera previsões retroativas usando walk-forward validation
 
     Args:
         num_days: Número de dias no passado para gerar previsões
         min_train_days: Número mínimo de dias de treino (padrão: 252 = 1 ano de trading)
+        workers: Número de processos paralelos (padrão: 1 = em série)
+        engine: 'statsmodels' (MLE, um ajuste por dia) ou 'numpy' (mínimos
+                quadrados condicionais, todos os dias ajustados em lote)
+        df: DataFrame com 'Date' e 'Close' (padrão: dados salvos, ver load_data())
+        mape_refit_every: Dias entre reajustes do ARIMA do MAPE do modelo (ver backtest_mapes)
 
     Returns:
         DataFrame com previsões retroativas
@@ -133,7 +344,8 @@ def generate_backtest_predictions(num_days=60, min_train_days=252):
 
     # Carrega dados
     print("[*] Carregando dados historicos...")
-    df = load_data()
+    if df is None:
+        df = load_data()
     print(f"    OK - Dados carregados: {len(df)} dias de historico")
     print(f"    OK - Periodo: {df['Date'].min().strftime('%Y-%m-%d')} ate {df['Date'].max().strftime('%Y-%m-%d')}")
     print()
@@ -142,48 +354,54 @@ def generate_backtest_predictions(num_days=60, min_train_days=252):
     last_date = df['Date'].max()
     start_date = last_date - timedelta(days=num_days)
 
-    # Filtra dados após a data de início do backtest
-    backtest_df = df[df['Date'] >= start_date].copy()
-
     print(f"[*] Gerando {num_days} previsoes retroativas...")
     print(f"    Periodo de backtest: {start_date.strftime('%Y-%m-%d')} ate {last_date.strftime('%Y-%m-%d')}")
     print(f"    Minimo de dias de treino: {min_train_days}")
+    print(f"    Engine: {engine} | Workers: {workers} | Reajuste do MAPE: a cada {mape_refit_every} dia(s)")
     print()
 
-    predictions = []
-
-    # Para cada dia no período de backtest
-    for i in range(len(backtest_df) - 1):  # -1 porque precisamos do próximo dia como target
-        current_row = backtest_df.iloc[i]
-        next_row = backtest_df.iloc[i + 1]
+    prices = df['Close'].to_numpy(dtype=np.float64)
+    dates = df['Date']
 
-        current_date = current_row['Date']
-        target_date = next_row['Date']
-        current_price = current_row['Close']
-        real_price = next_row['Close']
-
-        # Pega todos os dados até a data atual para treino
-        train_data = df[df['Date'] <= current_date]['Close'].values
+    # Posições dos dias do backtest (-1 porque precisamos do próximo dia como target)
+    backtest_positions = np.flatnonzero((dates >= start_date).to_numpy())[:-1]
 
+    day_indices = []
+    for idx in backtest_positions:
         # Verifica se temos dados suficientes para treinar
-        if len(train_data) < min_train_days:
-            print(f"    [!] Pulando {current_date.strftime('%Y-%m-%d')}: dados insuficientes ({len(train_data)} < {min_train_days})")
+        if idx + 1 < min_train_days:
+            print(f"    [!] Pulando {dates.iloc[idx].strftime('%Y-%m-%d')}: dados insuficientes ({idx + 1} < {min_train_days})")
             continue
+        day_indices.append(int(idx))
 
-        # Treina o modelo com dados até a data atual
-        model = train_arima_model(train_data)
+    predictions = []
 
-        if model is None:
-            print(f"    [X] Erro ao treinar modelo para {current_date.strftime('%Y-%m-%d')}")
-            continue
+    # MAPE do modelo (últimos 20% dos dados de treino de cada dia)
+    model_mapes = backtest_mapes(prices, day_indices, refit_every=mape_refit_every)
 
-        # Faz previsão para o próximo dia
-        predicted_price = predict_next_day(model, current_price)
+    if engine == 'numpy':
+        from models.models import fit_ar_expanding
 
-        if predicted_price is None:
-            print(f"    [X] Erro ao fazer previsao para {current_date.strftime('%Y-%m-%d')}")
+        # Todas as janelas expansíveis (uma por dia) ajustadas de uma vez
+        _, forecasts = fit_ar_expanding(prices, (5, 1, 0), np.array(day_indices, dtype=np.int64) + 1)
+        results = [(float(f), None) for f in forecasts]
+    else:
+        results = _run_backtest_days(prices, day_indices, workers=workers)
+
+    # Para cada dia no período de backtest
+    for idx, (predicted_price, error), model_mape in zip(day_indices, results, model_mapes):
+        current_date = dates.iloc[idx]
+        target_date = dates.iloc[idx + 1]
+        current_price = prices[idx]
+        real_price = prices[idx + 1]
+
+        if error is not None:
+            print(f"    [X] Erro ao {error} para {current_date.strftime('%Y-%m-%d')}")
             continue
 
+        if model_mape is None:
+            model_mape = 1.0  # Valor padrão
+
         # Calcula métricas
         change_abs = predicted_price - current_price
         change_pct = (change_abs / current_price) * 100
@@ -196,29 +414,6 @@ def generate_backtest_predictions(num_days=60, min_train_days=252):
         else:
             trend = "ESTÁVEL →"
 
-        # Calcula MAPE do modelo (usando últimos 20% dos dados de treino)
-        test_size = int(len(train_data) * 0.2)
-        test_data = train_data[-test_size:]
-        train_subset = train_data[:-test_size]
-
-        # Treina modelo no subset e avalia
-        temp_model = train_arima_model(train_subset)
-        if temp_model is not None:
-            test_predictions = []
-            for j in range(len(test_data)):
-                pred = temp_model.forecast(steps=1)
-                # forecast pode ser um array ou series
-                if hasattr(pred, 'iloc'):
-                    test_predictions.append(float(pred.iloc[0]))
-                else:
-                    test_predictions.append(float(pred[0]))
-                # Atualiza modelo com novo dado real
-                temp_model = temp_model.append([test_data[j]])
-
-            model_mape = calculate_mape(test_data, test_predictions)
-        else:
-            model_mape = 1.0  # Valor padrão
-
         # Salva previsão
         predictions.append({
             'prediction_date': current_date.strftime('%Y-%m-%d %H:%M:%S'),
@@ -325,6 +520,11 @@ def main():
     parser = argparse.ArgumentParser(description='Gera previsões retroativas (backtest)')
     parser.add_argument('--days', type=int, default=60, help='Número de dias retroativos (padrão: 60)')
     parser.add_argument('--auto', action='store_true', help='Modo automático: substitui histórico sem perguntar')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos paralelos (padrão: 1)')
+    parser.add_argument('--engine', choices=['statsmodels', 'numpy'], default='statsmodels',
+                        help='Motor de ajuste do ARIMA(5,1,0) (padrão: statsmodels)')
+    parser.add_argument('--mape-refit-every', type=int, default=MAPE_REFIT_EVERY,
+                        help=f'Dias entre reajustes do ARIMA do MAPE do modelo (padrão: {MAPE_REFIT_EVERY})')
 
     args = parser.parse_args()
     num_days = args.days
@@ -334,7 +534,8 @@ def main():
     print()
 
     # Gera previsões retroativas
-    predictions_df = generate_backtest_predictions(num_days=num_days)
+    predictions_df = generate_backtest_predictions(num_days=num_days, workers=args.workers, engine=args.engine,
+                                                   mape_refit_every=args.mape_refit_every)
 
     if predictions_df.empty:
         print("[X] Nenhuma previsao foi gerada.")
@@ -15,50 +15,143 @@ if sys.platform == 'win32':
 # Adiciona src ao path para imports funcionarem
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
+import time
 import pandas as pd
-from src.data.fetch_data import GoldDataFetcher
+from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from src.data.fetch_data import GoldDataFetcher, fetch_incremental_batch
+from src.data.assets import load_active_assets
+from src.data.model_runs import save_pipeline_run
+from src.data.storage import dataset_exists, load_dataset
 from src.data.preprocess import DataPreprocessor
 from src.features.build_features import FeatureEngineer
-from src.models.models import MovingAverageModel, ARIMAModel
+from src.models.models import MovingAverageModel, ARIMAModel, ARIMAFastModel
+from src.utils.resources import track_stage, format_stage_stats
+from src.utils.cache import StageCache, frame_fingerprint, stage_key
 
 class BuongiornoMainPipeline:
     """Pipeline principal do projeto Buongiorno"""
     
-    def __init__(self):
+    def __init__(self, asset_code='gold', ticker='GC=F', asset_name='Ouro', zero_copy=True, force=False,
+                 on_stage=None):
+        """
+        Inicializa o pipeline de um ativo
+        
+        Args:
+            asset_code (str): Código do ativo (namespace dos arquivos)
+            ticker (str): Ticker do Yahoo Finance
+            asset_name (str): Nome do ativo (para exibição)
+            zero_copy (bool): Cada etapa assume a posse do DataFrame da etapa
+                              anterior e só adiciona colunas, sem cópias
+                              defensivas (raw_data é liberado no passo 2)
+            force (bool): Ignora o cache e executa todas as etapas
+            on_stage (callable): Chamado como on_stage(ativo, etapa, 'started' | 'finished',
+                                 medições) no início e no fim de cada etapa
+        """
+        self.asset_code = asset_code
+        self.ticker = ticker
+        self.asset_name = asset_name
+        self.zero_copy = zero_copy
+        self.force = force
+        self.on_stage = on_stage
+        
+        # Arquivos por ativo (o ouro mantém os caminhos originais das previsões)
+        # (datasets sem extensão: o formato é definido em src/data/storage.py)
+        self.raw_path = f'data/raw/{asset_code}_prices'
+        self.processed_path = f'data/processed/{asset_code}_processed'
+        self.features_path = f'data/processed/{asset_code}_features'
+        self.predictions_dir = 'data/predictions' if asset_code == 'gold' else f'data/predictions/{asset_code}'
+        
+        # Cache das etapas 2-6: cada etapa é pulada se a chave (hash das
+        # entradas e parâmetros) for igual à da última execução
+        self.cache = StageCache(f'data/cache/{asset_code}')
+        self.stage_keys = {}
+        
         self.raw_data = None
         self.processed_data = None
         self.feature_data = None
         self.models = {}
         self.results = {}
+        self.stage_stats = {}
+        self.fit_counts = {}
+        self.split_info = {}
+        self.new_prediction = None
+        self.model_run_id = None
     
-    def step1_fetch_data(self, period='5y', force_download=False):
+    @contextmanager
+    def _stage(self, name):
+        """Mede uma etapa (ver track_stage) e avisa on_stage no início e no fim"""
+        if self.on_stage:
+            self.on_stage(self.asset_code, name, 'started', None)
+        
+        with track_stage(self.stage_stats, name) as stage:
+            yield stage
+        
+        if self.on_stage:
+            self.on_stage(self.asset_code, name, 'finished', stage)
+    
+    def _cache_lookup(self, stage, key, datasets=()):
+        """
+        Consulta o cache de uma etapa
+        
+        Args:
+            stage (str): Nome da etapa
+            key (str): Chave calculada para esta execução
+            datasets (tuple): Datasets que a etapa grava (precisam existir)
+        
+        Returns:
+            dict: Metadados da etapa em cache ou None (executar a etapa)
+        """
+        self.stage_keys[stage] = key
+        
+        if self.force or not all(dataset_exists(path) for path in datasets):
+            return None
+        
+        meta = self.cache.lookup(stage, key)
+        if meta is not None:
+            if stage in self.stage_stats:
+                self.stage_stats[stage]['cached'] = True
+            print(f"⏭️  Entradas inalteradas (chave {key[:12]}), usando resultado em cache")
+        return meta
+    
+    def step1_fetch_data(self, period='5y', force_download=False, incremental=True):
         """
         Passo 1: Buscar dados do Yahoo Finance
         
         Args:
             period (str): Período de dados
-            force_download (bool): Força download mesmo se arquivo existir
+            force_download (bool): Força download completo mesmo se arquivo existir
+            incremental (bool): Se o arquivo existir, baixa apenas as datas que faltam
+                                (False = reutiliza o arquivo como está)
         """
         print("\n" + "="*70)
-        print("🌅 BUONGIORNO - PIPELINE DE PREVISÃO DE PREÇO DO OURO")
+        print(f"🌅 BUONGIORNO - PIPELINE DE PREVISÃO DE PREÇO - {self.asset_name.upper()} ({self.ticker})")
         print("="*70)
         print("\n📥 PASSO 1: COLETA DE DADOS")
         print("-"*70)
         
-        filepath = 'data/raw/gold_prices.csv'
+        filepath = self.raw_path
         
         # Verifica se já existe
-        if os.path.exists(filepath) and not force_download:
+        if dataset_exists(filepath) and not force_download and not incremental:
             print(f"✅ Arquivo já existe: {filepath}")
             print("   Carregando dados existentes...")
-            self.raw_data = pd.read_csv(filepath)
+            self.raw_data = load_dataset(filepath)
             print(f"   {len(self.raw_data)} registros carregados")
+        elif dataset_exists(filepath) and not force_download:
+            # Baixa apenas o que falta desde o último registro salvo (inclusive)
+            fetcher = GoldDataFetcher(ticker=self.ticker)
+            fetcher.fetch_incremental(filepath, period=period)
+            if fetcher.new_rows or fetcher.revised_rows:
+                fetcher.save_data(filepath)
+            self.raw_data = fetcher.calculate_daily_stats(inplace=self.zero_copy)
         else:
             # Baixa novos dados
-            fetcher = GoldDataFetcher()
-            self.raw_data = fetcher.fetch_historical_data(period=period)
-            self.raw_data = fetcher.calculate_daily_stats()
+            fetcher = GoldDataFetcher(ticker=self.ticker)
+            fetcher.fetch_historical_data(period=period)
             fetcher.save_data(filepath)
+            self.raw_data = fetcher.calculate_daily_stats(inplace=self.zero_copy)
         
         print(f"✅ Passo 1 concluído: {len(self.raw_data)} registros")
         return self.raw_data
@@ -71,9 +164,18 @@ class BuongiornoMainPipeline:
         if self.raw_data is None:
             raise ValueError("Execute step1_fetch_data() primeiro")
         
-        preprocessor = DataPreprocessor(self.raw_data)
-        self.processed_data = preprocessor.prepare_for_modeling()
-        preprocessor.save_processed_data()
+        key = stage_key('preprocess', frame_fingerprint(self.raw_data))
+        if self._cache_lookup('preprocess', key, datasets=(self.processed_path,)) is not None:
+            self.processed_data = load_dataset(self.processed_path)
+        else:
+            preprocessor = DataPreprocessor(self.raw_data, copy=not self.zero_copy)
+            self.processed_data = preprocessor.prepare_for_modeling()
+            preprocessor.save_processed_data(self.processed_path)
+            self.cache.store('preprocess', key)
+        
+        if self.zero_copy:
+            # O preprocessor assumiu a posse dos dados brutos
+            self.raw_data = None
         
         print(f"✅ Passo 2 concluído: {len(self.processed_data)} registros")
         return self.processed_data
@@ -82,28 +184,55 @@ class BuongiornoMainPipeline:
                                    lags=[1, 2, 3, 5, 7],
                                    ma_windows=[7, 14, 30],
                                    vol_windows=[7, 14],
-                                   momentum_periods=[5, 10]):
-        """Passo 3: Engenharia de features"""
+                                   momentum_periods=[5, 10],
+                                   incremental=True):
+        """
+        Passo 3: Engenharia de features
+        
+        Args:
+            incremental (bool): Se a tabela de features já existir, calcula
+                                apenas as linhas das datas novas
+        """
         print("\n🔧 PASSO 3: ENGENHARIA DE FEATURES")
         print("-"*70)
         
         if self.processed_data is None:
             raise ValueError("Execute step2_preprocess() primeiro")
         
-        engineer = FeatureEngineer(self.processed_data)
-        self.feature_data = engineer.add_all_features(
+        params = dict(
             lags=lags,
             ma_windows=ma_windows,
             vol_windows=vol_windows,
             momentum_periods=momentum_periods
         )
-        engineer.save_features()
+        
+        key = stage_key('features', self.stage_keys.get('preprocess'), **params)
+        if self._cache_lookup('features', key, datasets=(self.features_path,)) is not None:
+            self.feature_data = load_dataset(self.features_path)
+        else:
+            engineer = FeatureEngineer(self.processed_data, copy=not self.zero_copy)
+            if incremental and dataset_exists(self.features_path):
+                existing = load_dataset(self.features_path)
+                self.feature_data = engineer.add_features_incremental(existing, **params)
+            else:
+                self.feature_data = engineer.add_all_features(**params)
+            engineer.save_features(self.features_path)
+            self.cache.store('features', key)
         
         print(f"✅ Passo 3 concluído: {len(self.feature_data)} registros, {len(self.feature_data.columns)} colunas")
         return self.feature_data
     
-    def step4_train_models(self):
-        """Passo 4: Treinar modelos"""
+    def step4_train_models(self, arima_incremental=True, arima_refit_every=20, arima_engine='statsmodels'):
+        """
+        Passo 4: Treinar modelos
+        
+        Args:
+            arima_incremental (bool): Walk-forward do ARIMA com atualização
+                incremental (filtro de Kalman) em vez de retreino a cada passo
+            arima_refit_every (int): Retreina os parâmetros do ARIMA a cada N passos
+            arima_engine (str): 'statsmodels' (MLE) ou 'numpy' (mínimos quadrados
+                condicionais, ver ARIMAFastModel)
+        """
         print("\n🤖 PASSO 4: TREINAMENTO DE MODELOS")
         print("-"*70)
         
@@ -115,10 +244,30 @@ class BuongiornoMainPipeline:
         train_df = self.feature_data[:split_idx]
         test_df = self.feature_data[split_idx:]
         
+        self.split_info = {
+            'train_size': len(train_df),
+            'test_size': len(test_df),
+            'train_start_date': pd.to_datetime(train_df['Date'].min()).to_pydatetime(),
+            'train_end_date': pd.to_datetime(train_df['Date'].max()).to_pydatetime()
+        }
+        
         print(f"\n📊 Split de dados:")
         print(f"   Treino: {len(train_df)} registros ({train_df['Date'].min()} a {train_df['Date'].max()})")
         print(f"   Teste:  {len(test_df)} registros ({test_df['Date'].min()} a {test_df['Date'].max()})")
         
+        key = stage_key(
+            'train', self.stage_keys.get('features'),
+            ma_window=7, arima_order=(5, 1, 0), arima_incremental=arima_incremental,
+            arima_refit_every=arima_refit_every, arima_engine=arima_engine
+        )
+        if self._cache_lookup('train', key) is not None:
+            cached = self.cache.load_object('train')
+            if cached is not None:
+                self.models, self.results = cached['models'], cached['results']
+                self.fit_counts = {name: 0 for name in self.models}
+                print(f"✅ Passo 4 (cache): {len(self.models)} modelos carregados")
+                return self.models
+        
         # ==========================================
         # Modelo 1: Média Móvel (Baseline)
         # ==========================================
@@ -141,7 +290,12 @@ class BuongiornoMainPipeline:
         print("="*70)
         
         try:
-            arima_model = ARIMAModel(order=(5, 1, 0))
+            arima_class = ARIMAFastModel if arima_engine == 'numpy' else ARIMAModel
+            arima_model = arima_class(
+                order=(5, 1, 0),
+                incremental=arima_incremental,
+                refit_every=arima_refit_every
+            )
             arima_model.fit(train_df['Close'])
             arima_metrics = arima_model.evaluate(test_df['Close'])
             
@@ -152,6 +306,12 @@ class BuongiornoMainPipeline:
             print("⚠️  statsmodels não instalado. Pulando ARIMA.")
             print("    Para usar ARIMA, instale: pip install statsmodels")
         
+        # Ajustes feitos por modelo (o ARIMA conta os retreinos do walk-forward)
+        self.fit_counts = {name: getattr(model, 'fit_count', 1) for name, model in self.models.items()}
+        
+        self.cache.save_object('train', {'models': self.models, 'results': self.results})
+        self.cache.store('train', key)
+        
         print(f"\n✅ Passo 4 concluído: {len(self.models)} modelos treinados")
         return self.models
     
@@ -181,9 +341,10 @@ class BuongiornoMainPipeline:
         print("\n" + "="*70)
         
         # Salva comparação
-        os.makedirs('data/predictions', exist_ok=True)
-        comparison_sorted.to_csv('data/predictions/model_comparison.csv')
-        print(f"💾 Comparação salva em: data/predictions/model_comparison.csv")
+        os.makedirs(self.predictions_dir, exist_ok=True)
+        comparison_path = f'{self.predictions_dir}/model_comparison.csv'
+        comparison_sorted.to_csv(comparison_path)
+        print(f"💾 Comparação salva em: {comparison_path}")
         
         # Guarda o melhor modelo
         self.best_model_name = comparison_sorted.index[0]
@@ -191,7 +352,7 @@ class BuongiornoMainPipeline:
         return comparison_sorted
     
     def step6_predict_tomorrow(self):
-        """Passo 6: Prevê o preço do ouro para amanhã"""
+        """Passo 6: Prevê o preço do ativo para amanhã"""
         from datetime import datetime, timedelta
         
         print("\n🔮 PASSO 6: PREVISÃO PARA AMANHÃ")
@@ -200,6 +361,15 @@ class BuongiornoMainPipeline:
         if not self.models:
             raise ValueError("Execute step4_train_models() primeiro")
         
+        # Mesmo modelo e mesmos dados: a previsão já foi gerada e registrada
+        key = stage_key('predict', self.stage_keys.get('train'), model=self.best_model_name)
+        cached = self._cache_lookup('predict', key)
+        if cached is not None and 'result' in cached:
+            result = dict(cached['result'], date=pd.Timestamp(cached['result']['date']))
+            print(f"✅ Previsão para {result['date'].strftime('%d/%m/%Y')} já gerada: "
+                  f"${result['prediction']:.2f} ({result['change_pct']:+.2f}%)")
+            return result
+        
         # Pega o melhor modelo
         best_model = self.models.get(self.best_model_name)
         
@@ -258,7 +428,7 @@ class BuongiornoMainPipeline:
         # Prepara texto para salvar
         report = f"""
 ================================================================================
-🌅 BUONGIORNO - PREVISÃO DE PREÇO DO OURO
+🌅 BUONGIORNO - PREVISÃO DE PREÇO - {self.asset_name.upper()} ({self.ticker})
 ================================================================================
 
 📅 DATA DA PREVISÃO: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
@@ -315,7 +485,7 @@ Gerado por: Projeto Buongiorno
         
         # Salva em arquivo com data no nome
         filename = f"prediction_{tomorrow.strftime('%Y-%m-%d')}.txt"
-        filepath = f"data/predictions/{filename}"
+        filepath = f"{self.predictions_dir}/{filename}"
         
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(report)
@@ -336,7 +506,7 @@ Gerado por: Projeto Buongiorno
         }
         
         csv_df = pd.DataFrame(csv_data)
-        csv_filename = 'data/predictions/predictions_history.csv'
+        csv_filename = f'{self.predictions_dir}/predictions_history.csv'
         
         # Append ao CSV existente ou cria novo
         if os.path.exists(csv_filename):
@@ -346,55 +516,280 @@ Gerado por: Projeto Buongiorno
         
         print(f"💾 Histórico atualizado em: {csv_filename}")
         
-        return {
+        # Previsão nova: gravada no banco junto com o ModelRun (ver record_model_run)
+        self.new_prediction = {
+            'prediction_date': datetime.now(),
+            'target_date': tomorrow.date(),
+            'current_price': float(last_price),
+            'predicted_price': float(prediction),
+            'change_abs': float(price_change),
+            'change_pct': float(price_change_pct),
+            'model_used': self.best_model_name,
+            'model_mape': float(self.results[self.best_model_name]['MAPE'])
+        }
+        
+        result = {
             'date': tomorrow,
             'prediction': prediction,
             'change': price_change,
             'change_pct': price_change_pct,
             'trend': trend
         }
+        self.cache.store('predict', key, result={
+            **result,
+            'date': tomorrow.isoformat(),
+            'prediction': float(prediction),
+            'change': float(price_change),
+            'change_pct': float(price_change_pct)
+        })
+        
+        return result
     
-    def run_full_pipeline(self):
-        """Executa o pipeline completo"""
+    def run_full_pipeline(self, fetch=True):
+        """
+        Executa o pipeline completo
+        
+        Args:
+            fetch (bool): Executa o passo 1; False quando raw_data já foi
+                          carregado (ex.: download em lote de vários ativos)
+        
+        Returns:
+            dict: Resultado da previsão (passo 6) ou None em caso de erro
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        
         try:
             # Passo 1: Coleta de dados
-            self.step1_fetch_data(period='5y')
+            if fetch or self.raw_data is None:
+                with self._stage('fetch') as stage:
+                    self.step1_fetch_data(period='5y')
+                    stage['rows'] = len(self.raw_data)
             
             # Passo 2: Preprocessamento
-            self.step2_preprocess()
+            with self._stage('preprocess') as stage:
+                self.step2_preprocess()
+                stage['rows'] = len(self.processed_data)
             
             # Passo 3: Feature Engineering
-            self.step3_feature_engineering()
+            with self._stage('features') as stage:
+                self.step3_feature_engineering()
+                stage['rows'] = len(self.feature_data)
+                stage['columns'] = len(self.feature_data.columns)
             
             # Passo 4: Treinamento de modelos
-            self.step4_train_models()
+            with self._stage('train') as stage:
+                self.step4_train_models()
+                stage['rows'] = self.split_info['train_size']
+                stage['fits'] = self.fit_counts
             
             # Passo 5: Comparação de modelos
-            self.step5_compare_models()
+            with self._stage('compare') as stage:
+                self.step5_compare_models()
+                stage['rows'] = len(self.results)
             
             # Passo 6: Previsão para amanhã
-            self.step6_predict_tomorrow()
+            with self._stage('predict') as stage:
+                result = self.step6_predict_tomorrow()
+                stage['rows'] = 1
+            
+            print(f"\n📏 Recursos por etapa ({self.asset_code}):")
+            print(format_stage_stats(self.stage_stats))
+            
+            self.record_model_run('completed', started_at, time.perf_counter() - start)
             
             print("\n" + "="*70)
-            print("✅ PIPELINE CONCLUÍDO COM SUCESSO! 🎉")
+            print(f"✅ PIPELINE CONCLUÍDO COM SUCESSO! 🎉 ({self.asset_code})")
             print("="*70)
             print("\n💡 Arquivos gerados:")
-            print("   📊 Comparação de modelos:  data/predictions/model_comparison.csv")
-            print("   🔮 Previsão de amanhã:     data/predictions/prediction_YYYY-MM-DD.txt")
-            print("   📈 Histórico de previsões: data/predictions/predictions_history.csv")
-            print("   💾 Dados processados:      data/processed/")
-            print("   🔧 Features criadas:       data/processed/gold_features.csv")
+            print(f"   📊 Comparação de modelos:  {self.predictions_dir}/model_comparison.csv")
+            print(f"   🔮 Previsão de amanhã:     {self.predictions_dir}/prediction_YYYY-MM-DD.txt")
+            print(f"   📈 Histórico de previsões: {self.predictions_dir}/predictions_history.csv")
+            print(f"   💾 Dados processados:      {self.processed_path}")
+            print(f"   🔧 Features criadas:       {self.features_path}")
             print("\n")
             
+            return result
+            
         except Exception as e:
-            print(f"\n❌ Erro no pipeline: {e}")
+            print(f"\n❌ Erro no pipeline ({self.asset_code}): {e}")
             import traceback
             traceback.print_exc()
+            self.record_model_run('failed', started_at, time.perf_counter() - start, error=e)
+            return None
+    
+    def record_model_run(self, status, started_at, duration, error=None):
+        """
+        Registra a execução no banco da API (uma transação por ativo)
+        
+        Grava o ModelRun, os preços novos do ativo e a previsão gerada no
+        passo 6 (ligada ao ModelRun) e concilia o preço real das previsões
+        anteriores. Só os preços a partir da última data já gravada são
+        enviados; previsões reaproveitadas do cache não são gravadas de novo.
+        
+        As métricas e o tamanho do treino são os do modelo vencedor; o
+        detalhamento por etapa (tempo, CPU, pico de RSS, linhas e ajustes de
+        modelo) vai em config['stages'].
+        
+        Args:
+            status (str): 'completed' ou 'failed'
+            started_at (datetime): Início da execução
+            duration (float): Duração total em segundos
+            error (Exception): Erro que interrompeu o pipeline (se houver)
+        
+        Returns:
+            int: ID do ModelRun ou None se não foi possível gravar
+        """
+        best_model = getattr(self, 'best_model_name', None)
+        metrics = self.results.get(best_model, {}) if best_model else {}
+        
+        def metric(name):
+            value = metrics.get(name)
+            return float(value) if value is not None else None
+        
+        run = dict(
+            model_name=best_model or 'pipeline',
+            status=status,
+            run_date=started_at,
+            mae=metric('MAE'),
+            rmse=metric('RMSE'),
+            mape=metric('MAPE'),
+            r2_score=metric('R2'),
+            duration_seconds=round(duration, 3),
+            error_message=str(error) if error is not None else None,
+            config={
+                'asset': self.asset_code,
+                'ticker': self.ticker,
+                'zero_copy': self.zero_copy,
+                'force': self.force,
+                'stages': self.stage_stats,
+                'models': {
+                    name: {k: float(v) for k, v in values.items()}
+                    for name, values in self.results.items()
+                }
+            },
+            completed_at=datetime.now(),
+            **self.split_info
+        )
+        
+        saved = save_pipeline_run(
+            {'code': self.asset_code, 'name': self.asset_name, 'symbol': self.ticker},
+            run,
+            prices=self.processed_data,
+            prediction=self.new_prediction if status == 'completed' else None
+        )
+        if saved is None:
+            return None
+        
+        print(f"🗄️  Banco atualizado: {saved['prices_written']} preço(s) gravado(s), "
+              f"{saved['predictions_reconciled']} previsão(ões) conciliada(s), "
+              f"{saved['metrics_written']} métrica(s) de acurácia, "
+              f"{'1 previsão nova' if saved['prediction_id'] else 'nenhuma previsão nova'}")
+        
+        self.model_run_id = saved['model_run_id']
+        return self.model_run_id
+
+
+def run_asset_pipeline(asset, raw_data=None, force=False, on_stage=None):
+    """
+    Executa a cadeia completa de um ativo (usado pelos workers do pool)
+    
+    Args:
+        asset (dict): Ativo com 'code', 'symbol' e 'name'
+        raw_data (pd.DataFrame): Dados brutos já baixados (None = passo 1 normal)
+        force (bool): Ignora o cache das etapas
+        on_stage (callable): Ver BuongiornoMainPipeline
+    
+    Returns:
+        tuple: (código do ativo, resultado da previsão ou None)
+    """
+    pipeline = BuongiornoMainPipeline(
+        asset_code=asset['code'],
+        ticker=asset['symbol'],
+        asset_name=asset['name'],
+        force=force,
+        on_stage=on_stage
+    )
+    pipeline.raw_data = raw_data
+    
+    return asset['code'], pipeline.run_full_pipeline(fetch=raw_data is None)
+
+
+def run_all_assets(assets=None, workers=None, period='5y', force=False, on_stage=None):
+    """
+    Executa o pipeline para todos os ativos ativos
+    
+    Os dados de todos os ativos são baixados em uma única requisição e as
+    cadeias preprocessamento → features → modelos → previsão de cada ativo
+    rodam em paralelo em um pool de processos.
+    
+    Args:
+        assets (list): Ativos a processar (padrão: ativos ativos do banco)
+        workers (int): Máximo de processos (padrão: um por ativo, limitado a os.cpu_count())
+        period (str): Período do download completo (ativos sem arquivo)
+        force (bool): Ignora o cache e executa todas as etapas
+        on_stage (callable): Ver BuongiornoMainPipeline (precisa ser serializável
+                             com pickle quando workers > 1)
+    
+    Returns:
+        dict: {código do ativo: resultado da previsão ou None}
+    """
+    assets = assets if assets is not None else load_active_assets()
+    if not assets:
+        print("⚠️  Nenhum ativo ativo para processar")
+        return {}
+    
+    print(f"\n🌍 Ativos: {', '.join(a['code'] for a in assets)}")
+    
+    # Passo 1 em lote: uma requisição para todos os tickers
+    fetchers = [GoldDataFetcher(ticker=a['symbol']) for a in assets]
+    filepaths = [f"data/raw/{a['code']}_prices" for a in assets]
+    fetch_incremental_batch(fetchers, filepaths, period=period)
+    
+    raw_data = []
+    for fetcher, filepath in zip(fetchers, filepaths):
+        if fetcher.data is None:
+            raw_data.append(None)
+            continue
+        if fetcher.new_rows or fetcher.revised_rows:
+            fetcher.save_data(filepath)
+        raw_data.append(fetcher.calculate_daily_stats(inplace=True))
+    
+    jobs = [(asset, data) for asset, data in zip(assets, raw_data) if data is not None]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    
+    if workers <= 1 or len(jobs) <= 1:
+        results = dict(run_asset_pipeline(asset, data, force, on_stage) for asset, data in jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_asset_pipeline, asset, data, force, on_stage) for asset, data in jobs]
+            results = dict(future.result() for future in futures)
+    
+    for asset, data in zip(assets, raw_data):
+        if data is None:
+            results[asset['code']] = None
+    
+    return results
 
 
 # Execução principal
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Pipeline Buongiorno')
+    parser.add_argument('--asset', help='Executa apenas um ativo (código, ex.: gold)')
+    parser.add_argument('--workers', type=int, default=None, help='Máximo de processos paralelos (padrão: um por ativo)')
+    parser.add_argument('--force', action='store_true', help='Ignora o cache e executa todas as etapas')
+    args = parser.parse_args()
+    
     print("\nIniciando Pipeline Buongiorno...\n")
     
-    pipeline = BuongiornoMainPipeline()
-    pipeline.run_full_pipeline()
+    assets = load_active_assets()
+    if args.asset:
+        assets = [a for a in assets if a['code'] == args.asset]
+    
+    results = run_all_assets(assets, workers=args.workers, force=args.force)
+    
+    failed = [code for code, result in results.items() if result is None]
+    if failed:
+        print(f"❌ Falha nos ativos: {', '.join(failed)}")
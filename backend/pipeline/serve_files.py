@@ -6,6 +6,7 @@ Serve os arquivos gerados pelo pipeline para o frontend React
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import os
 import sys
+from src.data.storage import find_dataset, dataset_path
 
 class CORSRequestHandler(SimpleHTTPRequestHandler):
     """Handler com CORS habilitado para permitir requisições do React"""
@@ -35,6 +36,10 @@ def main():
         print(f"   Diretório atual: {os.getcwd()}")
         sys.exit(1)
     
+    # Features no formato em que o pipeline as gravou (Parquet por padrão)
+    features_file = find_dataset('data/processed/gold_features') or dataset_path('data/processed/gold_features')
+    features_url = os.path.relpath(features_file, 'data').replace(os.sep, '/')
+
     os.chdir('data')
     
     # Configurações do servidor
@@ -53,7 +58,7 @@ def main():
     print("\n💡 Arquivos disponíveis:")
     print(f"   - http://{HOST}:{PORT}/predictions/predictions_history.csv")
     print(f"   - http://{HOST}:{PORT}/predictions/prediction_YYYY-MM-DD.txt")
-    print(f"   - http://{HOST}:{PORT}/processed/gold_features.csv")
+    print(f"   - http://{HOST}:{PORT}/{features_url}")
     print("\n⚠️  Mantenha este terminal aberto enquanto usa o frontend")
     print("🛑 Para parar: Ctrl+C")
     print("="*70 + "\n")
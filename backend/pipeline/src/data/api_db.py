@@ -0,0 +1,48 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de acesso ao banco de dados da API (models, repositories, config)
+"""
+
+import os
+import sys
+
+# Diretório da API (models, repositories, config)
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'api'))
+
+# Tabelas criadas nesta execução (ver open_session)
+_tables_ready = False
+
+
+def ensure_api_path():
+    """Adiciona o diretório da API ao path para importar config/database/models"""
+    if API_DIR not in sys.path:
+        sys.path.insert(0, API_DIR)
+
+
+def open_session():
+    """
+    Abre uma sessão no banco de dados da API
+
+    Não cria um arquivo SQLite vazio: se o banco ainda não existir, levanta
+    FileNotFoundError (o chamador decide se segue sem banco). Em um banco
+    existente, cria na primeira sessão as tabelas e índices novos dos models
+    (o pipeline pode rodar antes de a API reiniciar com o schema novo).
+
+    Returns:
+        Session: Sessão do SQLAlchemy (o chamador deve fechá-la)
+    """
+    ensure_api_path()
+
+    from config import DATABASE_URL
+
+    if DATABASE_URL.startswith('sqlite:///') and not os.path.exists(DATABASE_URL[len('sqlite:///'):]):
+        raise FileNotFoundError(DATABASE_URL)
+
+    from database import SessionLocal, migrate_schema
+
+    global _tables_ready
+    if not _tables_ready:
+        migrate_schema()
+        _tables_ready = True
+
+    return SessionLocal()
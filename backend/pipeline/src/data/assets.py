@@ -0,0 +1,43 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de ativos: quais ativos o pipeline deve processar
+"""
+
+try:
+    from .api_db import ensure_api_path, open_session
+except ImportError:
+    from data.api_db import ensure_api_path, open_session
+
+
+def load_active_assets():
+    """
+    Lista os ativos ativos a processar
+
+    Lê a tabela `assets` do banco de dados da API. Se o banco não estiver
+    disponível (ou ainda não tiver ativos), usa DEFAULT_ASSETS do config.
+
+    Returns:
+        list: Dicionários com 'code', 'name' e 'symbol' de cada ativo ativo
+    """
+    ensure_api_path()
+
+    from config import DEFAULT_ASSETS
+
+    try:
+        from repositories.asset_repository import AssetRepository
+
+        db = open_session()
+        try:
+            assets = AssetRepository(db).get_all(active_only=True)
+            if assets:
+                return [{'code': a.code, 'name': a.name, 'symbol': a.symbol} for a in assets]
+        finally:
+            db.close()
+
+    except Exception as e:
+        print(f"⚠️  Não foi possível ler os ativos do banco ({e}). Usando DEFAULT_ASSETS.")
+
+    return [
+        {'code': a['code'], 'name': a['name'], 'symbol': a['symbol']}
+        for a in DEFAULT_ASSETS if a['active']
+    ]
@@ -7,19 +7,107 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import sys
+
+try:
+    from .storage import dataset_exists, load_dataset, save_dataset
+except ImportError:
+    # Executado fora do pacote src (ex.: módulo rodado diretamente)
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.storage import dataset_exists, load_dataset, save_dataset
+
+
+def yahoo_source(ticker, start=None, end=None, period='max'):
+    """
+    Fonte de dados padrão: Yahoo Finance
+    
+    Args:
+        ticker (str): Ticker do Yahoo Finance
+        start (str): Data inicial 'YYYY-MM-DD' (opcional)
+        end (str): Data final 'YYYY-MM-DD' (opcional, exclusiva)
+        period (str): Período usado quando start não é informado
+    
+    Returns:
+        pd.DataFrame: Dados com coluna 'Date' (pode ser vazio)
+    """
+    if start:
+        data = yf.download(ticker, start=start, end=end, progress=False, auto_adjust=False)
+    else:
+        data = yf.download(ticker, period=period, progress=False, auto_adjust=False)
+    
+    # Remove colunas multi-level se existirem
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    
+    # Adiciona coluna de data como índice explícito
+    return data.reset_index()
+
+
+def yahoo_batch_source(tickers, start=None, end=None, period='max'):
+    """
+    Baixa vários tickers em uma única requisição ao Yahoo Finance
+    
+    Args:
+        tickers (list): Lista de tickers
+        start, end, period: Como em yahoo_source
+    
+    Returns:
+        dict: {ticker: pd.DataFrame com coluna 'Date'}
+    """
+    if start:
+        data = yf.download(list(tickers), start=start, end=end, progress=False,
+                           auto_adjust=False, group_by='ticker')
+    else:
+        data = yf.download(list(tickers), period=period, progress=False,
+                           auto_adjust=False, group_by='ticker')
+    
+    result = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                result[ticker] = pd.DataFrame()
+                continue
+            ticker_data = data[ticker]
+        else:
+            ticker_data = data
+        
+        result[ticker] = ticker_data.dropna(how='all').reset_index()
+    
+    return result
+
+
+class CSVSource:
+    """Fonte de dados local (CSV) com a mesma interface de yahoo_source - útil para testes e uso offline"""
+    
+    def __init__(self, filepath):
+        self.filepath = filepath
+    
+    def __call__(self, ticker, start=None, end=None, period='max'):
+        data = pd.read_csv(self.filepath, parse_dates=['Date'])
+        if start:
+            data = data[data['Date'] >= pd.Timestamp(start)]
+        if end:
+            data = data[data['Date'] < pd.Timestamp(end)]
+        return data.reset_index(drop=True)
+
 
 class GoldDataFetcher:
     """Classe para buscar dados históricos do ouro via Yahoo Finance"""
     
-    def __init__(self, ticker='GC=F'):
+    def __init__(self, ticker='GC=F', source=None):
         """
         Inicializa o fetcher
         
         Args:
             ticker (str): Ticker do Yahoo Finance (padrão: GC=F - Gold Futures)
+            source (callable): Fonte de dados source(ticker, start, end, period) -> DataFrame
+                               (padrão: yahoo_source)
         """
         self.ticker = ticker
+        self.source = source or yahoo_source
         self.data = None
+        self.new_rows = 0
+        self.revised_rows = 0
     
     def fetch_historical_data(self, start_date=None, end_date=None, period='max'):
         """
@@ -37,19 +125,14 @@ class GoldDataFetcher:
         
         try:
             if start_date and end_date:
-                self.data = yf.download(self.ticker, start=start_date, end=end_date, progress=False, auto_adjust=False)
+                self.data = self.source(self.ticker, start=start_date, end=end_date)
             else:
-                self.data = yf.download(self.ticker, period=period, progress=False, auto_adjust=False)
+                self.data = self.source(self.ticker, period=period)
             
             if self.data.empty:
                 raise ValueError("Nenhum dado foi retornado")
             
-            # Remove colunas multi-level se existirem
-            if isinstance(self.data.columns, pd.MultiIndex):
-                self.data.columns = self.data.columns.get_level_values(0)
-            
-            # Adiciona coluna de data como índice explícito
-            self.data.reset_index(inplace=True)
+            self.new_rows = len(self.data)
             
             print(f"✅ Dados coletados com sucesso!")
             print(f"   Período: {self.data['Date'].min()} a {self.data['Date'].max()}")
@@ -61,11 +144,100 @@ class GoldDataFetcher:
             print(f"❌ Erro ao buscar dados: {e}")
             return None
     
-    def calculate_daily_stats(self):
+    def fetch_incremental(self, filepath='data/raw/gold_prices.csv', period='5y'):
+        """
+        Atualiza os dados salvos baixando apenas as datas que faltam
+        
+        Lê a última data armazenada, busca a partir dela (inclusive) e mescla
+        as novas linhas (ordenadas e sem datas duplicadas). O último dia é
+        baixado de novo porque pode ter sido gravado com o pregão ainda em
+        andamento: a versão baixada substitui a armazenada. Se o arquivo não
+        existir, faz o download completo do período.
+        
+        Args:
+            filepath (str): Caminho do dataset armazenado (ver storage)
+            period (str): Período do download completo (quando não há arquivo)
+        
+        Returns:
+            pd.DataFrame: Dados completos (armazenados + novos)
+        """
+        if not dataset_exists(filepath):
+            return self.fetch_historical_data(period=period)
+        
+        stored = load_dataset(filepath)
+        start = self.fetch_start(stored)
+        
+        print(f"📊 Buscando dados ({self.ticker}) a partir de {start}...")
+        
+        new_data = None
+        try:
+            new_data = self.source(self.ticker, start=start)
+        except Exception as e:
+            print(f"⚠️  Erro ao buscar dados novos: {e}")
+        
+        return self.merge_new_data(stored, new_data)
+    
+    @staticmethod
+    def fetch_start(stored):
+        """Início do download incremental: a última data armazenada ('YYYY-MM-DD'), que é baixada de novo"""
+        return stored['Date'].max().strftime('%Y-%m-%d')
+    
+    def merge_new_data(self, stored, new_data):
+        """
+        Mescla novas linhas aos dados armazenados (ordenadas, sem datas duplicadas)
+        
+        Em datas repetidas vale a linha baixada. new_rows conta as datas novas
+        e revised_rows as datas já armazenadas cujos valores mudaram.
+        
+        Args:
+            stored (pd.DataFrame): Dados já armazenados
+            new_data (pd.DataFrame): Linhas baixadas (pode ser None ou vazio)
+        
+        Returns:
+            pd.DataFrame: Dados completos
+        """
+        if new_data is None or new_data.empty:
+            self.data = stored
+            self.new_rows = 0
+            self.revised_rows = 0
+            print(f"✅ Nenhum dado novo (último registro: {stored['Date'].max().strftime('%Y-%m-%d')})")
+            return self.data
+        
+        new_data = new_data.copy()
+        new_data['Date'] = pd.to_datetime(new_data['Date']).dt.tz_localize(None)
+        new_data = new_data[stored.columns.intersection(new_data.columns)]
+        new_data = new_data.drop_duplicates(subset=['Date'], keep='last')
+        
+        # Datas já armazenadas que vieram com outros valores (pregão revisado)
+        columns = new_data.columns.drop('Date')
+        before = stored.drop_duplicates(subset=['Date'], keep='last').set_index('Date')[columns]
+        after = new_data.set_index('Date')[columns]
+        overlap = before.index.intersection(after.index)
+        before, after = before.loc[overlap], after.loc[overlap]
+        changed = (before != after) & ~(before.isna() & after.isna())
+        
+        merged = pd.concat([stored, new_data], ignore_index=True)
+        merged = merged.drop_duplicates(subset=['Date'], keep='last')
+        merged = merged.sort_values('Date').reset_index(drop=True)
+        
+        self.new_rows = len(merged) - len(stored)
+        self.revised_rows = int(changed.any(axis=1).sum())
+        self.data = merged
+        
+        if self.new_rows or self.revised_rows:
+            print(f"✅ {self.new_rows} novos registros, {self.revised_rows} revisados (total: {len(self.data)})")
+        else:
+            print(f"✅ Nenhum dado novo (último registro: {merged['Date'].max().strftime('%Y-%m-%d')})")
+        return self.data
+    
+    def calculate_daily_stats(self, inplace=False):
         """
         Calcula estatísticas diárias (mediana, média, etc)
         Ideal para o conceito 'buongiorno' do projeto
         
+        Args:
+            inplace (bool): Adiciona as colunas diretamente em self.data (sem cópia)
+        
         Returns:
             pd.DataFrame: DataFrame com estatísticas diárias
         """
@@ -73,7 +245,7 @@ class GoldDataFetcher:
             print("⚠️  Nenhum dado disponível. Execute fetch_historical_data() primeiro.")
             return None
         
-        df = self.data.copy()
+        df = self.data if inplace else self.data.copy()
         
         # Calcula mediana do dia (entre Open, High, Low, Close)
         df['Median_Price'] = df[['Open', 'High', 'Low', 'Close']].median(axis=1)
@@ -89,23 +261,24 @@ class GoldDataFetcher:
         
         return df
     
-    def save_data(self, filepath='data/raw/gold_prices.csv'):
+    def save_data(self, filepath='data/raw/gold_prices', fmt=None, export_csv=False):
         """
-        Salva os dados em CSV
+        Salva os dados (Parquet por padrão, ver storage)
+        
+        A escrita é atômica: grava em um arquivo temporário no mesmo diretório
+        e o renomeia por cima do destino, então uma execução interrompida
+        nunca deixa o arquivo pela metade.
         
         Args:
-            filepath (str): Caminho do arquivo CSV
+            filepath (str): Caminho do dataset (a extensão segue o formato)
+            fmt (str): 'parquet', 'feather' ou 'csv' (padrão: storage.DEFAULT_FORMAT)
+            export_csv (bool): Também grava uma cópia em CSV
         """
         if self.data is None:
             print("⚠️  Nenhum dado disponível para salvar.")
             return
         
-        # Cria diretório se não existir (apenas se houver um diretório no caminho)
-        directory = os.path.dirname(filepath)
-        if directory:  # Só cria se não for string vazia
-            os.makedirs(directory, exist_ok=True)
-        
-        self.data.to_csv(filepath, index=False)
+        filepath = save_dataset(self.data, filepath, fmt=fmt, export_csv=export_csv)
         print(f"💾 Dados salvos em: {filepath}")
     
     def get_latest_price(self):
@@ -151,6 +324,60 @@ class GoldDataFetcher:
         print("="*60 + "\n")
 
 
+def fetch_incremental_batch(fetchers, filepaths, period='5y', batch_source=None):
+    """
+    Atualização incremental de vários ativos com uma única requisição
+    
+    Busca todos os tickers a partir da menor última data armazenada entre
+    eles (ou o período completo, se algum ainda não tiver arquivo) e mescla
+    em cada fetcher as suas linhas novas e revisadas (ver fetch_incremental).
+    
+    Args:
+        fetchers (list): Lista de GoldDataFetcher (um por ativo)
+        filepaths (list): Dataset de cada ativo, na mesma ordem
+        period (str): Período do download completo
+        batch_source (callable): batch_source(tickers, start, end, period) -> dict
+                                 (padrão: yahoo_batch_source)
+    
+    Returns:
+        list: DataFrame completo de cada ativo (None se o download falhar)
+    """
+    batch_source = batch_source or yahoo_batch_source
+    
+    stored = [load_dataset(path) if dataset_exists(path) else None
+              for path in filepaths]
+    
+    start = None
+    if all(df is not None for df in stored):
+        start = min(GoldDataFetcher.fetch_start(df) for df in stored)
+    
+    tickers = [fetcher.ticker for fetcher in fetchers]
+    print(f"📊 Buscando {len(tickers)} ativos em uma requisição: {', '.join(tickers)}"
+          + (f" (a partir de {start})" if start else f" (período {period})"))
+    
+    try:
+        downloaded = batch_source(tickers, start=start, period=period)
+    except Exception as e:
+        print(f"❌ Erro ao buscar dados: {e}")
+        downloaded = {}
+    
+    results = []
+    for fetcher, df in zip(fetchers, stored):
+        new_data = downloaded.get(fetcher.ticker)
+        
+        if df is not None:
+            results.append(fetcher.merge_new_data(df, new_data))
+        elif new_data is not None and not new_data.empty:
+            fetcher.data = new_data
+            fetcher.new_rows = len(new_data)
+            results.append(fetcher.data)
+        else:
+            print(f"❌ Nenhum dado retornado para {fetcher.ticker}")
+            results.append(None)
+    
+    return results
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Inicializa o fetcher
@@ -163,7 +390,7 @@ if __name__ == "__main__":
     data_with_stats = fetcher.calculate_daily_stats()
     
     # Salva os dados na pasta atual (para teste)
-    fetcher.save_data('gold_prices.csv')
+    fetcher.save_data('gold_prices')
     
     # Mostra resumo
     fetcher.print_summary()
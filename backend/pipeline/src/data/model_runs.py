@@ -0,0 +1,169 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de gravação das execuções do pipeline no banco da API
+(tabelas model_runs, prices e predictions)
+"""
+
+import math
+
+try:
+    from .api_db import ensure_api_path, open_session
+except ImportError:
+    from data.api_db import ensure_api_path, open_session
+
+
+def prediction_trend(change_abs):
+    """Tendência no formato da API ('up', 'down', 'stable')"""
+    if change_abs > 0:
+        return 'up'
+    if change_abs < 0:
+        return 'down'
+    return 'stable'
+
+
+def prediction_confidence(model_mape):
+    """Confiança pelo MAPE do modelo (mesmos limites da API)"""
+    if model_mape < 1:
+        return 'high'
+    if model_mape < 2:
+        return 'medium'
+    return 'low'
+
+
+def price_rows(df, asset_id, since=None):
+    """
+    Converte os dados de preços do pipeline em linhas da tabela prices
+
+    Args:
+        df (pd.DataFrame): Dados com Date, Open, High, Low, Close (e Adj Close, Volume)
+        asset_id (int): ID do ativo no banco
+        since (date): Só linhas a partir desta data (inclusive)
+
+    Returns:
+        list: Dicionários no formato de PriceRepository.bulk_upsert()
+    """
+    dates = df['Date'].dt.date
+    if since is not None:
+        mask = (dates >= since).to_numpy()
+        df, dates = df[mask], dates[mask]
+
+    def optional(column):
+        if column not in df.columns:
+            return [None] * len(df)
+        return [None if math.isnan(value) else float(value) for value in df[column].astype(float)]
+
+    return [
+        {
+            'asset_id': asset_id,
+            'date': day,
+            'open': float(open_),
+            'high': float(high),
+            'low': float(low),
+            'close': float(close),
+            'adj_close': adj_close,
+            'volume': volume
+        }
+        for day, open_, high, low, close, adj_close, volume in zip(
+            dates, df['Open'], df['High'], df['Low'], df['Close'],
+            optional('Adj Close'), optional('Volume')
+        )
+    ]
+
+
+def save_pipeline_run(asset, run, prices=None, prediction=None):
+    """
+    Grava uma execução do pipeline de um ativo em uma única transação
+
+    Registra o ModelRun, insere/atualiza os preços a partir da última data
+    já gravada do ativo (a última é regravada: o download incremental a
+    baixa de novo, e o pregão pode ter sido gravado ainda em andamento),
+    concilia o preço real das previsões cuja data alvo passou a ter preço ou
+    teve o fechamento revisado (recalculando as métricas de acurácia do
+    ativo) e
+    cria a previsão nova ligada ao ModelRun. O ativo é
+    criado se ainda não existir no banco. Se alguma previsão mudou, a geração
+    'predictions' (data_versions) é incrementada para invalidar os caches
+    de respostas da API.
+
+    Falhas de banco não interrompem o pipeline: nada é gravado (rollback).
+
+    Args:
+        asset (dict): Ativo com 'code', 'name' e 'symbol'
+        run (dict): Campos de ModelRunRepository.create()
+        prices (pd.DataFrame): Dados de preços do pipeline (None = não grava preços)
+        prediction (dict): Campos de PredictionRepository.create() sem asset_id,
+                           model_run_id, trend e confidence (None = sem previsão nova)
+
+    Returns:
+        dict: 'model_run_id', 'prices_written', 'predictions_reconciled',
+              'metrics_written' e 'prediction_id', ou None se não foi possível gravar
+    """
+    try:
+        ensure_api_path()
+        from repositories import (
+            AssetRepository, PriceRepository, PredictionRepository, ModelRunRepository,
+            DataVersionRepository, PredictionMetricRepository
+        )
+
+        db = open_session()
+        try:
+            asset_repo = AssetRepository(db)
+            price_repo = PriceRepository(db)
+            prediction_repo = PredictionRepository(db)
+
+            db_asset = asset_repo.get_by_code(asset['code'])
+            if db_asset is None:
+                db_asset = asset_repo.create(
+                    code=asset['code'], name=asset['name'], symbol=asset['symbol'], commit=False
+                )
+
+            model_run = ModelRunRepository(db).create(**run, commit=False)
+            saved = {
+                'model_run_id': model_run.id,
+                'prices_written': 0,
+                'predictions_reconciled': 0,
+                'metrics_written': 0,
+                'prediction_id': None
+            }
+
+            if prices is not None and len(prices):
+                latest = price_repo.get_latest(db_asset.id)
+                since = latest.date if latest else None
+                saved['prices_written'] = price_repo.bulk_upsert(
+                    price_rows(prices, db_asset.id, since=since), commit=False
+                )
+                saved['predictions_reconciled'] = prediction_repo.reconcile_real_prices(
+                    db_asset.id, since=since, commit=False
+                )
+
+                # Métricas de acurácia: só mudam com novas conciliações (ou
+                # ainda não existem para o ativo)
+                metric_repo = PredictionMetricRepository(db)
+                if saved['predictions_reconciled'] or not metric_repo.get_by_asset(db_asset.id):
+                    saved['metrics_written'] = metric_repo.refresh(db_asset.id, commit=False)
+
+            if prediction is not None:
+                saved['prediction_id'] = prediction_repo.create(
+                    asset_id=db_asset.id,
+                    model_run_id=model_run.id,
+                    trend=prediction_trend(prediction['change_abs']),
+                    confidence=prediction_confidence(prediction['model_mape']),
+                    commit=False,
+                    **prediction
+                ).id
+
+            # Previsões mudaram: invalida os caches de respostas da API
+            if saved['prediction_id'] or saved['predictions_reconciled'] or saved['metrics_written']:
+                DataVersionRepository(db).bump('predictions', commit=False)
+
+            db.commit()
+            return saved
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    except Exception as e:
+        print(f"⚠️  Execução não registrada no banco ({e})")
+        return None
@@ -3,41 +3,57 @@ Buongiorno - Gold Price Prediction Project
 Módulo de preprocessamento de dados
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+try:
+    from .storage import save_dataset, load_dataset
+except ImportError:
+    # Executado fora do pacote src (ex.: módulo rodado diretamente)
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.storage import save_dataset, load_dataset
+
 class DataPreprocessor:
     """Classe para preprocessar e limpar dados do ouro"""
     
-    def __init__(self, df):
+    def __init__(self, df, copy=True):
         """
         Inicializa o preprocessor
         
         Args:
             df (pd.DataFrame): DataFrame com dados brutos
+            copy (bool): False = assume a posse do DataFrame (sem cópia): as
+                         colunas novas são adicionadas ao próprio objeto
         """
-        self.df = df.copy()
+        self.copy = copy
+        self.df = df.copy() if copy else df
         self.processed_df = None
     
     def clean_data(self):
         """Remove dados faltantes e inconsistentes"""
         print("🧹 Limpando dados...")
         
-        # Remove linhas com valores nulos
+        # Remove linhas com valores nulos (só copia se houver nulos)
         before = len(self.df)
-        self.df = self.df.dropna()
+        if self.df.isna().any(axis=None):
+            self.df = self.df.dropna()
         after = len(self.df)
         
         if before > after:
             print(f"   Removidas {before - after} linhas com valores nulos")
         
         # Garante que Date é datetime
-        if 'Date' in self.df.columns:
+        if 'Date' in self.df.columns and not pd.api.types.is_datetime64_any_dtype(self.df['Date']):
             self.df['Date'] = pd.to_datetime(self.df['Date'])
         
-        # Ordena por data
-        self.df = self.df.sort_values('Date').reset_index(drop=True)
+        # Ordena por data (dados já ordenados não são copiados)
+        if not self.df['Date'].is_monotonic_increasing:
+            self.df = self.df.sort_values('Date')
+        if not self.df.index.equals(pd.RangeIndex(len(self.df))):
+            self.df = self.df.reset_index(drop=True)
         
         print(f"✅ Dados limpos: {len(self.df)} registros")
         return self.df
@@ -69,7 +85,7 @@ class DataPreprocessor:
         # Adiciona features temporais
         self.add_temporal_features()
         
-        self.processed_df = self.df.copy()
+        self.processed_df = self.df.copy() if self.copy else self.df
         
         print("✅ Dados preparados!")
         print(f"   Shape: {self.processed_df.shape}")
@@ -77,22 +93,20 @@ class DataPreprocessor:
         
         return self.processed_df
     
-    def save_processed_data(self, filepath='data/processed/gold_processed.csv'):
-        """Salva dados processados"""
+    def save_processed_data(self, filepath='data/processed/gold_processed', fmt=None, export_csv=False):
+        """Salva dados processados (Parquet por padrão, ver storage)"""
         if self.processed_df is None:
             print("⚠️  Execute prepare_for_modeling() primeiro")
             return
         
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        self.processed_df.to_csv(filepath, index=False)
+        filepath = save_dataset(self.processed_df, filepath, fmt=fmt, export_csv=export_csv)
         print(f"💾 Dados processados salvos em: {filepath}")
 
 
 # Exemplo de uso
 if __name__ == "__main__":
     # Carrega dados brutos
-    df = pd.read_csv('data/raw/gold_prices.csv')
+    df = load_dataset('data/raw/gold_prices')
     
     # Preprocessa
     preprocessor = DataPreprocessor(df)
@@ -0,0 +1,169 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de armazenamento dos datasets (raw, processed, features)
+"""
+
+import os
+import pandas as pd
+
+# Formato padrão dos datasets: 'parquet', 'feather' ou 'csv'
+DEFAULT_FORMAT = os.getenv('PIPELINE_STORAGE_FORMAT', 'parquet')
+
+EXTENSIONS = {
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv': '.csv'
+}
+
+
+def _has_pyarrow():
+    """Verifica se o pyarrow (necessário para Parquet/Feather) está instalado"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _resolve_format(fmt):
+    """Formato efetivo: cai para CSV se o pyarrow não estiver instalado"""
+    fmt = fmt or DEFAULT_FORMAT
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Formato de armazenamento inválido: {fmt}")
+    if fmt != 'csv' and not _has_pyarrow():
+        print("⚠️  pyarrow não instalado, usando CSV. Para Parquet/Feather: pip install pyarrow")
+        return 'csv'
+    return fmt
+
+
+def dataset_path(path, fmt=None):
+    """
+    Caminho do dataset no formato pedido
+
+    O nome lógico do dataset é o caminho sem extensão, então
+    'data/raw/gold_prices.csv' e 'data/raw/gold_prices' apontam para o
+    mesmo dataset.
+    """
+    return os.path.splitext(path)[0] + EXTENSIONS[_resolve_format(fmt)]
+
+
+def find_dataset(path):
+    """
+    Localiza o arquivo existente de um dataset
+
+    Procura no formato padrão primeiro e depois nos demais (assim arquivos
+    CSV antigos continuam sendo lidos até a próxima gravação).
+
+    Returns:
+        str: Caminho do arquivo ou None se o dataset não existir
+    """
+    stem = os.path.splitext(path)[0]
+    formats = [DEFAULT_FORMAT] + [f for f in EXTENSIONS if f != DEFAULT_FORMAT]
+
+    for fmt in formats:
+        candidate = stem + EXTENSIONS[fmt]
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def dataset_exists(path):
+    """Verifica se o dataset existe em algum formato"""
+    return find_dataset(path) is not None
+
+
+def apply_schema(df, float_dtype='float64'):
+    """
+    Aplica os tipos do schema: 'Date' como datetime64 e colunas de ponto
+    flutuante em float_dtype ('float64' ou 'float32')
+    """
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'])
+
+    # Só converte as colunas que ainda não estão no tipo pedido
+    float_cols = [
+        col for col, dtype in df.dtypes.items()
+        if pd.api.types.is_float_dtype(dtype) and dtype != float_dtype
+    ]
+    if len(float_cols):
+        df[float_cols] = df[float_cols].astype(float_dtype)
+
+    return df
+
+
+def save_dataset(df, path, fmt=None, export_csv=False, float_dtype='float64'):
+    """
+    Salva um dataset
+
+    A escrita é atômica (arquivo temporário + os.replace). Feather é gravado
+    sem compressão para permitir leitura com memory-map.
+
+    Args:
+        df (pd.DataFrame): Dados
+        path (str): Caminho do dataset (a extensão é definida pelo formato)
+        fmt (str): 'parquet', 'feather' ou 'csv' (padrão: DEFAULT_FORMAT)
+        export_csv (bool): Também grava uma cópia em CSV
+        float_dtype (str): Tipo das colunas de ponto flutuante
+
+    Returns:
+        str: Caminho do arquivo gravado
+    """
+    fmt = _resolve_format(fmt)
+    filepath = dataset_path(path, fmt)
+
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Cópia rasa: o schema substitui colunas sem alterar o DataFrame do chamador
+    if df.index.equals(pd.RangeIndex(len(df))):
+        df = df.copy(deep=False)
+    else:
+        df = df.reset_index(drop=True)
+    df = apply_schema(df, float_dtype=float_dtype)
+
+    tmp_path = f"{filepath}.tmp"
+    if fmt == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    elif fmt == 'feather':
+        df.to_feather(tmp_path, compression='uncompressed')
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, filepath)
+
+    if export_csv and fmt != 'csv':
+        save_dataset(df, path, fmt='csv', float_dtype=float_dtype)
+
+    return filepath
+
+
+def load_dataset(path, columns=None, float_dtype=None):
+    """
+    Carrega um dataset
+
+    Args:
+        path (str): Caminho do dataset (qualquer extensão)
+        columns (list): Colunas a carregar (padrão: todas)
+        float_dtype (str): Converte colunas de ponto flutuante (padrão: mantém)
+
+    Returns:
+        pd.DataFrame: Dados com 'Date' como datetime64
+    """
+    filepath = find_dataset(path)
+    if filepath is None:
+        raise FileNotFoundError(f"Dataset não encontrado: {path}")
+
+    if filepath.endswith('.parquet'):
+        df = pd.read_parquet(filepath, columns=columns)
+    elif filepath.endswith('.feather'):
+        from pyarrow import feather
+        df = feather.read_table(filepath, columns=columns, memory_map=True).to_pandas()
+    else:
+        df = pd.read_csv(filepath, usecols=columns)
+
+    if float_dtype:
+        return apply_schema(df, float_dtype=float_dtype)
+
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'])
+    return df
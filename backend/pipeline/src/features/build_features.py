@@ -3,20 +3,216 @@ Buongiorno - Gold Price Prediction Project
 Módulo de engenharia de features
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+try:
+    from ..data.storage import save_dataset, load_dataset
+except ImportError:
+    # Executado fora do pacote src (ex.: módulo rodado diretamente)
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.storage import save_dataset, load_dataset
+
+def rolling_moments(values, mean_windows=(), std_windows=(), out_means=None, out_stds=None):
+    """
+    Médias e desvios padrão (ddof=1) móveis de várias janelas, equivalentes
+    a Series.rolling(window).mean()/.std(), calculados juntos por acumulação
+    por deslocamento
+    
+    Para cada deslocamento k = 1 .. max(janelas) - 1 faz uma passada
+    vetorizada sobre o array inteiro e acumula d = v[i-k] - v[i] e d²
+    (desvios em relação ao último valor da janela, numericamente estáveis).
+    O custo é O(n·W), com W a maior janela, compartilhado por todas as
+    janelas. Ao atingir o tamanho de uma janela w, média e variância saem
+    de Σd e Σd²:
+    
+        média = v[i] + Σd / w
+        var   = (Σd² - (Σd)² / w) / (w - 1)
+    
+    Somas prefixadas seriam O(n), mas cada linha dependeria de tudo o que
+    veio antes dela. Aqui as somas de cada linha usam só os valores da
+    própria janela, sempre na mesma ordem, então o resultado não depende de
+    onde a série começa - o modo incremental é idêntico bit a bit ao
+    cálculo completo.
+    
+    Args:
+        values (array-like): Série de valores
+        mean_windows (list): Janelas das médias móveis
+        std_windows (list): Janelas dos desvios padrão
+        out_means (dict): Arrays de saída {janela: array} já alocados (opcional)
+        out_stds (dict): Idem para os desvios padrão
+    
+    Returns:
+        tuple: (means, stds) - dicionários {janela: np.ndarray}, com NaN nas
+               primeiras window-1 linhas
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    n = len(values)
+    
+    means = dict(out_means or {})
+    stds = dict(out_stds or {})
+    for window in mean_windows:
+        means.setdefault(window, np.empty(n))
+    for window in std_windows:
+        stds.setdefault(window, np.empty(n))
+    
+    max_window = max(list(means) + list(stds), default=0)
+    max_std_window = max(stds, default=0)
+    
+    sum_d = np.zeros(n)
+    sum_d2 = np.zeros(n)
+    buffer = np.empty(n)
+    
+    for k in range(max_window):
+        window = k + 1
+        
+        if 0 < k < n:
+            d = buffer[:n - k]
+            np.subtract(values[:n - k], values[k:], out=d)
+            sum_d[k:] += d
+            if window <= max_std_window:
+                np.multiply(d, d, out=d)
+                sum_d2[k:] += d
+        
+        if window in means:
+            out = means[window]
+            np.divide(sum_d, window, out=out)
+            out += values
+            out[:window - 1] = np.nan
+        
+        if window in stds:
+            out = stds[window]
+            if window == 1:
+                out[:] = np.nan
+                continue
+            np.multiply(sum_d, sum_d, out=out)
+            out /= -window
+            out += sum_d2
+            np.maximum(out, 0.0, out=out)
+            out /= window - 1
+            np.sqrt(out, out=out)
+            out[:window - 1] = np.nan
+    
+    return means, stds
+
+
+def rolling_stat(values, window, stat='mean'):
+    """
+    Média ou desvio padrão (ddof=1) móvel de uma janela (ver rolling_moments)
+    
+    Args:
+        values (array-like): Série de valores
+        window (int): Tamanho da janela
+        stat (str): 'mean' ou 'std'
+    
+    Returns:
+        np.ndarray: Estatística por linha (NaN nas primeiras window-1 linhas)
+    """
+    if stat == 'mean':
+        return rolling_moments(values, mean_windows=[window])[0][window]
+    return rolling_moments(values, std_windows=[window])[1][window]
+
+
+def shifted(values, periods):
+    """Equivalente a Series.shift(periods) sobre um array"""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def build_feature_block(df, column='Close',
+                        lags=[1, 2, 3, 5, 7],
+                        ma_windows=[7, 14, 30, 60],
+                        vol_windows=[7, 14, 30],
+                        momentum_periods=[5, 10, 20]):
+    """
+    Calcula todas as features de uma vez em um único array 2-D
+    
+    Mesmas colunas (e mesma ordem) de add_lag_features, add_moving_averages,
+    add_volatility_features, add_momentum_features e add_price_ranges, mas
+    sem criar uma Series por feature nem inserir colunas uma a uma.
+    
+    Args:
+        df (pd.DataFrame): Dados preprocessados
+        column (str): Coluna base das features
+        lags, ma_windows, vol_windows, momentum_periods: Como em add_all_features()
+    
+    Returns:
+        pd.DataFrame: Bloco de features (mesmo índice de df)
+    """
+    values = df[column].to_numpy(dtype=np.float64)
+    
+    has_range = all(c in df.columns for c in ('High', 'Low', 'Close'))
+    has_avg_range = has_range and 'Intraday_Range' in df.columns
+    
+    columns = ([f'{column}_lag_{lag}' for lag in lags]
+               + [f'{column}_MA_{w}' for w in ma_windows]
+               + [f'{column}_volatility_{w}' for w in vol_windows]
+               + [name for p in momentum_periods for name in (f'{column}_momentum_{p}', f'{column}_roc_{p}')]
+               + (['close_position'] if has_range else [])
+               + (['avg_range_7', 'avg_range_30'] if has_avg_range else []))
+    
+    # Colunas contíguas (ordem Fortran): cada feature é escrita direto na sua
+    # coluna e o DataFrame final usa o array sem copiar
+    block = np.empty((len(values), len(columns)), order='F')
+    position = {name: i for i, name in enumerate(columns)}
+    
+    def column_of(name):
+        return block[:, position[name]]
+    
+    for lag in lags:
+        column_of(f'{column}_lag_{lag}')[:] = shifted(values, lag)
+    
+    rolling_moments(
+        values,
+        out_means={w: column_of(f'{column}_MA_{w}') for w in ma_windows},
+        out_stds={w: column_of(f'{column}_volatility_{w}') for w in vol_windows}
+    )
+    
+    for period in momentum_periods:
+        past = shifted(values, period)
+        np.subtract(values, past, out=column_of(f'{column}_momentum_{period}'))
+        roc = column_of(f'{column}_roc_{period}')
+        np.divide(values - past, past, out=roc)
+        roc *= 100
+    
+    if has_range:
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(close - low, high - low, out=column_of('close_position'))
+    
+    if has_avg_range:
+        rolling_moments(
+            df['Intraday_Range'].to_numpy(dtype=np.float64),
+            out_means={7: column_of('avg_range_7'), 30: column_of('avg_range_30')}
+        )
+    
+    return pd.DataFrame(block, columns=columns, index=df.index)
+
+
+def feature_lookback(lags, ma_windows, vol_windows, momentum_periods):
+    """Número de linhas anteriores necessárias para calcular as features de uma linha"""
+    return max(list(lags) + list(ma_windows) + list(vol_windows) + list(momentum_periods) + [30])
+
+
 class FeatureEngineer:
     """Classe para criar features a partir dos dados do ouro"""
     
-    def __init__(self, df):
+    def __init__(self, df, copy=True):
         """
         Inicializa o feature engineer
         
         Args:
             df (pd.DataFrame): DataFrame com dados preprocessados
+            copy (bool): False = assume a posse do DataFrame (sem cópia)
         """
-        self.df = df.copy()
+        self.copy = copy
+        self.df = df.copy() if copy else df
         self.feature_df = None
     
     def add_lag_features(self, column='Close', lags=[1, 2, 3, 5, 7]):
@@ -46,7 +242,7 @@ class FeatureEngineer:
         print(f"📊 Adicionando médias móveis de '{column}'...")
         
         for window in windows:
-            self.df[f'{column}_MA_{window}'] = self.df[column].rolling(window=window).mean()
+            self.df[f'{column}_MA_{window}'] = rolling_stat(self.df[column], window, 'mean')
         
         print(f"✅ {len(windows)} médias móveis adicionadas")
         return self.df
@@ -62,7 +258,7 @@ class FeatureEngineer:
         print(f"📈 Adicionando volatilidade de '{column}'...")
         
         for window in windows:
-            self.df[f'{column}_volatility_{window}'] = self.df[column].rolling(window=window).std()
+            self.df[f'{column}_volatility_{window}'] = rolling_stat(self.df[column], window, 'std')
         
         print(f"✅ {len(windows)} features de volatilidade adicionadas")
         return self.df
@@ -102,8 +298,8 @@ class FeatureEngineer:
             
             # Range médio móvel
             if 'Intraday_Range' in self.df.columns:
-                self.df['avg_range_7'] = self.df['Intraday_Range'].rolling(7).mean()
-                self.df['avg_range_30'] = self.df['Intraday_Range'].rolling(30).mean()
+                self.df['avg_range_7'] = rolling_stat(self.df['Intraday_Range'], 7, 'mean')
+                self.df['avg_range_30'] = rolling_stat(self.df['Intraday_Range'], 30, 'mean')
         
         print("✅ Features de range adicionadas")
         return self.df
@@ -125,16 +321,23 @@ class FeatureEngineer:
         print("\n🔧 Gerando todas as features...")
         print("=" * 60)
         
-        # Adiciona todas as features
-        self.add_lag_features(lags=lags)
-        self.add_moving_averages(windows=ma_windows)
-        self.add_volatility_features(windows=vol_windows)
-        self.add_momentum_features(periods=momentum_periods)
-        self.add_price_ranges()
+        # Todas as features em um único bloco, anexado com um só concat
+        block = build_feature_block(
+            self.df,
+            lags=lags,
+            ma_windows=ma_windows,
+            vol_windows=vol_windows,
+            momentum_periods=momentum_periods
+        )
+        print(f"✅ {block.shape[1]} features calculadas (lags, médias, volatilidade, momentum, ranges)")
+        
+        # Remove NaNs gerados pelas features (filtra antes do concat para
+        # copiar os dados uma única vez)
+        base = self.df.drop(columns=block.columns, errors='ignore')
+        valid = base.notna().all(axis=1).to_numpy() & ~np.isnan(block.to_numpy()).any(axis=1)
         
-        # Remove NaNs gerados pelas features
-        before = len(self.df)
-        self.df = self.df.dropna()
+        before = len(base)
+        self.df = pd.concat([base[valid], block[valid]], axis=1)
         after = len(self.df)
         
         print("=" * 60)
@@ -142,7 +345,66 @@ class FeatureEngineer:
         print(f"✅ Total de features criadas: {len(self.df.columns)}")
         print(f"✅ Registros finais: {after}")
         
-        self.feature_df = self.df.copy()
+        self.feature_df = self.df.copy() if self.copy else self.df
+        return self.feature_df
+    
+    def add_features_incremental(self, existing_features,
+                                 lags=[1, 2, 3, 5, 7],
+                                 ma_windows=[7, 14, 30, 60],
+                                 vol_windows=[7, 14, 30],
+                                 momentum_periods=[5, 10, 20]):
+        """
+        Calcula features apenas para as datas novas e as anexa à tabela existente
+        
+        Usa só as últimas linhas necessárias para as janelas (feature_lookback)
+        antes da primeira data nova. O resultado é idêntico ao de
+        add_all_features() sobre todo o histórico. Se a tabela existente não
+        for compatível (colunas diferentes ou datas à frente dos dados), faz o
+        cálculo completo.
+        
+        Args:
+            existing_features (pd.DataFrame): Tabela de features já calculada
+            lags, ma_windows, vol_windows, momentum_periods: Como em add_all_features()
+        
+        Returns:
+            pd.DataFrame: Tabela de features completa
+        """
+        params = dict(lags=lags, ma_windows=ma_windows,
+                      vol_windows=vol_windows, momentum_periods=momentum_periods)
+        
+        dates = pd.to_datetime(self.df['Date'])
+        last_date = pd.to_datetime(existing_features['Date']).max()
+        
+        if existing_features.empty or last_date > dates.max():
+            print("⚠️  Tabela de features incompatível com os dados. Recalculando tudo...")
+            return self.add_all_features(**params)
+        
+        new_positions = np.flatnonzero((dates > last_date).to_numpy())
+        first_new = new_positions[0] if len(new_positions) else len(self.df) - 1
+        
+        # Apenas as linhas necessárias para as janelas das datas novas
+        # (sem datas novas, calcula a última linha só para validar as colunas)
+        start = max(0, first_new - feature_lookback(**params))
+        print(f"\n🔧 Gerando features incrementais: {len(new_positions)} datas novas "
+              f"({len(self.df) - start} linhas de contexto)")
+        
+        context = FeatureEngineer(self.df.iloc[start:], copy=self.copy)
+        new_features = context.add_all_features(**params)
+        new_features = new_features[pd.to_datetime(new_features['Date']) > last_date]
+        
+        if list(new_features.columns) != list(existing_features.columns):
+            print("⚠️  Colunas da tabela de features mudaram. Recalculando tudo...")
+            return self.add_all_features(**params)
+        
+        if new_features.empty:
+            print(f"✅ Features já atualizadas até {last_date.strftime('%Y-%m-%d')}")
+            self.feature_df = existing_features
+            return self.feature_df
+        
+        new_features = new_features.astype(existing_features.dtypes.to_dict())
+        self.feature_df = pd.concat([existing_features, new_features], ignore_index=True)
+        
+        print(f"✅ {len(new_features)} linhas de features anexadas (total: {len(self.feature_df)})")
         return self.feature_df
     
     def get_feature_importance_names(self):
@@ -154,22 +416,20 @@ class FeatureEngineer:
         feature_cols = [col for col in self.df.columns if col not in exclude_cols]
         return feature_cols
     
-    def save_features(self, filepath='data/processed/gold_features.csv'):
-        """Salva dados com features"""
+    def save_features(self, filepath='data/processed/gold_features', fmt=None, export_csv=False):
+        """Salva dados com features (Parquet por padrão, ver storage)"""
         if self.feature_df is None:
             print("⚠️  Execute add_all_features() primeiro")
             return
         
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        self.feature_df.to_csv(filepath, index=False)
+        filepath = save_dataset(self.feature_df, filepath, fmt=fmt, export_csv=export_csv)
         print(f"💾 Features salvas em: {filepath}")
 
 
 # Exemplo de uso
 if __name__ == "__main__":
     # Carrega dados preprocessados
-    df = pd.read_csv('data/processed/gold_processed.csv')
+    df = load_dataset('data/processed/gold_processed')
     
     # Cria features
     engineer = FeatureEngineer(df)
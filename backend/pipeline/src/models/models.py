@@ -86,10 +86,36 @@ class MovingAverageModel(BaseModel):
 class ARIMAModel(BaseModel):
     """Modelo ARIMA para séries temporais"""
     
-    def __init__(self, order=(5, 1, 0)):
+    def __init__(self, order=(5, 1, 0), incremental=False, refit_every=None):
+        """
+        Inicializa o modelo
+        
+        Args:
+            order (tuple): Ordem (p, d, q) do ARIMA
+            incremental (bool): Se True, o walk-forward ajusta o modelo uma vez e
+                incorpora cada nova observação via filtro de Kalman (parâmetros fixos)
+                em vez de retreinar do zero a cada passo
+            refit_every (int): No modo incremental, retreina os parâmetros a cada
+                N passos (None = nunca retreina)
+        """
         super().__init__(name=f"ARIMA{order}")
         self.order = order
+        self.incremental = incremental
+        self.refit_every = refit_every
         self.history = []
+        self.fit_count = 0
+        self.updates_since_fit = 0
+        self.drift = []
+        self.drift_stats = {}
+    
+    def _fit_history(self):
+        """Ajusta um ARIMA completo (MLE) sobre todo o histórico atual"""
+        from statsmodels.tsa.arima.model import ARIMA
+        
+        model = ARIMA(self.history, order=self.order)
+        self.fit_count += 1
+        self.updates_since_fit = 0
+        return model.fit()
     
     def fit(self, train_series):
         """
@@ -109,33 +135,84 @@ class ARIMAModel(BaseModel):
         self.history = list(train_series)
         
         # Treina modelo inicial
-        model = ARIMA(self.history, order=self.order)
-        self.model = model.fit()
+        self.model = self._fit_history()
         
         print(f"✅ {self.name} treinado!")
         return self
     
     def predict_next(self):
         """Prevê o próximo valor"""
-        from statsmodels.tsa.arima.model import ARIMA
+        if self.incremental and self.model is not None:
+            # Modelo já contém todo o histórico (filtrado incrementalmente)
+            return self.model.forecast(steps=1)[0]
         
         # Retreina com histórico atualizado
-        model = ARIMA(self.history, order=self.order)
-        model_fit = model.fit()
+        model_fit = self._fit_history()
         
         # Prevê próximo passo
         forecast = model_fit.forecast(steps=1)
         
         return forecast[0]
     
+    def update(self, true_value):
+        """
+        Incorpora uma nova observação ao modelo (modo incremental)
+        
+        Estende o filtro de Kalman com os parâmetros atuais; a cada
+        `refit_every` observações retreina os parâmetros e registra a
+        diferença entre a previsão incremental e a do modelo retreinado.
+        """
+        self.history.append(true_value)
+        
+        if not self.incremental:
+            return self.model
+        
+        self.model = self.model.extend([true_value])
+        self.updates_since_fit += 1
+        
+        if self.refit_every and self.updates_since_fit >= self.refit_every:
+            incremental_forecast = self.model.forecast(steps=1)[0]
+            self.model = self._fit_history()
+            refit_forecast = self.model.forecast(steps=1)[0]
+            self.drift.append(incremental_forecast - refit_forecast)
+        
+        return self.model
+    
+    def _summarize_drift(self):
+        """Resume a deriva entre previsões incrementais e previsões com retreino completo"""
+        if not self.drift:
+            self.drift_stats = {}
+            return self.drift_stats
+        
+        drift = np.abs(np.array(self.drift))
+        last_price = self.history[-1]
+        
+        self.drift_stats = {
+            'checks': len(drift),
+            'refit_every': self.refit_every,
+            'mean_abs': float(drift.mean()),
+            'max_abs': float(drift.max()),
+            'mean_pct': float(drift.mean() / last_price * 100)
+        }
+        
+        print(f"   Deriva vs retreino completo ({self.drift_stats['checks']} verificações, k={self.refit_every}): "
+              f"média ${self.drift_stats['mean_abs']:.2f} ({self.drift_stats['mean_pct']:.3f}%), "
+              f"máx ${self.drift_stats['max_abs']:.2f}")
+        return self.drift_stats
+    
     def walk_forward_validation(self, test_series):
         """
         Validação walk-forward (mais realista para séries temporais)
         Prevê um dia por vez, adicionando o valor real ao histórico
+        
+        No modo incremental, o modelo não é retreinado a cada passo: cada
+        valor real é incorporado ao estado do modelo (ver update()).
         """
-        print(f"🚶 Executando walk-forward validation com {len(test_series)} passos...")
+        mode = "incremental" if self.incremental else "retreino completo"
+        print(f"🚶 Executando walk-forward validation com {len(test_series)} passos ({mode})...")
         
         predictions = []
+        self.drift = []
         
         for i, true_value in enumerate(test_series):
             # Prevê próximo valor
@@ -143,14 +220,17 @@ class ARIMAModel(BaseModel):
             predictions.append(pred)
             
             # Adiciona valor real ao histórico
-            self.history.append(true_value)
+            self.update(true_value)
             
             if (i + 1) % 50 == 0:
                 print(f"   Progresso: {i + 1}/{len(test_series)} previsões")
         
         self.predictions = np.array(predictions)
         
-        print("✅ Walk-forward validation concluída!")
+        if self.incremental:
+            self._summarize_drift()
+        
+        print(f"✅ Walk-forward validation concluída! ({self.fit_count} ajustes do modelo)")
         return self.predictions
     
     def evaluate(self, test_series):
@@ -167,6 +247,158 @@ class ARIMAModel(BaseModel):
         return self.metrics
 
 
+def lag_matrix(z, p, const=False):
+    """
+    Monta a matriz de lags de uma série para um AR(p)
+    
+    Args:
+        z (np.ndarray): Série (já diferenciada, se for o caso)
+        p (int): Número de lags
+        const (bool): Adiciona coluna de intercepto
+    
+    Returns:
+        tuple: (X, y) - X tem uma linha por observação a partir da posição p,
+               com colunas [z_{t-1}, ..., z_{t-p}] (+ 1)
+    """
+    z = np.asarray(z, dtype=np.float64)
+    n = len(z) - p
+    X = np.column_stack([z[p - lag:p - lag + n] for lag in range(1, p + 1)])
+    if const:
+        X = np.column_stack([X, np.ones(n)])
+    return X, z[p:]
+
+
+def fit_ar_expanding(series, order, ends):
+    """
+    Ajusta AR(p) por mínimos quadrados condicionais em várias janelas
+    expansíveis de uma vez e prevê o passo seguinte de cada janela
+    
+    As equações normais (X'X e X'y) de cada janela são somas acumuladas dos
+    produtos externos das linhas da matriz de lags, então todas as janelas
+    são resolvidas com um único np.linalg.solve empilhado.
+    
+    Args:
+        series (array-like): Série de preços
+        order (tuple): Ordem (p, d, 0) com d em (0, 1)
+        ends (array-like): Tamanho de cada janela (usa series[:end])
+    
+    Returns:
+        tuple: (params, forecasts) - params (len(ends), k) e previsões um passo
+               à frente (len(ends),); NaN para janelas curtas demais
+    """
+    p, d, q = order
+    if q != 0 or d not in (0, 1) or p < 1:
+        raise ValueError(f"Ordem não suportada pelo ajuste NumPy: {order}")
+    
+    x = np.asarray(series, dtype=np.float64)
+    z = np.diff(x) if d == 1 else x
+    const = d == 0
+    ends = np.asarray(ends, dtype=np.int64)
+    
+    X, y = lag_matrix(z, p, const=const)
+    k = X.shape[1]
+    
+    # Somas acumuladas das equações normais (linha 0 = janela vazia)
+    xtx = np.zeros((len(X) + 1, k, k))
+    xty = np.zeros((len(X) + 1, k))
+    np.cumsum(X[:, :, None] * X[:, None, :], axis=0, out=xtx[1:])
+    np.cumsum(X * y[:, None], axis=0, out=xty[1:])
+    
+    # Número de linhas da matriz de lags disponíveis em cada janela
+    rows = ends - d - p
+    valid = rows >= k
+    
+    params = np.full((len(ends), k), np.nan)
+    if valid.any():
+        r = rows[valid]
+        params[valid] = np.linalg.solve(xtx[r], xty[r][:, :, None])[:, :, 0]
+    
+    # Regressores do passo seguinte: últimos p valores de z de cada janela
+    forecasts = np.full(len(ends), np.nan)
+    for i in np.flatnonzero(valid):
+        zn = ends[i] - d
+        regressors = z[zn - p:zn][::-1]
+        if const:
+            regressors = np.append(regressors, 1.0)
+        z_hat = regressors @ params[i]
+        forecasts[i] = x[ends[i] - 1] + z_hat if d == 1 else z_hat
+    
+    return params, forecasts
+
+
+class ARIMAFastModel(ARIMAModel):
+    """
+    ARIMA(p,1,0) / ARIMA(p,0,0) ajustado com NumPy (mínimos quadrados condicionais)
+    
+    Para essas ordens o ARIMA é um AR(p) sobre a série (ou suas primeiras
+    diferenças), estimável com algumas operações matriciais em vez do MLE do
+    statsmodels. Outras ordens usam o ARIMAModel (statsmodels) normalmente.
+    """
+    
+    def __init__(self, order=(5, 1, 0), incremental=False, refit_every=None):
+        super().__init__(order=order, incremental=incremental, refit_every=refit_every)
+        p, d, q = order
+        self.fast = q == 0 and d in (0, 1) and p >= 1
+        if self.fast:
+            self.name = f"ARIMA{order} [numpy]"
+        self.params = None
+    
+    def fit(self, train_series):
+        """Treina o modelo (NumPy para ordens suportadas, statsmodels nas demais)"""
+        if not self.fast:
+            return super().fit(train_series)
+        
+        print(f"🔧 Treinando {self.name}...")
+        
+        self.history = list(train_series)
+        self.params, _ = fit_ar_expanding(self.history, self.order, [len(self.history)])
+        self.fit_count += 1
+        
+        print(f"✅ {self.name} treinado!")
+        return self
+    
+    def predict_next(self):
+        """Prevê o próximo valor (reajusta com o histórico atualizado)"""
+        if not self.fast:
+            return super().predict_next()
+        
+        self.params, forecasts = fit_ar_expanding(self.history, self.order, [len(self.history)])
+        self.fit_count += 1
+        return forecasts[0]
+    
+    def update(self, true_value):
+        """Incorpora uma nova observação ao histórico"""
+        if not self.fast:
+            return super().update(true_value)
+        
+        self.history.append(true_value)
+        return self.params
+    
+    def walk_forward_validation(self, test_series):
+        """
+        Validação walk-forward
+        
+        Cada passo equivale a um reajuste completo com o histórico até aquele
+        dia, mas todas as janelas são ajustadas de uma vez (fit_ar_expanding).
+        """
+        if not self.fast:
+            return super().walk_forward_validation(test_series)
+        
+        print(f"🚶 Executando walk-forward validation com {len(test_series)} passos (numpy, em lote)...")
+        
+        start = len(self.history)
+        self.history.extend(list(test_series))
+        ends = np.arange(start, len(self.history))
+        
+        params, forecasts = fit_ar_expanding(self.history, self.order, ends)
+        self.params = params[-1:]
+        self.fit_count += len(ends)
+        self.predictions = forecasts
+        
+        print(f"✅ Walk-forward validation concluída! ({self.fit_count} ajustes do modelo)")
+        return self.predictions
+
+
 class HybridModel(BaseModel):
     """Modelo híbrido: combina diferentes abordagens"""
     
@@ -207,7 +439,12 @@ class HybridModel(BaseModel):
 # Exemplo de uso
 if __name__ == "__main__":
     # Carrega dados com features
-    df = pd.read_csv('data/processed/gold_features.csv')
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.storage import load_dataset
+    
+    df = load_dataset('data/processed/gold_features')
     
     # Divide em treino/teste (80/20)
     split_idx = int(len(df) * 0.8)
@@ -243,4 +480,15 @@ if __name__ == "__main__":
     except ImportError:
         print("⚠️  Instale statsmodels: pip install statsmodels")
     
+    # ==========================================
+    # Modelo 3: ARIMA (NumPy)
+    # ==========================================
+    print("\n" + "="*60)
+    print("🔵 MODELO 3: ARIMA (NUMPY)")
+    print("="*60)
+    
+    fast_model = ARIMAFastModel(order=(5, 1, 0))
+    fast_model.fit(train_df['Close'])
+    fast_model.evaluate(test_df['Close'])
+    
     print("\n✅ Avaliação de modelos concluída!")
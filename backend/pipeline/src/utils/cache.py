@@ -0,0 +1,130 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de cache das etapas do pipeline (chaves por conteúdo)
+"""
+
+import os
+import json
+import pickle
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+# Incrementar quando a lógica de alguma etapa mudar (invalida todo o cache)
+CACHE_VERSION = 1
+
+
+def frame_fingerprint(df):
+    """
+    Hash do conteúdo de um DataFrame (valores, colunas e tipos; ignora o índice)
+
+    Returns:
+        str: Hash hexadecimal (sha256)
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage, *inputs, **params):
+    """
+    Chave de uma etapa: hash das chaves/hashes de entrada e dos parâmetros
+
+    Args:
+        stage (str): Nome da etapa
+        *inputs: Hashes das entradas (ex.: chave da etapa anterior)
+        **params: Parâmetros da etapa (serializáveis em JSON)
+
+    Returns:
+        str: Hash hexadecimal (sha256)
+    """
+    payload = json.dumps(
+        {'version': CACHE_VERSION, 'stage': stage, 'inputs': inputs, 'params': params},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Cache das etapas de um ativo
+
+    Um manifest JSON guarda, para cada etapa, a chave da última execução e
+    metadados (ex.: o resultado da previsão). Objetos que não são datasets
+    (modelos treinados) são gravados em pickle no mesmo diretório.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir (str): Diretório do cache do ativo
+        """
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """Lê o manifest (vazio se não existir ou estiver corrompido)"""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        """Grava o manifest de forma atômica"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+    def lookup(self, stage, key):
+        """
+        Entrada da etapa se a chave bater com a da última execução
+
+        Returns:
+            dict: Metadados gravados em store() ou None (cache miss)
+        """
+        entry = self.manifest.get(stage)
+        if entry is None or entry.get('key') != key:
+            return None
+        return entry.get('meta', {})
+
+    def store(self, stage, key, **meta):
+        """Registra a chave (e metadados) da etapa que acabou de rodar"""
+        self.manifest[stage] = {
+            'key': key,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'meta': meta
+        }
+        self._save_manifest()
+
+    def invalidate(self, stage):
+        """Remove a entrada de uma etapa"""
+        if self.manifest.pop(stage, None) is not None:
+            self._save_manifest()
+
+    def object_path(self, stage):
+        """Caminho do pickle de uma etapa"""
+        return os.path.join(self.cache_dir, f'{stage}.pkl')
+
+    def save_object(self, stage, obj):
+        """Grava um objeto da etapa (pickle, escrita atômica)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.object_path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load_object(self, stage):
+        """Lê o objeto de uma etapa (None se não existir ou não puder ser lido)"""
+        try:
+            with open(self.object_path(stage), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
@@ -0,0 +1,119 @@
+"""
+Buongiorno - Gold Price Prediction Project
+Módulo de medição de recursos (tempo, CPU e memória) por etapa do pipeline
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Windows: sem getrusage
+    resource = None
+
+_PROC_STATUS = '/proc/self/status'
+_PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+
+def _read_proc_status(field):
+    """Lê um campo de /proc/self/status (em kB) e retorna em bytes"""
+    try:
+        with open(_PROC_STATUS) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss():
+    """RSS atual do processo em bytes (None se indisponível)"""
+    return _read_proc_status('VmRSS')
+
+
+def peak_rss():
+    """
+    Pico de RSS em bytes desde o último reset_peak_rss()
+
+    No Linux usa VmHWM (que pode ser zerado por etapa). Nos demais sistemas
+    usa ru_maxrss, que é o pico desde o início do processo.
+    """
+    peak = _read_proc_status('VmHWM')
+    if peak is not None:
+        return peak
+
+    if resource is None:
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em kB no Linux
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def reset_peak_rss():
+    """
+    Zera o pico de RSS (VmHWM) para medir a próxima etapa isoladamente
+
+    Returns:
+        bool: True se o pico foi zerado (só no Linux)
+    """
+    try:
+        with open(_PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+@contextmanager
+def track_stage(stats, name):
+    """
+    Mede tempo, CPU e pico de RSS de uma etapa
+
+    Registra em stats[name] um dicionário com 'wall_seconds', 'cpu_seconds'
+    (usuário + sistema do processo), 'peak_rss_mb' (pico durante a etapa),
+    'rss_mb' (RSS ao final) e 'isolated' (False quando o pico não pôde ser
+    zerado e corresponde ao processo inteiro).
+
+    O dicionário é criado no início e devolvido pelo `with`, então a etapa
+    pode acrescentar informações (ex.: número de linhas).
+
+    Args:
+        stats (dict): Dicionário onde a medição é registrada
+        name (str): Nome da etapa
+    """
+    entry = stats[name] = {}
+    isolated = reset_peak_rss()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield entry
+    finally:
+        peak = peak_rss()
+        rss = current_rss()
+        entry.update({
+            'wall_seconds': round(time.perf_counter() - wall_start, 3),
+            'cpu_seconds': round(time.process_time() - cpu_start, 3),
+            'peak_rss_mb': round(peak / 2**20, 1) if peak is not None else None,
+            'rss_mb': round(rss / 2**20, 1) if rss is not None else None,
+            'isolated': isolated
+        })
+
+
+def format_stage_stats(stats):
+    """Formata as medições por etapa para exibição"""
+    lines = []
+    for name, values in stats.items():
+        peak = values.get('peak_rss_mb')
+        peak_text = f"{peak:8.1f} MB" if peak is not None else "       n/d"
+        suffix = "" if values.get('isolated', True) else " (pico do processo)"
+        if values.get('cached'):
+            suffix += " [cache]"
+        lines.append(
+            f"   {name:<12} {values.get('wall_seconds', 0):7.2f}s  "
+            f"CPU {values.get('cpu_seconds', 0):7.2f}s  pico RSS: {peak_text}{suffix}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,40 @@
+"""
+Buongiorno - Testes do pipeline
+Configuração comum: os módulos são importados como no run_pipeline (a
+partir de backend/pipeline) e os dados são sintéticos, com semente fixa
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PIPELINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PIPELINE_DIR not in sys.path:
+    sys.path.insert(0, PIPELINE_DIR)
+
+
+def synthetic_prices(n_days=200, seed=42, start_price=1800.0):
+    """OHLCV diário sintético (movimento browniano geométrico), como após o preprocessamento"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n_days)))
+    open_ = close * (1 + rng.normal(0, 0.002, n_days))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n_days))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n_days))
+
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2020-01-01', periods=n_days),
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': rng.integers(50_000, 200_000, n_days).astype(float),
+        'Intraday_Range': high - low
+    })
+
+
+@pytest.fixture
+def prices():
+    return synthetic_prices()
@@ -0,0 +1,76 @@
+"""
+Buongiorno - Testes de generate_backtest_predictions.py
+MAPE do modelo (backtest_mapes / RollingMAPE) x walk-forward forecast/append
+por dia
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('statsmodels')
+
+import generate_backtest_predictions as backtest
+
+from conftest import synthetic_prices
+
+# Diferença máxima aceita, em pontos percentuais de MAPE, com reajuste a
+# cada MAPE_REFIT_EVERY dias (medida: até 2,3e-3 nas séries abaixo; 3e-4 no
+# histórico do ouro, com 1258 dias)
+TOLERANCE_PP = 5e-3
+
+DAYS = list(range(300, 312))
+
+
+def nested_mape(prices, idx):
+    """Cálculo por dia: ajuste nos primeiros 80% e forecast/append nos 20% finais"""
+    train_data = prices[:idx + 1]
+    test_size = int(len(train_data) * 0.2)
+    test_data = train_data[-test_size:]
+
+    model = backtest.train_arima_model(train_data[:-test_size])
+    test_predictions = []
+    for value in test_data:
+        test_predictions.append(float(np.asarray(model.forecast(steps=1))[0]))
+        model = model.append([value])
+
+    return backtest.calculate_mape(test_data, test_predictions)
+
+
+@pytest.fixture(scope='module', params=[0, 1])
+def series(request):
+    prices = synthetic_prices(n_days=320, seed=request.param)['Close'].to_numpy()
+    return prices, [nested_mape(prices, idx) for idx in DAYS]
+
+
+def test_daily_refit_matches_nested_loop(series):
+    prices, expected = series
+
+    mapes = backtest.backtest_mapes(prices, DAYS, refit_every=1)
+
+    np.testing.assert_allclose(mapes, expected, rtol=0, atol=1e-9)
+
+
+def test_periodic_refit_within_tolerance(series):
+    prices, expected = series
+
+    mapes = backtest.backtest_mapes(prices, DAYS, refit_every=backtest.MAPE_REFIT_EVERY)
+
+    # O primeiro dia de cada bloco é reajustado: igual ao cálculo por dia
+    for first in range(0, len(DAYS), backtest.MAPE_REFIT_EVERY):
+        assert mapes[first] == pytest.approx(expected[first], abs=1e-9)
+    np.testing.assert_allclose(mapes, expected, rtol=0, atol=TOLERANCE_PP)
+
+
+def test_rolling_mape_matches_calculate_mape():
+    rng = np.random.default_rng(3)
+    y_true = rng.uniform(90, 110, 50)
+    y_true[7] = 0.0  # zeros são ignorados, como em calculate_mape
+    y_pred = y_true + rng.normal(0, 1, 50)
+
+    tracker = backtest.RollingMAPE()
+    for true, pred in zip(y_true, y_pred):
+        tracker.add(true, pred)
+
+    for window in (1, 10, 45, 50):
+        expected = backtest.calculate_mape(y_true[-window:], y_pred[-window:])
+        assert tracker.mape(window) == pytest.approx(expected, rel=1e-12)
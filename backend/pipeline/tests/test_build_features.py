@@ -0,0 +1,76 @@
+"""
+Buongiorno - Testes de src/features/build_features.py
+Modo incremental (add_features_incremental) x cálculo completo e kernel
+de estatísticas móveis (rolling_moments) x pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.build_features import FeatureEngineer, rolling_moments
+
+from conftest import synthetic_prices
+
+# Diferença absoluta máxima aceita x Series.rolling, com preços na casa de
+# 1800 (medida: ~2e-13 na média e ~2.5e-9 no desvio padrão, que no pandas
+# acumula erro ao longo da série)
+MEAN_ATOL = 1e-12
+STD_ATOL = 1e-8
+
+WINDOWS = [2, 3, 7, 14, 30]
+
+# Mesmos parâmetros de run_pipeline.step3_feature_engineering
+PARAMS = dict(
+    lags=[1, 2, 3, 5, 7],
+    ma_windows=[7, 14, 30],
+    vol_windows=[7, 14],
+    momentum_periods=[5, 10]
+)
+
+
+def full_features(df):
+    return FeatureEngineer(df).add_all_features(**PARAMS).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('new_rows', [1, 5, 40])
+def test_incremental_is_bit_identical_to_full(prices, new_rows):
+    existing = full_features(prices.iloc[:-new_rows])
+
+    incremental = FeatureEngineer(prices).add_features_incremental(existing, **PARAMS)
+
+    assert len(incremental) == len(existing) + new_rows
+    pd.testing.assert_frame_equal(full_features(prices), incremental, check_exact=True)
+
+
+def test_no_new_dates_keeps_existing_table(prices):
+    existing = full_features(prices)
+
+    incremental = FeatureEngineer(prices).add_features_incremental(existing, **PARAMS)
+
+    pd.testing.assert_frame_equal(existing, incremental, check_exact=True)
+
+
+@pytest.mark.parametrize('change', ['extra_column', 'missing_column'])
+def test_column_mismatch_falls_back_to_full_recompute(prices, change):
+    existing = full_features(prices.iloc[:-5])
+    if change == 'extra_column':
+        existing['Close_lag_30'] = existing['Close']
+    else:
+        existing = existing.drop(columns=['Close_lag_7'])
+
+    result = FeatureEngineer(prices).add_features_incremental(existing, **PARAMS)
+
+    pd.testing.assert_frame_equal(full_features(prices), result.reset_index(drop=True), check_exact=True)
+
+
+@pytest.mark.parametrize('n_days', [200, 1500])
+def test_rolling_moments_matches_pandas(n_days):
+    close = synthetic_prices(n_days=n_days)['Close']
+
+    means, stds = rolling_moments(close, mean_windows=WINDOWS, std_windows=WINDOWS)
+
+    for window in WINDOWS:
+        rolling = close.rolling(window)
+        np.testing.assert_allclose(means[window], rolling.mean().to_numpy(), rtol=0, atol=MEAN_ATOL)
+        np.testing.assert_allclose(stds[window], rolling.std().to_numpy(), rtol=0, atol=STD_ATOL)
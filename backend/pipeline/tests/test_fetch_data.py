@@ -0,0 +1,134 @@
+"""
+Buongiorno - Testes de src/data/fetch_data.py
+Download incremental (fetch_incremental / fetch_incremental_batch) a partir
+de um CSV local (CSVSource), sem acesso à rede
+"""
+
+import pandas as pd
+import pytest
+
+from src.data.fetch_data import CSVSource, GoldDataFetcher, fetch_incremental_batch
+from src.data.storage import load_dataset, save_dataset
+
+from conftest import synthetic_prices
+
+COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class RecordingSource(CSVSource):
+    """CSVSource que registra o início de cada requisição"""
+
+    def __init__(self, filepath):
+        super().__init__(filepath)
+        self.starts = []
+
+    def __call__(self, ticker, start=None, end=None, period='max'):
+        self.starts.append(start)
+        return super().__call__(ticker, start=start, end=end, period=period)
+
+
+@pytest.fixture
+def remote():
+    """Histórico completo "no servidor" (60 dias úteis, preços com 2 casas como no Yahoo)"""
+    df = synthetic_prices(n_days=60)[COLUMNS]
+    return df.round({column: 2 for column in COLUMNS[1:]})
+
+
+def write_source(tmp_path, df):
+    path = tmp_path / 'source.csv'
+    df.to_csv(path, index=False)
+    return RecordingSource(path)
+
+
+def store(tmp_path, df):
+    path = str(tmp_path / 'gold_prices')
+    save_dataset(df, path, fmt='csv')
+    return path
+
+
+def fetch(source, path):
+    fetcher = GoldDataFetcher(source=source)
+    return fetcher, fetcher.fetch_incremental(path)
+
+
+def test_fetches_only_from_last_stored_date(tmp_path, remote):
+    path = store(tmp_path, remote.iloc[:50])
+    source = write_source(tmp_path, remote)
+
+    fetcher, data = fetch(source, path)
+
+    assert source.starts == [remote['Date'].iloc[49].strftime('%Y-%m-%d')]
+    assert fetcher.new_rows == 10
+    assert fetcher.revised_rows == 0
+    pd.testing.assert_frame_equal(data, remote, check_exact=True)
+
+
+def test_revised_last_day_is_overwritten(tmp_path, remote):
+    # Último dia gravado com o pregão em andamento
+    partial = remote.iloc[:50].copy()
+    partial.loc[49, ['High', 'Close']] = [remote.loc[49, 'High'] - 5, remote.loc[49, 'Close'] - 3]
+    path = store(tmp_path, partial)
+    source = write_source(tmp_path, remote.iloc[:50])
+
+    fetcher, data = fetch(source, path)
+
+    assert fetcher.new_rows == 0
+    assert fetcher.revised_rows == 1
+    assert data.loc[49, 'Close'] == remote.loc[49, 'Close']
+    assert data.loc[49, 'High'] == remote.loc[49, 'High']
+    pd.testing.assert_frame_equal(data, remote.iloc[:50], check_exact=True)
+
+
+def test_skipped_day_is_picked_up(tmp_path, remote):
+    # O servidor ainda não tinha o dia 50 na execução anterior
+    path = store(tmp_path, remote.iloc[:50])
+    fetcher, _ = fetch(write_source(tmp_path, remote.iloc[:50]), path)
+    assert fetcher.new_rows == 0 and fetcher.revised_rows == 0
+
+    fetcher, data = fetch(write_source(tmp_path, remote.iloc[:51]), path)
+
+    assert fetcher.new_rows == 1
+    assert data['Date'].iloc[-1] == remote['Date'].iloc[50]
+
+
+def test_dates_are_deduplicated(tmp_path, remote):
+    path = store(tmp_path, remote.iloc[:50])
+    # Fonte com datas repetidas: vale a última ocorrência
+    duplicated = pd.concat([remote.iloc[45:55], remote.iloc[[52]]], ignore_index=True)
+    duplicated.loc[len(duplicated) - 1, 'Close'] += 1
+    source = write_source(tmp_path, duplicated)
+
+    fetcher, data = fetch(source, path)
+
+    assert data['Date'].is_unique
+    assert data['Date'].is_monotonic_increasing
+    assert len(data) == 55
+    assert fetcher.new_rows == 5
+    assert data.loc[52, 'Close'] == remote.loc[52, 'Close'] + 1
+
+
+def test_batch_fetches_from_oldest_last_date(tmp_path, remote):
+    paths = [store(tmp_path / 'a', remote.iloc[:50]), store(tmp_path / 'b', remote.iloc[:45])]
+    source = write_source(tmp_path, remote)
+    batch_starts = []
+
+    def batch_source(tickers, start=None, end=None, period='max'):
+        batch_starts.append(start)
+        return {ticker: source(ticker, start=start, end=end) for ticker in tickers}
+
+    fetchers = [GoldDataFetcher(ticker='A'), GoldDataFetcher(ticker='B')]
+    results = fetch_incremental_batch(fetchers, paths, batch_source=batch_source)
+
+    assert batch_starts == [remote['Date'].iloc[44].strftime('%Y-%m-%d')]
+    assert [fetcher.new_rows for fetcher in fetchers] == [10, 15]
+    for data in results:
+        pd.testing.assert_frame_equal(data, remote, check_exact=True)
+
+
+def test_stored_dataset_round_trip(tmp_path, remote):
+    path = store(tmp_path, remote.iloc[:50])
+    fetcher, _ = fetch(write_source(tmp_path, remote), path)
+
+    fetcher.save_data(path, fmt='csv')
+
+    pd.testing.assert_frame_equal(load_dataset(path), remote, check_exact=True)
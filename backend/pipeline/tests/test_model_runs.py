@@ -0,0 +1,86 @@
+"""
+Buongiorno - Testes de src/data/model_runs.py
+Gravação de uma execução no banco da API (SQLite temporário)
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data import model_runs
+from src.data.api_db import ensure_api_path
+
+from conftest import synthetic_prices
+
+ASSET = {'code': 'gold', 'name': 'Gold', 'symbol': 'GC=F'}
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """save_pipeline_run grava em um banco SQLite novo em tmp_path"""
+    ensure_api_path()
+    from database import Base
+    import models  # noqa: F401  (registra as tabelas em Base.metadata)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(model_runs, 'open_session', factory)
+
+    yield factory
+    engine.dispose()
+
+
+def save(prices, prediction=None):
+    saved = model_runs.save_pipeline_run(
+        ASSET, {'model_name': 'test'}, prices=prices, prediction=prediction
+    )
+    assert saved is not None
+    return saved
+
+
+def test_revised_last_day_close_updates_price_and_reconciliation(session_factory):
+    from models import Price, Prediction
+
+    prices = synthetic_prices(n_days=30)
+    target = prices['Date'].iloc[-1].date()
+    revised_close = float(prices['Close'].iloc[-1])
+
+    save(prices.iloc[:-1], prediction={
+        'prediction_date': datetime.now(),
+        'target_date': target,
+        'current_price': float(prices['Close'].iloc[-2]),
+        'predicted_price': revised_close + 10,
+        'change_abs': 10.0,
+        'change_pct': 0.5,
+        'model_used': 'test',
+        'model_mape': 1.0
+    })
+
+    # Execução durante o pregão: o último dia é gravado com fechamento parcial
+    partial = prices.copy()
+    partial.loc[partial.index[-1], 'Close'] = revised_close - 20
+    saved = save(partial)
+    assert saved['predictions_reconciled'] == 1
+
+    # Execução seguinte: o download traz o fechamento revisado do mesmo dia
+    saved = save(prices)
+    assert saved['prices_written'] == 1
+    assert saved['predictions_reconciled'] == 1
+
+    db = session_factory()
+    try:
+        price = db.query(Price).filter(Price.date == target).one()
+        assert price.close == pytest.approx(revised_close)
+        assert db.query(Price).count() == len(prices)
+
+        prediction = db.query(Prediction).one()
+        assert prediction.real_price == pytest.approx(revised_close)
+        assert prediction.error_abs == pytest.approx(10.0)
+    finally:
+        db.close()
+
+    # Sem revisão, nada é reconciliado de novo
+    assert save(prices)['predictions_reconciled'] == 0
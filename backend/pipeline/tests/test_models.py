@@ -0,0 +1,51 @@
+"""
+Buongiorno - Testes de src/models/models.py
+ARIMAFastModel (NumPy) x ARIMAModel (statsmodels)
+"""
+
+import numpy as np
+import pytest
+
+from src.models.models import ARIMAModel, ARIMAFastModel
+from conftest import synthetic_prices
+
+pytest.importorskip('statsmodels')
+
+# Diferença máxima tolerada entre as previsões (em % do preço): mínimos
+# quadrados condicionais x MLE do statsmodels (medido: < 0.02%)
+TOLERANCE_PCT = 0.05
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_fast_walk_forward_matches_statsmodels(seed):
+    close = synthetic_prices(n_days=320, seed=seed)['Close']
+    train, test = close.iloc[:300], close.iloc[300:]
+
+    fast = ARIMAFastModel(order=(5, 1, 0))
+    fast.fit(train)
+    fast_predictions = fast.walk_forward_validation(test)
+
+    reference = ARIMAModel(order=(5, 1, 0))
+    reference.fit(train)
+    reference_predictions = reference.walk_forward_validation(test)
+
+    assert fast.fast
+    diff_pct = np.abs(fast_predictions - reference_predictions) / reference_predictions * 100
+    assert diff_pct.max() < TOLERANCE_PCT
+
+
+def test_fast_predict_next_matches_walk_forward():
+    close = synthetic_prices(n_days=260, seed=3)['Close']
+
+    batch = ARIMAFastModel(order=(5, 1, 0))
+    batch.fit(close.iloc[:250])
+    batch_predictions = batch.walk_forward_validation(close.iloc[250:])
+
+    stepwise = ARIMAFastModel(order=(5, 1, 0))
+    stepwise.fit(close.iloc[:250])
+    step_predictions = []
+    for value in close.iloc[250:]:
+        step_predictions.append(stepwise.predict_next())
+        stepwise.update(value)
+
+    np.testing.assert_allclose(batch_predictions, step_predictions, rtol=1e-10)
@@ -0,0 +1,207 @@
+"""
+Buongiorno - Benchmarks
+Executa os cenários, grava os tempos em JSON e compara com o baseline
+
+Uso:
+    python benchmarks/run_benchmarks.py                      # roda e compara com o baseline
+    python benchmarks/run_benchmarks.py --save-baseline      # grava o resultado como baseline
+    python benchmarks/run_benchmarks.py --only features api_history --days 5000
+
+Tudo roda offline: os dados são sintéticos (synthetic.py) e a API usa um
+SQLite temporário. Sai com código 1 se algum cenário ficar mais lento que o
+baseline além do limite (--threshold, em %).
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import statistics
+import contextlib
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_ohlcv
+from scenarios import SCENARIOS
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+
+def run_scenario(name, days, assets, seed, repeat, options):
+    """
+    Executa um cenário (chamado em um processo novo, ver main())
+
+    Returns:
+        dict: Tempos de cada repetição e estatísticas, ou 'skipped' com o motivo
+    """
+    function, warmup = SCENARIOS[name]
+    data = generate_ohlcv(n_days=days, n_assets=assets, seed=seed)
+
+    # Os módulos do projeto imprimem o progresso: fica fora do relatório
+    with contextlib.redirect_stdout(io.StringIO()), \
+            tempfile.TemporaryDirectory(prefix='buongiorno_bench_') as workdir:
+        try:
+            run = function(data, workdir=workdir, **options)
+        except ImportError as e:
+            return {'skipped': f"dependência ausente: {e}"}
+
+        for _ in range(warmup):
+            run()
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+    return {
+        'median_seconds': statistics.median(times),
+        'min_seconds': min(times),
+        'max_seconds': max(times),
+        'times': times
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara as medianas com o baseline
+
+    Args:
+        results (dict): Resultado atual (ver main())
+        baseline (dict): Resultado gravado com --save-baseline
+        threshold (float): Piora máxima tolerada, em %
+
+    Returns:
+        list: (cenário, mediana do baseline, mediana atual, variação em %) dos
+              cenários que regrediram além do limite
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if not reference or 'median_seconds' not in reference or 'median_seconds' not in current:
+            continue
+
+        change = (current['median_seconds'] / reference['median_seconds'] - 1) * 100
+        current['baseline_median_seconds'] = reference['median_seconds']
+        current['change_pct'] = round(change, 1)
+
+        if change > threshold:
+            regressions.append((name, reference['median_seconds'], current['median_seconds'], change))
+
+    return regressions
+
+
+def save_json(data, path):
+    """Grava JSON criando o diretório se necessário"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmarks do Buongiorno')
+    parser.add_argument('--only', nargs='+', choices=sorted(SCENARIOS), help='Executa apenas estes cenários')
+    parser.add_argument('--days', type=int, default=2500, help='Dias úteis por ativo (padrão: 2500)')
+    parser.add_argument('--assets', type=int, default=1, help='Número de ativos (padrão: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos dados sintéticos (padrão: 42)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições cronometradas por cenário (padrão: 3)')
+    parser.add_argument('--arima-days', type=int, default=500, help='Tamanho da série do walk-forward ARIMA (padrão: 500)')
+    parser.add_argument('--backtest-days', type=int, default=20, help='Dias do backtest statsmodels; o numpy usa 10x (padrão: 20)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Requisições simultâneas dos cenários api_concurrent_* (padrão: 32)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Arquivo JSON de saída')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Arquivo JSON do baseline')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Piora máxima tolerada em %% (padrão: 20)')
+    parser.add_argument('--save-baseline', action='store_true', help='Grava o resultado também como baseline')
+    args = parser.parse_args()
+
+    names = args.only or list(SCENARIOS)
+    options = {
+        'arima_days': args.arima_days,
+        'backtest_days': args.backtest_days,
+        'concurrency': args.concurrency
+    }
+
+    print("=" * 70)
+    print("⏱️  BUONGIORNO - BENCHMARKS")
+    print("=" * 70)
+    print(f"Dados sintéticos: {args.days} dias x {args.assets} ativo(s), seed {args.seed}")
+    print(f"Repetições: {args.repeat}")
+    print()
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'params': {
+            'days': args.days,
+            'assets': args.assets,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            **options
+        },
+        'scenarios': {}
+    }
+
+    # Um processo novo por cenário (imports isolados, memória limpa)
+    context = multiprocessing.get_context('spawn')
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(
+                run_scenario, name, args.days, args.assets, args.seed, args.repeat, options
+            ).result()
+
+        results['scenarios'][name] = result
+        if 'skipped' in result:
+            print(f"   ⚠️  {name:<22} pulado ({result['skipped']})")
+        else:
+            print(f"   ✅ {name:<22} mediana {result['median_seconds'] * 1000:10.1f} ms "
+                  f"(mín {result['min_seconds'] * 1000:.1f} ms)")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        if baseline.get('params') != results['params']:
+            print("\n⚠️  Parâmetros diferentes dos do baseline: comparação pode não ser válida")
+
+        regressions = compare(results, baseline, args.threshold)
+
+        print(f"\n📊 Comparação com o baseline ({args.baseline}):")
+        for name, result in results['scenarios'].items():
+            if 'change_pct' in result:
+                print(f"   {name:<22} {result['change_pct']:+7.1f}%")
+    elif not args.save_baseline:
+        print(f"\n⚠️  Baseline não encontrado ({args.baseline}). Grave um com --save-baseline")
+
+    save_json(results, args.output)
+    print(f"\n💾 Resultados salvos em: {args.output}")
+
+    if args.save_baseline:
+        save_json(results, args.baseline)
+        print(f"💾 Baseline salvo em: {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} cenário(s) mais lentos que o baseline (limite: +{args.threshold:.0f}%):")
+        for name, before, after, change in regressions:
+            print(f"   {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({change:+.1f}%)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
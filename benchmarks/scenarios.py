@@ -0,0 +1,267 @@
+"""
+Buongiorno - Benchmarks
+Cenários cronometrados dos caminhos críticos do pipeline e da API
+
+Cada cenário recebe os dados sintéticos e devolve a função a cronometrar
+(a preparação fica fora da medição). Os cenários rodam em processos
+separados (ver run_benchmarks.py): o pacote `models` da API e o
+`src/models` do pipeline não podem ser importados no mesmo processo.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PIPELINE_DIR = os.path.join(REPO_ROOT, 'backend', 'pipeline')
+API_DIR = os.path.join(REPO_ROOT, 'backend', 'api')
+
+# Mesmos parâmetros de features do pipeline (run_pipeline.step3_feature_engineering)
+FEATURE_PARAMS = dict(
+    lags=[1, 2, 3, 5, 7],
+    ma_windows=[7, 14, 30],
+    vol_windows=[7, 14],
+    momentum_periods=[5, 10]
+)
+
+
+def _pipeline_path():
+    if PIPELINE_DIR not in sys.path:
+        sys.path.insert(0, PIPELINE_DIR)
+
+
+def _with_daily_stats(assets):
+    """Dados brutos + estatísticas diárias, como no passo 1 do pipeline"""
+    _pipeline_path()
+    from src.data.fetch_data import GoldDataFetcher
+
+    frames = {}
+    for code, df in assets.items():
+        fetcher = GoldDataFetcher()
+        fetcher.data = df
+        frames[code] = fetcher.calculate_daily_stats()
+    return frames
+
+
+def _processed(assets):
+    """Dados preprocessados, como no passo 2 do pipeline"""
+    from src.data.preprocess import DataPreprocessor
+
+    return {
+        code: DataPreprocessor(df, copy=False).prepare_for_modeling()
+        for code, df in _with_daily_stats(assets).items()
+    }
+
+
+# ==========================================
+# Pipeline
+# ==========================================
+
+def preprocess(assets, **options):
+    """DataPreprocessor.prepare_for_modeling() de todos os ativos"""
+    _pipeline_path()
+    from src.data.preprocess import DataPreprocessor
+
+    frames = _with_daily_stats(assets)
+
+    def run():
+        for df in frames.values():
+            DataPreprocessor(df).prepare_for_modeling()
+    return run
+
+
+def features(assets, **options):
+    """FeatureEngineer.add_all_features() de todos os ativos"""
+    _pipeline_path()
+    from src.features.build_features import FeatureEngineer
+
+    frames = _processed(assets)
+
+    def run():
+        for df in frames.values():
+            FeatureEngineer(df).add_all_features(**FEATURE_PARAMS)
+    return run
+
+
+def arima_walk_forward(assets, arima_days=500, **options):
+    """ARIMAModel(5,1,0) incremental: fit + walk-forward nos últimos arima_days"""
+    _pipeline_path()
+    from src.models.models import ARIMAModel
+
+    series = assets['gold']['Close'].tail(arima_days).reset_index(drop=True)
+    split_idx = int(len(series) * 0.8)
+    train, test = series[:split_idx], series[split_idx:]
+
+    def run():
+        model = ARIMAModel(order=(5, 1, 0), incremental=True, refit_every=20)
+        model.fit(train)
+        model.walk_forward_validation(test)
+    return run
+
+
+def _backtest(assets, engine, num_days):
+    _pipeline_path()
+    import generate_backtest_predictions as backtest
+
+    df = assets['gold'][['Date', 'Close']]
+
+    def run():
+        backtest.generate_backtest_predictions(num_days=num_days, engine=engine, df=df)
+    return run
+
+
+def backtest_statsmodels(assets, backtest_days=20, **options):
+    """generate_backtest_predictions (statsmodels, um ajuste por dia)"""
+    return _backtest(assets, 'statsmodels', backtest_days)
+
+
+def backtest_numpy(assets, backtest_days=20, **options):
+    """generate_backtest_predictions (numpy, janelas ajustadas em lote)"""
+    return _backtest(assets, 'numpy', backtest_days * 10)
+
+
+# ==========================================
+# API
+# ==========================================
+
+def _api_client(assets, workdir, cached=False, async_db=False):
+    """
+    Cliente de teste da API sobre um SQLite temporário com os dados sintéticos
+
+    Cada data sintética vira um preço e uma previsão (alvo: próximo dia útil),
+    com o preço real conciliado como depois de uma execução do pipeline.
+
+    Args:
+        assets (dict): Dados sintéticos (ver synthetic.generate_ohlcv)
+        workdir (str): Diretório temporário do banco
+        cached (bool): Liga o cache de respostas (desligado: mede o caminho do banco)
+        async_db (bool): Usa o stack assíncrono (DB_ASYNC, aiosqlite)
+    """
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['RESPONSE_CACHE_TTL'] = '300' if cached else '0'
+    os.environ['DB_ASYNC'] = 'true' if async_db else 'false'
+    if API_DIR not in sys.path:
+        sys.path.insert(0, API_DIR)
+
+    from fastapi.testclient import TestClient
+    from database import SessionLocal
+    from models import Asset, Price, Prediction
+    from repositories import PredictionRepository, PredictionMetricRepository
+    from services.asset_registry import asset_registry
+    import main
+
+    db = SessionLocal()
+    try:
+        for code, df in assets.items():
+            asset = Asset(code=code, name=code.title(), symbol=code.upper(), active=True)
+            db.add(asset)
+            db.flush()
+
+            closes = df['Close'].to_numpy()
+            dates = [d.date() for d in df['Date']]
+            db.add_all([
+                Price(asset_id=asset.id, date=d, open=float(o), high=float(h), low=float(l),
+                      close=float(c), adj_close=float(c), volume=float(v))
+                for d, o, h, l, c, v in zip(dates, df['Open'], df['High'], df['Low'], closes, df['Volume'])
+            ])
+
+            now = datetime.now()
+            db.add_all([
+                Prediction(
+                    asset_id=asset.id,
+                    prediction_date=now - timedelta(days=len(dates) - i),
+                    target_date=dates[i + 1] if i + 1 < len(dates) else dates[i] + timedelta(days=1),
+                    current_price=float(closes[i]),
+                    predicted_price=float(closes[i] * 1.001),
+                    change_abs=float(closes[i] * 0.001),
+                    change_pct=0.1,
+                    trend='stable',
+                    model_used='arima',
+                    model_mape=1.0,
+                    confidence='high'
+                )
+                for i in range(len(dates))
+            ])
+        db.commit()
+
+        # Preços reais preenchidos e métricas de acurácia calculadas, como
+        # depois de uma execução do pipeline
+        PredictionRepository(db).reconcile_real_prices()
+        PredictionMetricRepository(db).refresh()
+    finally:
+        db.close()
+
+    # main carregou o registro de ativos com o banco ainda vazio
+    asset_registry.load()
+
+    return TestClient(main.app)
+
+
+def _api_get(url, cached=False):
+    def build(assets, workdir, **options):
+        client = _api_client(assets, workdir, cached=cached)
+
+        def run():
+            response = client.get(url)
+            response.raise_for_status()
+        return run
+    build.__doc__ = f"GET {url} (SQLite sintético{', cache de respostas' if cached else ''})"
+    return build
+
+
+api_latest = _api_get('/api/predictions/latest?asset=gold')
+api_history = _api_get('/api/predictions/history?asset=gold&limit=100')
+api_history_errors = _api_get('/api/predictions/history-errors?asset=gold')
+api_assets = _api_get('/api/assets')
+api_accuracy = _api_get('/api/predictions/accuracy?asset=gold')
+api_history_cached = _api_get('/api/predictions/history?asset=gold&limit=100', cached=True)
+
+
+def _api_concurrent(url, async_db):
+    def build(assets, workdir, concurrency=32, **options):
+        import asyncio
+        import httpx
+
+        app = _api_client(assets, workdir, async_db=async_db).app
+
+        # Um único event loop: o pool do engine assíncrono fica preso ao loop
+        loop = asyncio.new_event_loop()
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+                responses = await asyncio.gather(*[client.get(url) for _ in range(concurrency)])
+            for response in responses:
+                response.raise_for_status()
+
+        def run():
+            loop.run_until_complete(burst())
+        return run
+    build.__doc__ = (f"{url}: requisições simultâneas (--concurrency) no stack "
+                     f"{'assíncrono' if async_db else 'síncrono'}")
+    return build
+
+
+# Mesma rajada nos dois stacks (DB_ASYNC=false/true): endpoints síncronos
+# rodam no threadpool, os assíncronos no event loop
+api_concurrent_sync = _api_concurrent('/api/predictions/history?asset=gold&limit=100', async_db=False)
+api_concurrent_async = _api_concurrent('/api/predictions/history?asset=gold&limit=100', async_db=True)
+
+
+# Cenários disponíveis: nome -> (função, aquecimentos antes da medição)
+# Os endpoints da API são aquecidos uma vez (primeira requisição do processo).
+SCENARIOS = {
+    'preprocess': (preprocess, 0),
+    'features': (features, 0),
+    'arima_walk_forward': (arima_walk_forward, 0),
+    'backtest_statsmodels': (backtest_statsmodels, 0),
+    'backtest_numpy': (backtest_numpy, 0),
+    'api_latest': (api_latest, 1),
+    'api_history': (api_history, 1),
+    'api_history_errors': (api_history_errors, 1),
+    'api_assets': (api_assets, 1),
+    'api_accuracy': (api_accuracy, 1),
+    'api_history_cached': (api_history_cached, 1),
+    'api_concurrent_sync': (api_concurrent_sync, 1),
+    'api_concurrent_async': (api_concurrent_async, 1),
+}
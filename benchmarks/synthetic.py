@@ -0,0 +1,64 @@
+"""
+Buongiorno - Benchmarks
+Gerador de históricos OHLCV sintéticos (movimento browniano geométrico)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def generate_ohlcv(n_days=2000, n_assets=1, seed=42, start='2000-01-03',
+                   s0=1800.0, mu=0.05, sigma=0.18):
+    """
+    Gera históricos diários OHLCV reprodutíveis
+
+    O fechamento segue um movimento browniano geométrico em dias úteis; a
+    abertura parte do fechamento anterior com um gap pequeno e máxima/mínima
+    envolvem abertura e fechamento. As colunas seguem o formato dos dados
+    brutos do Yahoo Finance (ver src/data/fetch_data.py).
+
+    Args:
+        n_days (int): Número de dias úteis por ativo
+        n_assets (int): Número de ativos
+        seed (int): Semente do gerador (mesma semente = mesmos dados)
+        start (str): Primeira data
+        s0 (float): Preço inicial do primeiro ativo (os demais variam em torno dele)
+        mu (float): Drift anual
+        sigma (float): Volatilidade anual
+
+    Returns:
+        dict: {código do ativo: DataFrame com Date, Adj Close, Close, High, Low, Open, Volume}
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start=start, periods=n_days)
+    dt = 1 / 252
+
+    assets = {}
+    for i in range(n_assets):
+        code = 'gold' if i == 0 else f'asset{i}'
+        initial = s0 if i == 0 else s0 * rng.uniform(0.01, 2.0)
+
+        shocks = rng.standard_normal(n_days)
+        log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+        close = initial * np.exp(np.cumsum(log_returns))
+
+        previous = np.concatenate([[initial], close[:-1]])
+        open_ = previous * np.exp(rng.normal(0, 0.1 * sigma * np.sqrt(dt), n_days))
+
+        spread = np.abs(rng.normal(0, 0.5 * sigma * np.sqrt(dt), (2, n_days)))
+        high = np.maximum(open_, close) * (1 + spread[0])
+        low = np.minimum(open_, close) * (1 - spread[1])
+
+        volume = rng.integers(100, 100_000, n_days)
+
+        assets[code] = pd.DataFrame({
+            'Date': dates,
+            'Adj Close': close,
+            'Close': close,
+            'High': high,
+            'Low': low,
+            'Open': open_,
+            'Volume': volume
+        })
+
+    return assets
@@ -54,14 +54,28 @@ const BuongiornoDashboard = () => {
     setLoadingHistory(true);
 
     try {
-      const response = await fetch(`${API_URL}/predictions/history-errors`);
+      // O endpoint é paginado: segue o next_cursor até a última página
+      const predictions = [];
+      let cursor = null;
 
-      if (!response.ok) {
-        throw new Error('Não foi possível carregar o histórico.');
-      }
+      do {
+        const params = new URLSearchParams({ limit: '1000' });
+        if (cursor) {
+          params.set('cursor', cursor);
+        }
 
-      const data = await response.json();
-      setHistory(data.predictions);
+        const response = await fetch(`${API_URL}/predictions/history-errors?${params}`);
+
+        if (!response.ok) {
+          throw new Error('Não foi possível carregar o histórico.');
+        }
+
+        const data = await response.json();
+        predictions.push(...data.predictions);
+        cursor = data.next_cursor;
+      } while (cursor);
+
+      setHistory(predictions);
       setLoadingHistory(false);
     } catch (err) {
       console.error('Erro ao buscar histórico:', err);